@@ -0,0 +1,256 @@
+# Planned-spend and workload S-curves over the shutdown window, vectorised with NumPy
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date, timedelta
+from enum import Enum
+from typing import Any, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session
+
+from app.core.metrics import CACHE_REQUESTS
+from app.core.money import Money
+from app.db.routing import read_only
+from app.Domains.turnarounds.cost_models import VariationOrder, VariationOrderStatus, WorkPackageCost
+from app.Domains.turnarounds.models import Discipline, WorkPackage, WorkPackageStatus
+from app.Domains.turnarounds.schemas import SCurveResponse, SCurveSeries
+
+DISCIPLINES = list(Discipline)
+STATUSES = list(WorkPackageStatus)
+MAX_CACHED_CURVES = 64
+
+
+class SpendProfile(str, Enum):
+    UNIFORM = "uniform"
+    # Linearly decreasing from the first day to the last, reaching zero the day after
+    FRONT_LOADED = "front_loaded"
+
+
+@dataclass(frozen=True)
+class PackageArrays:
+    """Dated work packages as parallel arrays; days are offsets from `origin`."""
+
+    origin: int  # date ordinal of day 0
+    days: int  # length of the window covering every package
+    start: np.ndarray  # int64 day offsets
+    duration: np.ndarray  # int64, >= 1
+    value_cents: np.ndarray  # int64 revised contract price in cents
+    discipline: np.ndarray  # int8 index into DISCIPLINES
+    status: np.ndarray  # int8 index into STATUSES
+
+
+_lock = threading.Lock()
+_arrays: Optional[PackageArrays] = None
+_arrays_version: Optional[tuple[Any, ...]] = None
+_curves: "OrderedDict[tuple, SCurveResponse]" = OrderedDict()
+
+
+def data_version(db: Session) -> tuple[Any, ...]:
+    """Cheap fingerprint of everything the curves read; any write changes it."""
+    versions = []
+    for model in (WorkPackage, WorkPackageCost, VariationOrder):
+        versions.extend(db.execute(select(func.count(), func.max(model.updated_at)).select_from(model)).one())
+    return tuple(versions)
+
+
+def load_arrays(db: Session) -> PackageArrays:
+    """One query for every dated package and its revised contract price (original + approved VOs)."""
+    approved = (
+        select(
+            VariationOrder.work_package_cost_id.label("cost_id"),
+            func.sum(
+                case((VariationOrder.status == VariationOrderStatus.APPROVED, VariationOrder.value_amount), else_=0)
+            ).label("approved"),
+        )
+        .group_by(VariationOrder.work_package_cost_id)
+        .subquery()
+    )
+    stmt = (
+        select(
+            WorkPackage.start_date,
+            func.coalesce(WorkPackage.end_date, WorkPackage.start_date),
+            func.coalesce(WorkPackageCost.original_contract_price, 0) + func.coalesce(approved.c.approved, 0),
+            WorkPackage.discipline,
+            WorkPackage.status,
+        )
+        .outerjoin(WorkPackageCost, WorkPackageCost.work_package_id == WorkPackage.id)
+        .outerjoin(approved, approved.c.cost_id == WorkPackageCost.id)
+        .where(WorkPackage.start_date.is_not(None))
+    )
+    rows = db.execute(stmt).all()
+    n = len(rows)
+    start = np.fromiter((r[0].toordinal() for r in rows), dtype=np.int64, count=n)
+    end = np.fromiter((r[1].toordinal() for r in rows), dtype=np.int64, count=n)
+    value_cents = np.fromiter((Money.of(r[2]).cents for r in rows), dtype=np.int64, count=n)
+    disc_index = {d: i for i, d in enumerate(DISCIPLINES)}
+    status_index = {s: i for i, s in enumerate(STATUSES)}
+    discipline = np.fromiter((disc_index[r[3]] for r in rows), dtype=np.int8, count=n)
+    status = np.fromiter((status_index[r[4]] for r in rows), dtype=np.int8, count=n)
+
+    origin = int(start.min()) if n else date.today().toordinal()
+    end = np.maximum(end, start)
+    days = int(end.max()) - origin + 1 if n else 1
+    return PackageArrays(
+        origin=origin,
+        days=days,
+        start=start - origin,
+        duration=end - start + 1,
+        value_cents=value_cents,
+        discipline=discipline,
+        status=status,
+    )
+
+
+def daily_spend(
+    start: np.ndarray, duration: np.ndarray, value: np.ndarray, group: np.ndarray, groups: int, days: int,
+    profile: SpendProfile,
+) -> np.ndarray:
+    """Spread each package's value over its days; returns a (groups, days) array.
+
+    No per-day loop: every package contributes a handful of point updates to a
+    difference array (one per group, flattened so a single bincount covers all
+    groups) and cumulative sums turn them back into daily values.
+
+    * uniform: a constant rate V/d on [s, s+d-1] is +rate at s and -rate at s+d
+      in the first difference.
+    * front-loaded: f(t) = b·(d - (t - s)) with b = 2V/(d(d+1)) is linear, so its
+      second difference is just +b·d at s, -b·(d+1) at s+1 and +b at s+d+1.
+    """
+    width = days + 2  # room for the trailing updates past the last day
+    base = group.astype(np.int64) * width
+    if profile is SpendProfile.UNIFORM:
+        rate = value / duration
+        index = np.concatenate([base + start, base + start + duration])
+        weights = np.concatenate([rate, -rate])
+        order = 1
+    else:
+        b = 2.0 * value / (duration * (duration + 1))
+        index = np.concatenate([base + start, base + start + 1, base + start + duration + 1])
+        weights = np.concatenate([b * duration, -b * (duration + 1), b])
+        order = 2
+    diff = np.bincount(index, weights=weights, minlength=groups * width).reshape(groups, width)
+    for _ in range(order):
+        diff = np.cumsum(diff, axis=1)
+    return diff[:, :days]
+
+
+def _filter_mask(
+    arrays: PackageArrays, disciplines: Optional[Sequence[Discipline]], statuses: Optional[Sequence[WorkPackageStatus]]
+) -> np.ndarray:
+    mask = np.ones(arrays.start.shape, dtype=bool)
+    if disciplines:
+        mask &= np.isin(arrays.discipline, [DISCIPLINES.index(d) for d in disciplines])
+    if statuses:
+        mask &= np.isin(arrays.status, [STATUSES.index(s) for s in statuses])
+    return mask
+
+
+def compute_s_curves(
+    arrays: PackageArrays,
+    disciplines: Optional[Sequence[Discipline]] = None,
+    statuses: Optional[Sequence[WorkPackageStatus]] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    profile: SpendProfile = SpendProfile.UNIFORM,
+) -> SCurveResponse:
+    """Daily and cumulative spend plus active-package counts, per discipline and in total.
+
+    Cumulative spend counts everything planned since the first package started,
+    so a window that opens mid-shutdown still starts at the spend to date.
+    """
+    first = date.fromordinal(arrays.origin)
+    date_from = date_from or first
+    date_to = date_to or date.fromordinal(arrays.origin + arrays.days - 1)
+    if date_to < date_from:
+        raise ValueError("date_to must not be before date_from")
+
+    mask = _filter_mask(arrays, disciplines, statuses)
+    start, duration = arrays.start[mask], arrays.duration[mask]
+    group = arrays.discipline[mask]
+    groups = len(DISCIPLINES)
+    days = arrays.days
+    spend = daily_spend(start, duration, arrays.value_cents[mask] / 100, group, groups, days, profile)
+    active = daily_spend(start, duration, duration.astype(np.float64), group, groups, days, SpendProfile.UNIFORM)
+    cumulative = np.cumsum(spend, axis=1)
+
+    # Map the requested window onto the computed range; days outside it are zero
+    # (or, for cumulative, flat at the nearest edge)
+    offsets = np.arange((date_to - date_from).days + 1) + (date_from.toordinal() - arrays.origin)
+    inside = (offsets >= 0) & (offsets < days)
+    clipped = np.clip(offsets, 0, days - 1)
+
+    def window(matrix: np.ndarray, flat_edges: bool = False) -> np.ndarray:
+        out = matrix[:, clipped]
+        if flat_edges:
+            out = np.where(offsets < 0, 0.0, out)
+        else:
+            out = np.where(inside, out, 0.0)
+        return out
+
+    spend_w, cum_w, active_w = window(spend), window(cumulative, flat_edges=True), window(active)
+    present = np.bincount(group, minlength=groups) > 0
+
+    def series(discipline: Optional[Discipline], s: np.ndarray, c: np.ndarray, a: np.ndarray) -> SCurveSeries:
+        return SCurveSeries(
+            discipline=discipline,
+            daily_cost=np.round(s, 2).tolist(),
+            cumulative_cost=np.round(c, 2).tolist(),
+            active_packages=np.rint(a).astype(np.int64).tolist(),
+        )
+
+    return SCurveResponse(
+        start_date=date_from,
+        end_date=date_to,
+        profile=profile.value,
+        series=[series(d, spend_w[i], cum_w[i], active_w[i]) for i, d in enumerate(DISCIPLINES) if present[i]],
+        total=series(None, spend_w.sum(axis=0), cum_w.sum(axis=0), active_w.sum(axis=0)),
+    )
+
+
+@read_only
+def get_s_curves(
+    db: Session,
+    disciplines: Optional[Sequence[Discipline]] = None,
+    statuses: Optional[Sequence[WorkPackageStatus]] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    profile: SpendProfile = SpendProfile.UNIFORM,
+) -> SCurveResponse:
+    """Cached S-curves; arrays and results are reused until the data version changes."""
+    global _arrays, _arrays_version
+    version = data_version(db)
+    key = (
+        version,
+        tuple(sorted(d.name for d in disciplines or ())),
+        tuple(sorted(s.name for s in statuses or ())),
+        date_from,
+        date_to,
+        profile,
+    )
+    with _lock:
+        if _arrays_version != version:
+            _arrays, _arrays_version = None, None
+            _curves.clear()
+        cached = _curves.get(key)
+        if cached is not None:
+            _curves.move_to_end(key)
+            CACHE_REQUESTS.inc(("s_curves", "hit"))
+            return cached
+        arrays = _arrays
+    CACHE_REQUESTS.inc(("s_curves", "miss"))
+
+    if arrays is None:
+        arrays = load_arrays(db)
+    result = compute_s_curves(arrays, disciplines, statuses, date_from, date_to, profile)
+
+    with _lock:
+        if _arrays_version in (None, version):
+            _arrays, _arrays_version = arrays, version
+            _curves[key] = result
+            while len(_curves) > MAX_CACHED_CURVES:
+                _curves.popitem(last=False)
+    return result
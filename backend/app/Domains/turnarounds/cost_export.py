@@ -0,0 +1,224 @@
+# Streaming export of turnaround cost data (CSV / Parquet)
+from __future__ import annotations
+
+import csv
+import io
+from typing import Any, Iterator, Sequence
+
+from sqlalchemy import Select, case, func, select
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+from app.core.money import Money
+from app.Domains.turnarounds.cost_models import (
+    CostBreakdownItem,
+    VariationOrder,
+    VariationOrderStatus,
+    WorkPackageCost,
+)
+from app.Domains.turnarounds.cost_service import PENDING_VARIATION_STATUSES
+
+# Rows fetched per round trip; each batch also becomes one CSV chunk / Parquet row group
+EXPORT_BATCH_SIZE = 5000
+
+EXPORT_FORMATS = ("csv", "parquet")
+
+MONEY_COLUMNS = (
+    "original_contract_price",
+    "allowances",
+    "approved_variations",
+    "pending_variations",
+    "revised_contract_price",
+    "estimate_final_contract_price",
+    "breakdown_total",
+)
+EXPORT_COLUMNS = (
+    "work_package_id",
+    "cost_id",
+    "status",
+    "rto_number",
+    "po_number",
+    "locked",
+    *MONEY_COLUMNS,
+    "variation_count",
+    "breakdown_count",
+    "updated_at",
+)
+
+
+class ExportFormatError(ValueError):
+    """The export format is unknown or its writer is not installed."""
+
+
+def export_query() -> Select:
+    """One row per cost record joined with its variation and breakdown aggregates."""
+    vo = (
+        select(
+            VariationOrder.work_package_cost_id.label("cost_id"),
+            func.sum(
+                case((VariationOrder.status == VariationOrderStatus.APPROVED, VariationOrder.value_amount), else_=0)
+            ).label("approved"),
+            func.sum(
+                case((VariationOrder.status.in_(PENDING_VARIATION_STATUSES), VariationOrder.value_amount), else_=0)
+            ).label("pending"),
+            func.count().label("n"),
+        )
+        .group_by(VariationOrder.work_package_cost_id)
+        .subquery()
+    )
+    bd = (
+        select(
+            CostBreakdownItem.work_package_cost_id.label("cost_id"),
+            func.sum(CostBreakdownItem.value_amount).label("total"),
+            func.count().label("n"),
+        )
+        .group_by(CostBreakdownItem.work_package_cost_id)
+        .subquery()
+    )
+    approved = func.coalesce(vo.c.approved, 0)
+    pending = func.coalesce(vo.c.pending, 0)
+    original = WorkPackageCost.original_contract_price
+    return (
+        select(
+            WorkPackageCost.work_package_id,
+            WorkPackageCost.id.label("cost_id"),
+            WorkPackageCost.status,
+            WorkPackageCost.rto_number,
+            WorkPackageCost.po_number,
+            WorkPackageCost.locked,
+            original.label("original_contract_price"),
+            WorkPackageCost.allowances,
+            approved.label("approved_variations"),
+            pending.label("pending_variations"),
+            (original + approved).label("revised_contract_price"),
+            (original + approved + pending).label("estimate_final_contract_price"),
+            func.coalesce(bd.c.total, 0).label("breakdown_total"),
+            func.coalesce(vo.c.n, 0).label("variation_count"),
+            func.coalesce(bd.c.n, 0).label("breakdown_count"),
+            WorkPackageCost.updated_at,
+        )
+        .outerjoin(vo, vo.c.cost_id == WorkPackageCost.id)
+        .outerjoin(bd, bd.c.cost_id == WorkPackageCost.id)
+        .order_by(WorkPackageCost.work_package_id)
+    )
+
+
+def iter_export_batches(db: Session, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[Sequence[Row]]:
+    # yield_per streams from the cursor (server-side on Postgres) instead of buffering the result
+    result = db.execute(export_query().execution_options(yield_per=batch_size))
+    yield from result.partitions()
+
+
+def _money(value: Any) -> Money:
+    return Money.of(value)
+
+
+# ---------- CSV ----------
+def _csv_value(column: str, value: Any) -> Any:
+    if value is None:
+        return ""
+    if column in MONEY_COLUMNS:
+        return str(_money(value))
+    if column == "status":
+        return value.value
+    if column == "updated_at":
+        return value.isoformat()
+    return value
+
+
+def stream_csv(batches: Iterator[Sequence[Row]]) -> Iterator[bytes]:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(EXPORT_COLUMNS)
+    yield buf.getvalue().encode()
+    for batch in batches:
+        buf.seek(0)
+        buf.truncate()
+        writer.writerows([_csv_value(c, v) for c, v in zip(EXPORT_COLUMNS, row)] for row in batch)
+        yield buf.getvalue().encode()
+
+
+# ---------- Parquet ----------
+class _DrainableSink(io.RawIOBase):
+    """Write-only file object whose buffered bytes are handed out after each row group."""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+        self._pos = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        data = bytes(b)
+        self._chunks.append(data)
+        self._pos += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._pos
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _parquet_schema(pa):
+    money = pa.decimal128(18, 2)
+    return pa.schema(
+        [
+            ("work_package_id", pa.string()),
+            ("cost_id", pa.string()),
+            ("status", pa.string()),
+            ("rto_number", pa.string()),
+            ("po_number", pa.string()),
+            ("locked", pa.bool_()),
+            *[(c, money) for c in MONEY_COLUMNS],
+            ("variation_count", pa.int64()),
+            ("breakdown_count", pa.int64()),
+            ("updated_at", pa.timestamp("us")),
+        ]
+    )
+
+
+def stream_parquet(batches: Iterator[Sequence[Row]]) -> Iterator[bytes]:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _parquet_schema(pa)
+    sink = _DrainableSink()
+    writer = pq.ParquetWriter(sink, schema)
+    try:
+        for batch in batches:
+            # Transpose the batch into columns; money stays exact as decimal128(18, 2)
+            columns = list(zip(*batch))
+            arrays = []
+            for field, name, values in zip(schema, EXPORT_COLUMNS, columns):
+                if name in MONEY_COLUMNS:
+                    values = [_money(v).to_decimal() for v in values]
+                elif name == "status":
+                    values = [v.value for v in values]
+                arrays.append(pa.array(values, type=field.type))
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def check_export_format(fmt: str) -> None:
+    """Fail before any bytes are sent if `fmt` cannot be produced here."""
+    if fmt not in EXPORT_FORMATS:
+        raise ExportFormatError(f"Unknown export format '{fmt}'; expected one of {', '.join(EXPORT_FORMATS)}")
+    if fmt == "parquet":
+        try:
+            import pyarrow.parquet  # noqa: F401
+        except ImportError as exc:  # pragma: no cover - depends on deployment
+            raise ExportFormatError("Parquet export requires the 'pyarrow' package") from exc
+
+
+def stream_export(db: Session, fmt: str, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[bytes]:
+    check_export_format(fmt)
+    batches = iter_export_batches(db, batch_size)
+    return stream_csv(batches) if fmt == "csv" else stream_parquet(batches)
@@ -0,0 +1,163 @@
+# Streaming spreadsheet import for the Turnarounds Cost Tab
+from __future__ import annotations
+
+import csv
+import io
+import uuid
+from datetime import datetime
+from typing import Any, BinaryIO, Iterable, Iterator, Optional, Type
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.Domains.turnarounds.cost_models import CostBreakdownItem, VariationOrder, WorkPackageCost
+from app.Domains.turnarounds.cost_schemas import (
+    BreakdownItemCreate,
+    ImportResult,
+    ImportRowError,
+    VariationOrderCreate,
+)
+from app.Domains.turnarounds.cost_service import compute_summary, validation_error_details
+
+# Rows are validated and inserted this many at a time, so memory is bounded by the
+# chunk rather than the file. The error report is capped for the same reason.
+IMPORT_CHUNK_SIZE = 1000
+MAX_REPORTED_ERRORS = 500
+
+
+class ImportFormatError(ValueError):
+    """The upload cannot be read as a supported spreadsheet."""
+
+
+def _normalize_header(name: Any) -> str:
+    return str(name or "").strip().lower().replace(" ", "_")
+
+
+def _clean(value: Any) -> Any:
+    if isinstance(value, str):
+        value = value.strip()
+        return value or None
+    return value
+
+
+def iter_csv_rows(fileobj: BinaryIO) -> Iterator[dict[str, Any]]:
+    text = io.TextIOWrapper(fileobj, encoding="utf-8-sig", newline="")
+    try:
+        reader = csv.reader(text)
+        header = next(reader, None)
+        if header is None:
+            return
+        keys = [_normalize_header(h) for h in header]
+        for values in reader:
+            yield {k: _clean(v) for k, v in zip(keys, values) if k}
+    except UnicodeDecodeError as exc:
+        raise ImportFormatError("CSV file is not UTF-8 encoded") from exc
+    finally:
+        text.detach()
+
+
+def iter_xlsx_rows(fileobj: BinaryIO) -> Iterator[dict[str, Any]]:
+    try:
+        from openpyxl import load_workbook
+    except ImportError as exc:  # pragma: no cover - depends on deployment
+        raise ImportFormatError("XLSX import requires the 'openpyxl' package") from exc
+
+    try:
+        # read_only mode streams rows from the sheet XML instead of building the workbook
+        wb = load_workbook(fileobj, read_only=True, data_only=True)
+    except Exception as exc:
+        raise ImportFormatError("File is not a valid XLSX workbook") from exc
+    try:
+        rows = wb.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        keys = [_normalize_header(h) for h in header]
+        for values in rows:
+            yield {k: _clean(v) for k, v in zip(keys, values) if k}
+    finally:
+        wb.close()
+
+
+def iter_upload_rows(fileobj: BinaryIO, filename: Optional[str]) -> Iterator[dict[str, Any]]:
+    name = (filename or "").lower()
+    if name.endswith(".xlsx"):
+        return iter_xlsx_rows(fileobj)
+    if name.endswith(".csv") or not name:
+        return iter_csv_rows(fileobj)
+    raise ImportFormatError("Unsupported file type; upload a .csv or .xlsx file")
+
+
+def _import_rows(
+    db: Session,
+    cost: WorkPackageCost,
+    rows: Iterable[dict[str, Any]],
+    model: Type[CostBreakdownItem] | Type[VariationOrder],
+    schema: Type[BaseModel],
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+) -> ImportResult:
+    """Validate `rows` in chunks and bulk insert the valid ones in one transaction.
+
+    Row numbers in the error report are spreadsheet rows, with the header on row 1.
+    """
+    rows_read = rows_imported = rows_failed = 0
+    errors: list[ImportRowError] = []
+    pending: list[tuple[int, dict[str, Any]]] = []
+
+    def flush() -> None:
+        nonlocal rows_imported, rows_failed
+        now = datetime.utcnow()
+        valid: list[dict[str, Any]] = []
+        for row_number, raw in pending:
+            try:
+                obj = schema.model_validate(raw)
+            except ValidationError as exc:
+                rows_failed += 1
+                if len(errors) < MAX_REPORTED_ERRORS:
+                    errors.append(ImportRowError(row=row_number, errors=validation_error_details(exc)))
+                continue
+            valid.append(
+                {
+                    **obj.model_dump(),
+                    "id": str(uuid.uuid4()),
+                    "work_package_cost_id": cost.id,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+            )
+        if valid:
+            db.execute(insert(model), valid)
+            rows_imported += len(valid)
+        pending.clear()
+
+    try:
+        for row_number, raw in enumerate(rows, start=2):
+            if not any(v is not None for v in raw.values()):
+                continue
+            rows_read += 1
+            pending.append((row_number, raw))
+            if len(pending) >= chunk_size:
+                flush()
+        flush()
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    return ImportResult(
+        rows_read=rows_read,
+        rows_imported=rows_imported,
+        rows_failed=rows_failed,
+        errors=errors,
+        errors_truncated=rows_failed > len(errors),
+        summary=compute_summary(db, cost),
+    )
+
+
+def import_breakdown_items(db: Session, cost: WorkPackageCost, rows: Iterable[dict[str, Any]]) -> ImportResult:
+    return _import_rows(db, cost, rows, CostBreakdownItem, BreakdownItemCreate)
+
+
+def import_variation_orders(db: Session, cost: WorkPackageCost, rows: Iterable[dict[str, Any]]) -> ImportResult:
+    return _import_rows(db, cost, rows, VariationOrder, VariationOrderCreate)
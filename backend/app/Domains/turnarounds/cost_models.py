@@ -16,11 +16,11 @@ from sqlalchemy import (
     Text,
     UniqueConstraint,
     Index,
-    Numeric,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 import uuid
 
+from app.core.money import Money, MoneyType
 from app.models import Base
 
 
@@ -49,7 +49,9 @@ class WorkPackageCost(Base):
     __tablename__ = "work_package_costs"
 
     id: Mapped[str] = mapped_column(UUIDCol, primary_key=True, default=lambda: str(uuid.uuid4()))
-    work_package_id: Mapped[str] = mapped_column(UUIDCol, nullable=False, index=True)
+    work_package_id: Mapped[str] = mapped_column(
+        UUIDCol, ForeignKey("work_packages.id", ondelete="CASCADE", name="fk_costs_work_package"), nullable=False
+    )
 
     rto_number: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
     po_number: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
@@ -59,8 +61,8 @@ class WorkPackageCost(Base):
         nullable=False,
     )
 
-    original_contract_price: Mapped[float] = mapped_column(Numeric(18, 2), default=0, nullable=False)
-    allowances: Mapped[float] = mapped_column(Numeric(18, 2), default=0, nullable=False)
+    original_contract_price: Mapped[Money] = mapped_column(MoneyType, default=Money(0), nullable=False)
+    allowances: Mapped[Money] = mapped_column(MoneyType, default=Money(0), nullable=False)
 
     locked: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
 
@@ -70,23 +72,23 @@ class WorkPackageCost(Base):
     breakdown_items: Mapped[list[CostBreakdownItem]] = relationship(
         back_populates="work_package_cost",
         cascade="all, delete-orphan",
-        lazy="selectin",
+        lazy="select",
     )
     variation_orders: Mapped[list[VariationOrder]] = relationship(
         back_populates="work_package_cost",
         cascade="all, delete-orphan",
-        lazy="selectin",
+        lazy="select",
     )
     rto: Mapped[Optional[RequisitionToOrder]] = relationship(
         back_populates="work_package_cost",
         cascade="all, delete-orphan",
         uselist=False,
-        lazy="selectin",
+        lazy="select",
     )
 
     __table_args__ = (
+        # The unique constraint's index serves every lookup by work package
         UniqueConstraint("work_package_id", name="uq_costs_wp_id"),
-        Index("idx_costs_wp_id", "work_package_id"),
     )
 
 
@@ -100,7 +102,7 @@ class CostBreakdownItem(Base):
 
     item: Mapped[str] = mapped_column(String(120), nullable=False)
     description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
-    value_amount: Mapped[float] = mapped_column(Numeric(18, 2), nullable=False)
+    value_amount: Mapped[Money] = mapped_column(MoneyType, nullable=False)
 
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
@@ -109,6 +111,8 @@ class CostBreakdownItem(Base):
 
     __table_args__ = (
         CheckConstraint("value_amount >= 0", name="ck_breakdown_value_nonneg"),
+        # Listing a cost's items in entry order
+        Index("ix_breakdown_items_cost_created", "work_package_cost_id", "created_at"),
     )
 
 
@@ -122,7 +126,7 @@ class VariationOrder(Base):
 
     vo_number: Mapped[str] = mapped_column(String(64), nullable=False)
     description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
-    value_amount: Mapped[float] = mapped_column(Numeric(18, 2), nullable=False)
+    value_amount: Mapped[Money] = mapped_column(MoneyType, nullable=False)
     status: Mapped[VariationOrderStatus] = mapped_column(
         SAEnum(VariationOrderStatus, name="variation_order_status_enum", native_enum=False),
         default=VariationOrderStatus.PENDING,
@@ -138,6 +142,8 @@ class VariationOrder(Base):
 
     __table_args__ = (
         CheckConstraint("value_amount >= 0", name="ck_vo_value_nonneg"),
+        # Approved/pending sums for the contract summary, and listing a cost's orders
+        Index("ix_variation_orders_cost_status", "work_package_cost_id", "status"),
     )
 
 
@@ -154,14 +160,14 @@ class RequisitionToOrder(Base):
     contact_person: Mapped[Optional[str]] = mapped_column(String(160), nullable=True)
     email: Mapped[Optional[str]] = mapped_column(String(160), nullable=True)
     notes: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
-    subtotal_amount: Mapped[float] = mapped_column(Numeric(18, 2), default=0, nullable=False)
+    subtotal_amount: Mapped[Money] = mapped_column(MoneyType, default=Money(0), nullable=False)
 
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
     work_package_cost: Mapped[WorkPackageCost] = relationship(back_populates="rto")
     selected_items: Mapped[list[RtoSelectedItem]] = relationship(
-        back_populates="rto", cascade="all, delete-orphan", lazy="selectin"
+        back_populates="rto", cascade="all, delete-orphan", lazy="select"
     )
 
 
@@ -1,10 +1,19 @@
 from __future__ import annotations
+from datetime import date
 from decimal import Decimal
-from typing import Optional
-from pydantic import BaseModel, Field
+from typing import Any, Literal, Optional
+from pydantic import BaseModel, Field, field_serializer, field_validator
+from app.core.money import Money
 from app.Domains.turnarounds.cost_models import WorkPackageCostStatus, VariationOrderStatus  # noqa: F401
 
 
+def reject_null(value: Any) -> Any:
+    # Partial updates apply only the fields sent, so null means "clear it": not allowed for NOT NULL columns
+    if value is None:
+        raise ValueError("Field can be omitted but not null")
+    return value
+
+
 # ---------- Header ----------
 class CostHeaderRead(BaseModel):
     rto_number: Optional[str] = None
@@ -22,14 +31,148 @@ class CostHeaderUpdate(BaseModel):
 
 # ---------- Contract Summary ----------
 class ContractSummaryRead(BaseModel):
-    original_contract_price: Decimal = Field(..., ge=0)
-    allowances: Decimal = Field(..., ge=0)
-    approved_variations: Decimal = Field(..., ge=0)
-    pending_variations: Decimal = Field(..., ge=0)
-    revised_contract_price: Decimal = Field(..., ge=0)
-    estimate_final_contract_price: Decimal = Field(..., ge=0)
+    original_contract_price: Money
+    allowances: Money
+    approved_variations: Money
+    pending_variations: Money
+    revised_contract_price: Money
+    estimate_final_contract_price: Money
+
+    # The summary has always sent a zero amount as "0" rather than "0.00"; keep the wire format
+    @field_serializer("*", when_used="json")
+    def _amount(self, value: Money) -> str:
+        return str(value) if value else "0"
 
 
 class ContractSummaryUpdate(BaseModel):
     original_contract_price: Optional[Decimal] = Field(None, ge=0)
     allowances: Optional[Decimal] = Field(None, ge=0)
+
+
+# ---------- Breakdown Items ----------
+class BreakdownItemCreate(BaseModel):
+    item: str = Field(..., min_length=1, max_length=120)
+    description: Optional[str] = None
+    value_amount: Decimal = Field(..., ge=0, max_digits=18, decimal_places=2)
+
+
+class BreakdownItemUpdate(BaseModel):
+    id: str
+    item: Optional[str] = Field(None, min_length=1, max_length=120)
+    description: Optional[str] = None
+    value_amount: Optional[Decimal] = Field(None, ge=0, max_digits=18, decimal_places=2)
+
+    _not_null = field_validator("item", "value_amount")(reject_null)
+
+
+class BreakdownItemRead(BaseModel):
+    id: str
+    item: str
+    description: Optional[str] = None
+    value_amount: Money
+
+    class Config:
+        from_attributes = True
+
+
+# ---------- Variation Orders ----------
+class VariationOrderCreate(BaseModel):
+    vo_number: str = Field(..., min_length=1, max_length=64)
+    description: Optional[str] = None
+    value_amount: Decimal = Field(..., ge=0, max_digits=18, decimal_places=2)
+    status: VariationOrderStatus = VariationOrderStatus.PENDING
+    date_raised: date
+    date_approved: Optional[date] = None
+
+
+class VariationOrderUpdate(BaseModel):
+    id: str
+    vo_number: Optional[str] = Field(None, min_length=1, max_length=64)
+    description: Optional[str] = None
+    value_amount: Optional[Decimal] = Field(None, ge=0, max_digits=18, decimal_places=2)
+    status: Optional[VariationOrderStatus] = None
+    date_raised: Optional[date] = None
+    date_approved: Optional[date] = None
+
+    _not_null = field_validator("vo_number", "value_amount", "status", "date_raised")(reject_null)
+
+
+class VariationOrderRead(BaseModel):
+    id: str
+    vo_number: str
+    description: Optional[str] = None
+    value_amount: Money
+    status: VariationOrderStatus
+    date_raised: date
+    date_approved: Optional[date] = None
+
+    class Config:
+        from_attributes = True
+
+
+# ---------- Batch ----------
+# Rows are accepted as raw objects and validated one by one in the service, so a
+# bad row is reported in `errors` instead of failing the whole request with 422.
+class BatchRequest(BaseModel):
+    create: list[dict[str, Any]] = Field(default_factory=list)
+    update: list[dict[str, Any]] = Field(default_factory=list)
+    delete: list[str] = Field(default_factory=list)
+
+
+class BatchItemError(BaseModel):
+    op: Literal["create", "update", "delete"]
+    index: int
+    id: Optional[str] = None
+    errors: list[dict[str, Any]]
+
+
+class BatchResult(BaseModel):
+    created: list[str] = Field(default_factory=list)
+    updated: list[str] = Field(default_factory=list)
+    deleted: list[str] = Field(default_factory=list)
+    errors: list[BatchItemError] = Field(default_factory=list)
+    summary: ContractSummaryRead
+
+
+# ---------- Import ----------
+class ImportRowError(BaseModel):
+    row: int
+    errors: list[dict[str, Any]]
+
+
+class ImportResult(BaseModel):
+    rows_read: int
+    rows_imported: int
+    rows_failed: int
+    errors: list[ImportRowError] = Field(default_factory=list)
+    errors_truncated: bool = False
+    summary: ContractSummaryRead
+
+
+# ---------- Requisition to Order ----------
+class RtoRead(BaseModel):
+    id: str
+    rto_number: Optional[str] = None
+    supplier: Optional[str] = None
+    contact_person: Optional[str] = None
+    email: Optional[str] = None
+    notes: Optional[str] = None
+    subtotal_amount: Money
+
+    class Config:
+        from_attributes = True
+
+
+class RtoItemSelection(BaseModel):
+    breakdown_item_id: str
+    included: bool = True
+
+
+class RtoSelectionUpdate(BaseModel):
+    items: list[RtoItemSelection]
+
+
+class RtoSubtotalDrift(BaseModel):
+    rto_id: str
+    stored: Money
+    computed: Money
@@ -0,0 +1,419 @@
+# DB operations for the Turnarounds Cost Tab
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+from typing import Any, Optional, Type
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import bindparam, case, delete, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.money import Money
+from app.core.tracing import traced
+from app.db.routing import primary_reads, read_only
+from app.Domains.turnarounds.cost_models import (
+    CostBreakdownItem,
+    RequisitionToOrder,
+    RtoSelectedItem,
+    VariationOrder,
+    VariationOrderStatus,
+    WorkPackageCost,
+)
+from app.Domains.turnarounds.models import Discipline, WorkPackage
+from app.Domains.turnarounds.cost_schemas import (
+    BatchItemError,
+    BatchRequest,
+    BatchResult,
+    BreakdownItemCreate,
+    BreakdownItemUpdate,
+    ContractSummaryRead,
+    RtoSelectionUpdate,
+    RtoSubtotalDrift,
+    VariationOrderCreate,
+    VariationOrderUpdate,
+)
+
+
+# Variation statuses that count towards pending (not yet approved) variations
+PENDING_VARIATION_STATUSES = (
+    VariationOrderStatus.PROPOSED,
+    VariationOrderStatus.PENDING,
+    VariationOrderStatus.IN_PROGRESS,
+)
+
+
+# ---------- Cost row ----------
+def ensure_cost_row(db: Session, wp_id: str) -> WorkPackageCost:
+    """Return the cost row for a work package, creating it on first access.
+
+    An unknown id gets a placeholder package, like the ones the work_packages
+    migration backfilled: the cost pages still address packages by client-side ids.
+    """
+    query = select(WorkPackageCost).where(WorkPackageCost.work_package_id == wp_id)
+    # Decide on the primary: a lagging replica would miss rows and send us into duplicate inserts
+    with primary_reads(db):
+        cost: Optional[WorkPackageCost] = db.scalars(query).first()
+        if cost is not None:
+            return cost
+        try:
+            if db.get(WorkPackage, wp_id) is None:
+                db.add(WorkPackage(id=wp_id, title="Imported work package", discipline=Discipline.MECHANICAL))
+                db.flush()  # no relationship between the two, so the unit of work won't order the inserts
+            cost = WorkPackageCost(work_package_id=wp_id)
+            db.add(cost)
+            db.commit()
+        except IntegrityError:
+            # Another request created it first
+            db.rollback()
+            return db.scalars(query).one()
+        db.refresh(cost)
+    return cost
+
+
+def summary_from_amounts(original_price, allowances, approved, pending) -> ContractSummaryRead:
+    original = Money.of(original_price)
+    approved = Money.of(approved)
+    pending = Money.of(pending)
+    revised = original + approved
+    efc = revised + pending
+
+    return ContractSummaryRead(
+        original_contract_price=original,
+        allowances=Money.of(allowances),
+        approved_variations=approved,
+        pending_variations=pending,
+        revised_contract_price=revised,
+        estimate_final_contract_price=efc,
+    )
+
+
+@traced()
+@read_only
+def compute_summary(db: Session, cost: WorkPackageCost) -> ContractSummaryRead:
+    approved_sum = (
+        db.query(func.coalesce(func.sum(VariationOrder.value_amount), 0))
+        .filter(
+            VariationOrder.work_package_cost_id == cost.id,
+            VariationOrder.status == VariationOrderStatus.APPROVED,
+        )
+        .scalar()
+    )
+    pending_sum = (
+        db.query(func.coalesce(func.sum(VariationOrder.value_amount), 0))
+        .filter(
+            VariationOrder.work_package_cost_id == cost.id,
+            VariationOrder.status.in_(PENDING_VARIATION_STATUSES),
+        )
+        .scalar()
+    )
+
+    return summary_from_amounts(cost.original_contract_price, cost.allowances, approved_sum, pending_sum)
+
+
+# ---------- Listings ----------
+@traced()
+@read_only
+def list_breakdown_items(db: Session, cost: WorkPackageCost) -> list[CostBreakdownItem]:
+    stmt = (
+        select(CostBreakdownItem)
+        .where(CostBreakdownItem.work_package_cost_id == cost.id)
+        .order_by(CostBreakdownItem.created_at, CostBreakdownItem.id)
+    )
+    return list(db.scalars(stmt))
+
+
+@traced()
+@read_only
+def list_variation_orders(db: Session, cost: WorkPackageCost) -> list[VariationOrder]:
+    stmt = (
+        select(VariationOrder)
+        .where(VariationOrder.work_package_cost_id == cost.id)
+        .order_by(VariationOrder.date_raised, VariationOrder.vo_number)
+    )
+    return list(db.scalars(stmt))
+
+
+# ---------- Batch ----------
+def validation_error_details(exc: ValidationError) -> list[dict[str, Any]]:
+    return [{"loc": list(e["loc"]), "msg": e["msg"], "type": e["type"]} for e in exc.errors()]
+
+
+def _message(msg: str, type_: str) -> list[dict[str, Any]]:
+    return [{"loc": ["id"], "msg": msg, "type": type_}]
+
+
+def _apply_batch(
+    db: Session,
+    cost: WorkPackageCost,
+    payload: BatchRequest,
+    model: Type[CostBreakdownItem] | Type[VariationOrder],
+    create_schema: Type[BaseModel],
+    update_schema: Type[BaseModel],
+) -> BatchResult:
+    """Apply creates, updates and deletes for one cost row in a single transaction.
+
+    Every row is validated on its own; invalid rows are reported in `errors` and
+    skipped while the rest are written with one bulk statement per operation.
+    """
+    now = datetime.utcnow()
+    errors: list[BatchItemError] = []
+
+    create_rows: list[dict[str, Any]] = []
+    for i, raw in enumerate(payload.create):
+        try:
+            obj = create_schema.model_validate(raw)
+        except ValidationError as exc:
+            errors.append(BatchItemError(op="create", index=i, errors=validation_error_details(exc)))
+            continue
+        create_rows.append(
+            {
+                **obj.model_dump(),
+                "id": str(uuid.uuid4()),
+                "work_package_cost_id": cost.id,
+                "created_at": now,
+                "updated_at": now,
+            }
+        )
+
+    parsed_updates: list[tuple[int, BaseModel]] = []
+    for i, raw in enumerate(payload.update):
+        try:
+            parsed_updates.append((i, update_schema.model_validate(raw)))
+        except ValidationError as exc:
+            raw_id = raw.get("id")
+            errors.append(
+                BatchItemError(
+                    op="update",
+                    index=i,
+                    id=raw_id if isinstance(raw_id, str) else None,
+                    errors=validation_error_details(exc),
+                )
+            )
+
+    # Resolve every referenced id (and its current value) against this cost row with one query
+    referenced = {u.id for _, u in parsed_updates} | set(payload.delete)
+    existing: dict[str, Money] = {}
+    if referenced:
+        existing = dict(
+            db.execute(
+                select(model.id, model.value_amount).where(
+                    model.work_package_cost_id == cost.id, model.id.in_(referenced)
+                )
+            ).all()
+        )
+
+    seen: set[str] = set()
+    update_rows: list[dict[str, Any]] = []
+    for i, upd in parsed_updates:
+        if upd.id not in existing:
+            errors.append(BatchItemError(op="update", index=i, id=upd.id, errors=_message("Not found", "not_found")))
+        elif upd.id in seen:
+            errors.append(
+                BatchItemError(op="update", index=i, id=upd.id, errors=_message("Referenced more than once", "duplicate"))
+            )
+        else:
+            seen.add(upd.id)
+            update_rows.append({**upd.model_dump(exclude_unset=True), "updated_at": now})
+
+    delete_ids: list[str] = []
+    for i, item_id in enumerate(payload.delete):
+        if item_id not in existing:
+            errors.append(BatchItemError(op="delete", index=i, id=item_id, errors=_message("Not found", "not_found")))
+        elif item_id in seen:
+            errors.append(
+                BatchItemError(op="delete", index=i, id=item_id, errors=_message("Referenced more than once", "duplicate"))
+            )
+        else:
+            seen.add(item_id)
+            delete_ids.append(item_id)
+
+    try:
+        if create_rows:
+            db.execute(insert(model), create_rows)
+        if update_rows:
+            db.execute(update(model), update_rows)
+        if model is CostBreakdownItem:
+            value_deltas = {
+                r["id"]: Money.of(r["value_amount"]) - Money.of(existing[r["id"]])
+                for r in update_rows
+                if "value_amount" in r
+            }
+            value_deltas.update({item_id: -Money.of(existing[item_id]) for item_id in delete_ids})
+            _propagate_item_deltas(db, value_deltas)
+            if delete_ids:
+                # Mirror the FK's ON DELETE SET NULL, which SQLite only enforces with foreign_keys=ON
+                db.execute(
+                    update(RtoSelectedItem)
+                    .where(RtoSelectedItem.breakdown_item_id.in_(delete_ids))
+                    .values(breakdown_item_id=None)
+                    .execution_options(synchronize_session=False)
+                )
+        if delete_ids:
+            db.execute(
+                delete(model).where(model.id.in_(delete_ids)).execution_options(synchronize_session=False)
+            )
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    return BatchResult(
+        created=[r["id"] for r in create_rows],
+        updated=[r["id"] for r in update_rows],
+        deleted=delete_ids,
+        errors=errors,
+        summary=compute_summary(db, cost),
+    )
+
+
+@traced()
+def apply_breakdown_batch(db: Session, cost: WorkPackageCost, payload: BatchRequest) -> BatchResult:
+    return _apply_batch(db, cost, payload, CostBreakdownItem, BreakdownItemCreate, BreakdownItemUpdate)
+
+
+@traced()
+def apply_variation_batch(db: Session, cost: WorkPackageCost, payload: BatchRequest) -> BatchResult:
+    return _apply_batch(db, cost, payload, VariationOrder, VariationOrderCreate, VariationOrderUpdate)
+
+
+# ---------- Requisition to Order ----------
+# `subtotal_amount` is maintained by delta: every change to an included item's value,
+# to an item's inclusion, or an item deletion adds its difference to the stored
+# subtotal, so reading an RTO never has to load its selected items.
+# `verify_rto_subtotals` recomputes everything to catch drift.
+_rto_table = RequisitionToOrder.__table__
+
+
+def _apply_rto_deltas(db: Session, deltas: dict[str, Money]) -> None:
+    params = [{"rto": rto_id, "delta": delta} for rto_id, delta in deltas.items() if delta]
+    if not params:
+        return
+    db.execute(
+        _rto_table.update()
+        .where(_rto_table.c.id == bindparam("rto"))
+        .values(
+            subtotal_amount=_rto_table.c.subtotal_amount + bindparam("delta", type_=_rto_table.c.subtotal_amount.type),
+            updated_at=datetime.utcnow(),
+        ),
+        params,
+    )
+
+
+def _propagate_item_deltas(db: Session, item_deltas: dict[str, Money]) -> None:
+    """Push breakdown item value changes into the subtotals of RTOs that include them."""
+    item_deltas = {k: v for k, v in item_deltas.items() if v}
+    if not item_deltas:
+        return
+    rows = db.execute(
+        select(RtoSelectedItem.rto_id, RtoSelectedItem.breakdown_item_id).where(
+            RtoSelectedItem.included.is_(True),
+            RtoSelectedItem.breakdown_item_id.in_(item_deltas.keys()),
+        )
+    ).all()
+    rto_deltas: dict[str, Money] = {}
+    for rto_id, item_id in rows:
+        rto_deltas[rto_id] = rto_deltas.get(rto_id, Money(0)) + item_deltas[item_id]
+    _apply_rto_deltas(db, rto_deltas)
+
+
+@traced()
+def ensure_rto_row(db: Session, cost: WorkPackageCost) -> RequisitionToOrder:
+    query = select(RequisitionToOrder).where(RequisitionToOrder.work_package_cost_id == cost.id)
+    with primary_reads(db):
+        rto: Optional[RequisitionToOrder] = db.scalars(query).first()
+        if rto is not None:
+            return rto
+        rto = RequisitionToOrder(work_package_cost_id=cost.id, rto_number=cost.rto_number)
+        db.add(rto)
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            return db.scalars(query).one()
+        db.refresh(rto)
+    return rto
+
+
+@traced()
+def update_rto_selection(db: Session, cost: WorkPackageCost, payload: RtoSelectionUpdate) -> RequisitionToOrder:
+    """Include or exclude breakdown items on the cost row's RTO and adjust its subtotal by delta."""
+    rto = ensure_rto_row(db, cost)
+    wanted = {sel.breakdown_item_id: sel.included for sel in payload.items}
+    if not wanted:
+        return rto
+
+    values = dict(
+        db.execute(
+            select(CostBreakdownItem.id, CostBreakdownItem.value_amount).where(
+                CostBreakdownItem.work_package_cost_id == cost.id, CostBreakdownItem.id.in_(wanted.keys())
+            )
+        ).all()
+    )
+    unknown = sorted(wanted.keys() - values.keys())
+    if unknown:
+        raise ValueError(f"Unknown breakdown items: {', '.join(unknown)}")
+
+    current = {
+        item_id: (sel_id, included)
+        for sel_id, item_id, included in db.execute(
+            select(RtoSelectedItem.id, RtoSelectedItem.breakdown_item_id, RtoSelectedItem.included).where(
+                RtoSelectedItem.rto_id == rto.id, RtoSelectedItem.breakdown_item_id.in_(wanted.keys())
+            )
+        )
+    }
+
+    delta = Money(0)
+    inserts: list[dict[str, Any]] = []
+    updates: list[dict[str, Any]] = []
+    for item_id, included in wanted.items():
+        sel_id, was_included = current.get(item_id, (None, False))
+        if sel_id is None:
+            inserts.append({"id": str(uuid.uuid4()), "rto_id": rto.id, "breakdown_item_id": item_id, "included": included})
+        elif was_included != included:
+            updates.append({"id": sel_id, "included": included})
+        else:
+            continue
+        delta += Money.of(values[item_id]) * (int(included) - int(was_included))
+
+    try:
+        if inserts:
+            db.execute(insert(RtoSelectedItem), inserts)
+        if updates:
+            db.execute(update(RtoSelectedItem), updates)
+        _apply_rto_deltas(db, {rto.id: delta})
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    db.refresh(rto)
+    return rto
+
+
+def verify_rto_subtotals(db: Session, fix: bool = False) -> list[RtoSubtotalDrift]:
+    """Recompute every RTO subtotal with one join aggregate and report (optionally fix) drift."""
+    computed = func.coalesce(
+        func.sum(case((RtoSelectedItem.included.is_(True), CostBreakdownItem.value_amount), else_=0)), 0
+    )
+    rows = db.execute(
+        select(RequisitionToOrder.id, RequisitionToOrder.subtotal_amount, computed.label("computed"))
+        .outerjoin(RtoSelectedItem, RtoSelectedItem.rto_id == RequisitionToOrder.id)
+        .outerjoin(CostBreakdownItem, CostBreakdownItem.id == RtoSelectedItem.breakdown_item_id)
+        .group_by(RequisitionToOrder.id, RequisitionToOrder.subtotal_amount)
+        .having(func.abs(RequisitionToOrder.subtotal_amount - computed) >= 0.005)
+    ).all()
+    drift = [
+        RtoSubtotalDrift(rto_id=rto_id, stored=Money.of(stored), computed=Money.of(total))
+        for rto_id, stored, total in rows
+    ]
+    if fix and drift:
+        # updated_at moves too, so updated_at watermarks (the cost snapshot) pick up the fixed subtotals
+        db.execute(
+            _rto_table.update()
+            .where(_rto_table.c.id == bindparam("rto"))
+            .values(subtotal_amount=bindparam("total"), updated_at=datetime.utcnow()),
+            [{"rto": d.rto_id, "total": d.computed} for d in drift],
+        )
+        db.commit()
+    return drift
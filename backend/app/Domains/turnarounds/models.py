@@ -1,8 +1,28 @@
-from pydantic import BaseModel, Field
-from typing import Optional
-from uuid import UUID, uuid4
-from datetime import date
+# SQLAlchemy models for Turnarounds work packages
+from __future__ import annotations
+
+import uuid
+from datetime import date, datetime
 from enum import Enum
+from typing import Optional
+
+from sqlalchemy import (
+    CheckConstraint,
+    Date,
+    DateTime,
+    Enum as SAEnum,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    UniqueConstraint,
+)
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models import Base
+from app.Domains.turnarounds.cost_models import UUIDCol
+
 
 class WorkPackageStatus(str, Enum):
     NOT_STARTED = "Not Started"
@@ -10,20 +30,63 @@ class WorkPackageStatus(str, Enum):
     COMPLETED = "Completed"
     ON_HOLD = "On Hold"
 
+
 class Discipline(str, Enum):
     MECHANICAL = "Mechanical"
     ELECTRICAL = "Electrical"
     INSTRUMENTATION = "Instrumentation"
     CIVIL = "Civil"
 
-class WorkPackage(BaseModel):
-    id: UUID = Field(default_factory=uuid4)
-    title: str
-    description: Optional[str] = None
-    status: WorkPackageStatus = WorkPackageStatus.NOT_STARTED
-    discipline: Discipline
-    start_date: Optional[date] = None
-    end_date: Optional[date] = None
-
-    class Config:
-        use_enum_values = True
+
+class WorkPackage(Base):
+    __tablename__ = "work_packages"
+
+    id: Mapped[str] = mapped_column(UUIDCol, primary_key=True, default=lambda: str(uuid.uuid4()))
+    title: Mapped[str] = mapped_column(String(200), nullable=False)
+    description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    status: Mapped[WorkPackageStatus] = mapped_column(
+        SAEnum(WorkPackageStatus, name="work_package_status_enum", native_enum=False),
+        default=WorkPackageStatus.NOT_STARTED,
+        nullable=False,
+    )
+    discipline: Mapped[Discipline] = mapped_column(
+        SAEnum(Discipline, name="discipline_enum", native_enum=False),
+        nullable=False,
+    )
+    start_date: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
+    end_date: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        CheckConstraint("start_date IS NULL OR end_date IS NULL OR end_date >= start_date", name="ck_wp_dates_ordered"),
+        # Filtered listing: equality on discipline/status, then range + order on start_date
+        Index("ix_work_packages_discipline_status_start", "discipline", "status", "start_date"),
+        # Unfiltered listing: keyset order (start_date, id)
+        Index("ix_work_packages_start_id", "start_date", "id"),
+    )
+
+
+class WorkPackageDependency(Base):
+    """Finish-to-start link: the successor cannot start until the predecessor finishes (+ lag)."""
+
+    __tablename__ = "work_package_dependencies"
+
+    id: Mapped[str] = mapped_column(UUIDCol, primary_key=True, default=lambda: str(uuid.uuid4()))
+    predecessor_id: Mapped[str] = mapped_column(
+        UUIDCol, ForeignKey("work_packages.id", ondelete="CASCADE"), nullable=False
+    )
+    successor_id: Mapped[str] = mapped_column(
+        UUIDCol, ForeignKey("work_packages.id", ondelete="CASCADE"), nullable=False
+    )
+    lag_days: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("predecessor_id", "successor_id", name="uq_wp_dependency"),
+        CheckConstraint("predecessor_id <> successor_id", name="ck_wp_dependency_not_self"),
+        Index("ix_wp_dependencies_successor", "successor_id"),
+    )
@@ -1,40 +1,93 @@
 from __future__ import annotations
-from decimal import Decimal
+
+from datetime import date
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import func
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, UploadFile, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.db.database import get_db
-from app.Domains.turnarounds.cost_models import (
-    WorkPackageCost,
-    VariationOrder,
-    VariationOrderStatus,
-)
+from app.core.tracing import traced
+from app.db.database import SessionLocal, get_async_db, get_db, route_request
+from app.Domains.turnarounds.analytics import SpendProfile, get_s_curves
+from app.Domains.turnarounds.cost_models import WorkPackageCost, WorkPackageCostStatus
 from app.Domains.turnarounds.cost_schemas import (
+    BatchRequest,
+    BatchResult,
+    BreakdownItemRead,
     CostHeaderRead,
     CostHeaderUpdate,
     ContractSummaryRead,
     ContractSummaryUpdate,
+    ImportResult,
+    RtoRead,
+    RtoSelectionUpdate,
+    VariationOrderRead,
+)
+from app.Domains.turnarounds.cost_export import (
+    EXPORT_BATCH_SIZE,
+    ExportFormatError,
+    check_export_format,
+    stream_export,
+)
+from app.Domains.turnarounds.models import Discipline, WorkPackageStatus
+from app.Domains.turnarounds.schemas import (
+    AnalyticsSummary,
+    DependencyCreate,
+    SCurveResponse,
+    ScheduleSummary,
+    WorkPackageCreate,
+    WorkPackagePage,
+    WorkPackageRead,
+    WorkPackageSchedule,
+    WorkPackageUpdate,
+)
+from app.Domains.turnarounds.snapshot import get_snapshot
+from app.Domains.turnarounds.schedule_service import (
+    CycleError,
+    add_dependency,
+    data_version,
+    get_schedule_summary,
+    get_work_package_schedule,
+    remove_dependency,
+    work_package_changed,
+)
+from app.Domains.turnarounds.service import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    create_work_package,
+    get_work_package,
+    list_work_packages,
+    update_work_package,
+)
+from app.Domains.turnarounds.cost_import import (
+    ImportFormatError,
+    import_breakdown_items,
+    import_variation_orders,
+    iter_upload_rows,
+)
+from app.Domains.turnarounds.cost_service import (
+    apply_breakdown_batch,
+    apply_variation_batch,
+    compute_summary,
+    ensure_cost_row,
+    ensure_rto_row,
+    list_breakdown_items,
+    list_variation_orders,
+    update_rto_selection,
 )
 
 router = APIRouter(tags=["turnarounds: cost"])
 
 
 # ---------- Utilities ----------
-def _ensure_cost_row(db: Session, wp_id: str) -> WorkPackageCost:
-    cost: Optional[WorkPackageCost] = (
-        db.query(WorkPackageCost).filter(WorkPackageCost.work_package_id == wp_id).first()
-    )
-    if cost is None:
-        cost = WorkPackageCost(work_package_id=wp_id)
-        db.add(cost)
-        db.commit()
-        db.refresh(cost)
-    return cost
+@traced()
+def _cost_row(db: Session, wp_id: str) -> WorkPackageCost:
+    return ensure_cost_row(db, wp_id)
 
 
+@traced()
 def _to_header_read(cost: WorkPackageCost) -> CostHeaderRead:
     return CostHeaderRead(
         rto_number=cost.rto_number,
@@ -44,58 +97,170 @@ def _to_header_read(cost: WorkPackageCost) -> CostHeaderRead:
     )
 
 
-def _compute_summary(db: Session, cost: WorkPackageCost) -> ContractSummaryRead:
-    original = Decimal(cost.original_contract_price or 0)
-    allowances = Decimal(cost.allowances or 0)
-
-    approved_sum = (
-        db.query(func.coalesce(func.sum(VariationOrder.value_amount), 0))
-        .filter(
-            VariationOrder.work_package_cost_id == cost.id,
-            VariationOrder.status == VariationOrderStatus.APPROVED,
-        )
-        .scalar()
-    )
-    pending_sum = (
-        db.query(func.coalesce(func.sum(VariationOrder.value_amount), 0))
-        .filter(
-            VariationOrder.work_package_cost_id == cost.id,
-            VariationOrder.status.in_(
-                [
-                    VariationOrderStatus.PROPOSED,
-                    VariationOrderStatus.PENDING,
-                    VariationOrderStatus.IN_PROGRESS,
-                ]
-            ),
+def _ensure_unlocked(cost: WorkPackageCost, what: str) -> None:
+    if cost.locked:
+        raise HTTPException(
+            status_code=status.HTTP_423_LOCKED,
+            detail=f"{what} are locked. Unlock header before editing.",
         )
-        .scalar()
-    )
 
-    approved = Decimal(approved_sum or 0)
-    pending = Decimal(pending_sum or 0)
-    revised = original + approved
-    efc = revised + pending
-
-    return ContractSummaryRead(
-        original_contract_price=original,
-        allowances=allowances,
-        approved_variations=approved,
-        pending_variations=pending,
-        revised_contract_price=revised,
-        estimate_final_contract_price=efc,
-    )
+
+# ---------- Work Packages ----------
+@router.get("/work-packages", response_model=WorkPackagePage, tags=["turnarounds: work packages"])
+async def get_work_packages(
+    discipline: Optional[list[Discipline]] = Query(None),
+    status_: Optional[list[WorkPackageStatus]] = Query(None, alias="status"),
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
+):
+    try:
+        return await db.run_sync(list_work_packages, discipline, status_, date_from, date_to, cursor, limit)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
+
+@router.post(
+    "/work-packages",
+    response_model=WorkPackageRead,
+    status_code=status.HTTP_201_CREATED,
+    tags=["turnarounds: work packages"],
+)
+def post_work_package(payload: WorkPackageCreate, db: Session = Depends(get_db)):
+    # Writes stay on the threadpool: the schedule cache is guarded by a thread lock,
+    # which does not exclude coroutines sharing the event loop thread
+    version = data_version(db)
+    wp = create_work_package(db, payload)
+    work_package_changed(db, wp, version)
+    return wp
+
+
+@router.get("/work-packages/{wp_id}", response_model=WorkPackageRead, tags=["turnarounds: work packages"])
+async def get_work_package_by_id(wp_id: str, db: AsyncSession = Depends(get_async_db)):
+    try:
+        return await db.run_sync(get_work_package, wp_id)
+    except LookupError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc))
+
+
+@router.put("/work-packages/{wp_id}", response_model=WorkPackageRead, tags=["turnarounds: work packages"])
+def put_work_package(wp_id: str, payload: WorkPackageUpdate, db: Session = Depends(get_db)):
+    version = data_version(db)
+    try:
+        wp = update_work_package(db, wp_id, payload)
+    except LookupError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc))
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    work_package_changed(db, wp, version)
+    return wp
+
+
+# ---------- Schedule ----------
+@router.get("/schedule", response_model=ScheduleSummary, tags=["turnarounds: schedule"])
+def get_schedule(db: Session = Depends(get_db)):
+    return get_schedule_summary(db)
+
+
+@router.get(
+    "/work-packages/{wp_id}/schedule",
+    response_model=WorkPackageSchedule,
+    tags=["turnarounds: schedule"],
+)
+def get_package_schedule(wp_id: str, db: Session = Depends(get_db)):
+    try:
+        return get_work_package_schedule(db, wp_id)
+    except LookupError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc))
+
+
+@router.post(
+    "/work-packages/{wp_id}/predecessors",
+    response_model=WorkPackageSchedule,
+    status_code=status.HTTP_201_CREATED,
+    tags=["turnarounds: schedule"],
+)
+def post_predecessor(wp_id: str, payload: DependencyCreate, db: Session = Depends(get_db)):
+    try:
+        return add_dependency(db, wp_id, payload.predecessor_id, payload.lag_days)
+    except LookupError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc))
+    except CycleError as exc:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc))
+
+
+@router.delete(
+    "/work-packages/{wp_id}/predecessors/{predecessor_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    tags=["turnarounds: schedule"],
+)
+def delete_predecessor(wp_id: str, predecessor_id: str, db: Session = Depends(get_db)):
+    try:
+        remove_dependency(db, wp_id, predecessor_id)
+    except LookupError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc))
+
+
+# ---------- Analytics ----------
+@router.get("/analytics/s-curves", response_model=SCurveResponse, tags=["turnarounds: analytics"])
+def get_s_curve_data(
+    discipline: Optional[list[Discipline]] = Query(None),
+    status_: Optional[list[WorkPackageStatus]] = Query(None, alias="status"),
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    profile: SpendProfile = SpendProfile.UNIFORM,
+    db: Session = Depends(get_db),
+):
+    try:
+        return get_s_curves(db, discipline, status_, date_from, date_to, profile)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
+
+@router.get("/analytics/summary", response_model=AnalyticsSummary, tags=["turnarounds: analytics"])
+def get_analytics_summary(
+    group_by: list[str] = Query(default_factory=list),
+    discipline: Optional[list[Discipline]] = Query(None),
+    status_: Optional[list[WorkPackageStatus]] = Query(None, alias="status"),
+    cost_status: Optional[list[WorkPackageCostStatus]] = Query(None),
+    supplier: Optional[list[str]] = Query(None),
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    db: Session = Depends(get_db),
+):
+    filters = {
+        name: [getattr(v, "value", v) for v in values]
+        for name, values in (
+            ("discipline", discipline),
+            ("status", status_),
+            ("cost_status", cost_status),
+            ("supplier", supplier),
+        )
+        if values
+    }
+    snapshot = get_snapshot(db)
+    try:
+        groups = snapshot.query(group_by, filters, date_from, date_to)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    return AnalyticsSummary(refreshed_at=snapshot.refreshed_at, work_package_count=len(snapshot), groups=groups)
 
 
 # ---------- Header ----------
+# The cost endpoints run on the event loop with an AsyncSession; the cost service
+# stays synchronous and runs inside `run_sync`, whose queries are awaited on the
+# async driver instead of holding a threadpool worker.
 @router.get("/work-packages/{wp_id}/cost/header", response_model=CostHeaderRead)
-def get_cost_header(wp_id: str, db: Session = Depends(get_db)):
-    cost = _ensure_cost_row(db, wp_id)
+async def get_cost_header(wp_id: str, db: AsyncSession = Depends(get_async_db)):
+    cost = await db.run_sync(_cost_row, wp_id)
     return _to_header_read(cost)
 
 
 @router.put("/work-packages/{wp_id}/cost/header", response_model=CostHeaderRead)
-def update_cost_header(wp_id: str, payload: CostHeaderUpdate, db: Session = Depends(get_db)):
-    cost = _ensure_cost_row(db, wp_id)
+async def update_cost_header(wp_id: str, payload: CostHeaderUpdate, db: AsyncSession = Depends(get_async_db)):
+    cost = await db.run_sync(_cost_row, wp_id)
 
     # Lock enforcement
     if cost.locked:
@@ -118,21 +283,21 @@ def update_cost_header(wp_id: str, payload: CostHeaderUpdate, db: Session = Depe
             cost.status = payload.status
 
     db.add(cost)
-    db.commit()
-    db.refresh(cost)
+    await db.commit()
+    await db.refresh(cost)
     return _to_header_read(cost)
 
 
 # ---------- Contract Summary ----------
 @router.get("/work-packages/{wp_id}/cost/summary", response_model=ContractSummaryRead)
-def get_contract_summary(wp_id: str, db: Session = Depends(get_db)):
-    cost = _ensure_cost_row(db, wp_id)
-    return _compute_summary(db, cost)
+async def get_contract_summary(wp_id: str, db: AsyncSession = Depends(get_async_db)):
+    cost = await db.run_sync(_cost_row, wp_id)
+    return await db.run_sync(compute_summary, cost)
 
 
 @router.put("/work-packages/{wp_id}/cost/summary", response_model=ContractSummaryRead)
-def update_contract_summary(wp_id: str, payload: ContractSummaryUpdate, db: Session = Depends(get_db)):
-    cost = _ensure_cost_row(db, wp_id)
+async def update_contract_summary(wp_id: str, payload: ContractSummaryUpdate, db: AsyncSession = Depends(get_async_db)):
+    cost = await db.run_sync(_cost_row, wp_id)
 
     if cost.locked:
         raise HTTPException(
@@ -146,6 +311,104 @@ def update_contract_summary(wp_id: str, payload: ContractSummaryUpdate, db: Sess
         cost.allowances = payload.allowances
 
     db.add(cost)
-    db.commit()
-    db.refresh(cost)
-    return _compute_summary(db, cost)
+    await db.commit()
+    await db.refresh(cost)
+    return await db.run_sync(compute_summary, cost)
+
+
+# ---------- Breakdown Items ----------
+@router.get("/work-packages/{wp_id}/cost/breakdown-items", response_model=list[BreakdownItemRead])
+async def get_breakdown_items(wp_id: str, db: AsyncSession = Depends(get_async_db)):
+    cost = await db.run_sync(_cost_row, wp_id)
+    return await db.run_sync(list_breakdown_items, cost)
+
+
+@router.post("/work-packages/{wp_id}/cost/breakdown-items/batch", response_model=BatchResult)
+async def batch_breakdown_items(wp_id: str, payload: BatchRequest, db: AsyncSession = Depends(get_async_db)):
+    cost = await db.run_sync(_cost_row, wp_id)
+    _ensure_unlocked(cost, "Breakdown items")
+    return await db.run_sync(apply_breakdown_batch, cost, payload)
+
+
+# Imports parse and validate the whole file in Python; keep that CPU work on the threadpool
+@router.post("/work-packages/{wp_id}/cost/breakdown-items/import", response_model=ImportResult)
+def import_breakdown_items_file(wp_id: str, file: UploadFile = File(...), db: Session = Depends(get_db)):
+    cost = _cost_row(db, wp_id)
+    _ensure_unlocked(cost, "Breakdown items")
+    try:
+        return import_breakdown_items(db, cost, iter_upload_rows(file.file, file.filename))
+    except ImportFormatError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
+
+# ---------- Variation Orders ----------
+@router.get("/work-packages/{wp_id}/cost/variation-orders", response_model=list[VariationOrderRead])
+async def get_variation_orders(wp_id: str, db: AsyncSession = Depends(get_async_db)):
+    cost = await db.run_sync(_cost_row, wp_id)
+    return await db.run_sync(list_variation_orders, cost)
+
+
+@router.post("/work-packages/{wp_id}/cost/variation-orders/batch", response_model=BatchResult)
+async def batch_variation_orders(wp_id: str, payload: BatchRequest, db: AsyncSession = Depends(get_async_db)):
+    cost = await db.run_sync(_cost_row, wp_id)
+    _ensure_unlocked(cost, "Variation orders")
+    return await db.run_sync(apply_variation_batch, cost, payload)
+
+
+@router.post("/work-packages/{wp_id}/cost/variation-orders/import", response_model=ImportResult)
+def import_variation_orders_file(wp_id: str, file: UploadFile = File(...), db: Session = Depends(get_db)):
+    cost = _cost_row(db, wp_id)
+    _ensure_unlocked(cost, "Variation orders")
+    try:
+        return import_variation_orders(db, cost, iter_upload_rows(file.file, file.filename))
+    except ImportFormatError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
+
+# ---------- Requisition to Order ----------
+@router.get("/work-packages/{wp_id}/cost/rto", response_model=RtoRead)
+async def get_rto(wp_id: str, db: AsyncSession = Depends(get_async_db)):
+    cost = await db.run_sync(_cost_row, wp_id)
+    return await db.run_sync(ensure_rto_row, cost)
+
+
+@router.put("/work-packages/{wp_id}/cost/rto/items", response_model=RtoRead)
+async def update_rto_items(wp_id: str, payload: RtoSelectionUpdate, db: AsyncSession = Depends(get_async_db)):
+    cost = await db.run_sync(_cost_row, wp_id)
+    _ensure_unlocked(cost, "RTO items")
+    try:
+        return await db.run_sync(update_rto_selection, cost, payload)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
+
+# ---------- Export ----------
+_EXPORT_MEDIA_TYPES = {"csv": "text/csv", "parquet": "application/vnd.apache.parquet"}
+
+
+def _export_stream(fmt: str, batch_size: int, request: Request):
+    # The request-scoped session is closed before the body is streamed, so the
+    # generator owns its session for the lifetime of the download.
+    db = SessionLocal()
+    route_request(db, request)
+    try:
+        yield from stream_export(db, fmt, batch_size)
+    finally:
+        db.close()
+
+
+@router.get("/cost/export")
+def export_costs(
+    request: Request,
+    format: str = Query("csv", description="csv or parquet"),
+    batch_size: int = Query(EXPORT_BATCH_SIZE, ge=100, le=100_000),
+):
+    try:
+        check_export_format(format)
+    except ExportFormatError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    return StreamingResponse(
+        _export_stream(format, batch_size, request),
+        media_type=_EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="turnaround-costs.{format}"'},
+    )
@@ -0,0 +1,307 @@
+# Critical-path scheduling engine for work packages (no DB access)
+from __future__ import annotations
+
+import heapq
+from dataclasses import dataclass
+from datetime import date
+from typing import Iterable, Optional
+
+
+class CycleError(ValueError):
+    """The dependency would make the schedule graph cyclic."""
+
+
+@dataclass(frozen=True)
+class NodeSchedule:
+    early_start: date
+    early_finish: date
+    late_start: date
+    late_finish: date
+    total_float_days: int
+    critical: bool
+
+
+def _span(start: Optional[date], end: Optional[date]) -> tuple[Optional[int], int]:
+    """(earliest-start constraint as an ordinal, duration in days) for a package's dates."""
+    if start is None:
+        return None, 1
+    if end is None or end < start:
+        return start.toordinal(), 1
+    return start.toordinal(), (end - start).days + 1
+
+
+class ScheduleEngine:
+    """Finish-to-start CPM over work packages, kept up to date incrementally.
+
+    Days are date ordinals and finishes are exclusive (EF = ES + duration). A
+    package's own start_date acts as a start-no-earlier-than constraint; undated
+    packages start at the project start and last one day.
+
+    Late dates are stored as `tail`, the longest path from the end of a package to
+    the project finish, so LF = project_finish - tail. Tails depend only on the
+    graph and durations, which means a change that moves the project finish does
+    not force a full backward pass.
+
+    `recompute()` is the O(V+E) full pass. `update_node`, `add_edge` and
+    `remove_edge` only revisit the affected downstream subgraph for early dates and
+    the affected upstream subgraph for tails, in topological order, and stop
+    propagating wherever a value is unchanged.
+    """
+
+    def __init__(self) -> None:
+        self.ids: list[str] = []
+        self.index: dict[str, int] = {}
+        self.constraint: list[Optional[int]] = []
+        self.duration: list[int] = []
+        self.succ: list[dict[int, int]] = []  # node -> {successor: lag_days}
+        self.pred: list[dict[int, int]] = []  # node -> {predecessor: lag_days}
+        self.order: list[int] = []  # topological order
+        self.pos: list[int] = []  # node -> index in `order`
+        self.es: list[int] = []
+        self.ef: list[int] = []
+        self.tail: list[int] = []
+        self.project_start = date.today().toordinal()
+        self.project_finish = self.project_start
+
+    # ---------- Construction ----------
+    @classmethod
+    def build(
+        cls,
+        nodes: Iterable[tuple[str, Optional[date], Optional[date]]],
+        edges: Iterable[tuple[str, str, int]],
+    ) -> "ScheduleEngine":
+        engine = cls()
+        for wp_id, start, end in nodes:
+            engine._add_node(wp_id, start, end)
+        for pred_id, succ_id, lag in edges:
+            u, v = engine.index.get(pred_id), engine.index.get(succ_id)
+            if u is None or v is None or u == v:
+                continue
+            engine.succ[u][v] = lag
+            engine.pred[v][u] = lag
+        engine.recompute()
+        return engine
+
+    def _add_node(self, wp_id: str, start: Optional[date], end: Optional[date]) -> int:
+        n = len(self.ids)
+        constraint, duration = _span(start, end)
+        self.ids.append(wp_id)
+        self.index[wp_id] = n
+        self.constraint.append(constraint)
+        self.duration.append(duration)
+        self.succ.append({})
+        self.pred.append({})
+        self.pos.append(n)
+        self.order.append(n)
+        self.es.append(0)
+        self.ef.append(0)
+        self.tail.append(0)
+        return n
+
+    # ---------- Full pass ----------
+    def recompute(self) -> None:
+        n = len(self.ids)
+        indegree = [len(p) for p in self.pred]
+        order = [v for v in range(n) if indegree[v] == 0]
+        for v in order:  # Kahn's algorithm; `order` grows while iterating
+            for w in self.succ[v]:
+                indegree[w] -= 1
+                if indegree[w] == 0:
+                    order.append(w)
+        if len(order) != n:
+            raise CycleError("Dependency graph contains a cycle")
+        self.order = order
+        for i, v in enumerate(order):
+            self.pos[v] = i
+
+        self._reset_project_start()
+        for v in order:
+            self._forward_value(v, store=True)
+        for v in reversed(order):
+            self.tail[v] = self._tail_value(v)
+        self.project_finish = max(self.ef, default=self.project_start)
+
+    def _reset_project_start(self) -> None:
+        starts = [c for c in self.constraint if c is not None]
+        self.project_start = min(starts) if starts else date.today().toordinal()
+
+    def _forward_value(self, v: int, store: bool = False) -> tuple[int, int]:
+        es = self.constraint[v] if self.constraint[v] is not None else self.project_start
+        for u, lag in self.pred[v].items():
+            candidate = self.ef[u] + lag
+            if candidate > es:
+                es = candidate
+        ef = es + self.duration[v]
+        if store:
+            self.es[v], self.ef[v] = es, ef
+        return es, ef
+
+    def _tail_value(self, v: int) -> int:
+        tail = 0
+        for w, lag in self.succ[v].items():
+            candidate = self.tail[w] + self.duration[w] + lag
+            if candidate > tail:
+                tail = candidate
+        return tail
+
+    # ---------- Incremental passes ----------
+    def _propagate_forward(self, seeds: Iterable[int]) -> int:
+        heap = [(self.pos[v], v) for v in set(seeds)]
+        heapq.heapify(heap)
+        queued = {v for _, v in heap}
+        visited = 0
+        while heap:
+            _, v = heapq.heappop(heap)
+            queued.discard(v)
+            visited += 1
+            es, ef = self._forward_value(v)
+            if es == self.es[v] and ef == self.ef[v]:
+                continue
+            self.es[v], self.ef[v] = es, ef
+            for w in self.succ[v]:
+                if w not in queued:
+                    queued.add(w)
+                    heapq.heappush(heap, (self.pos[w], w))
+        return visited
+
+    def _propagate_backward(self, seeds: Iterable[int]) -> int:
+        heap = [(-self.pos[v], v) for v in set(seeds)]
+        heapq.heapify(heap)
+        queued = {v for _, v in heap}
+        visited = 0
+        while heap:
+            _, v = heapq.heappop(heap)
+            queued.discard(v)
+            visited += 1
+            tail = self._tail_value(v)
+            if tail == self.tail[v]:
+                continue
+            self.tail[v] = tail
+            for u in self.pred[v]:
+                if u not in queued:
+                    queued.add(u)
+                    heapq.heappush(heap, (-self.pos[u], u))
+        return visited
+
+    def _settle(self, forward_seeds: Iterable[int], backward_seeds: Iterable[int]) -> dict[str, int]:
+        forward = self._propagate_forward(forward_seeds)
+        backward = self._propagate_backward(backward_seeds)
+        self.project_finish = max(self.ef, default=self.project_start)
+        return {"forward_visited": forward, "backward_visited": backward}
+
+    def _reorder(self, u: int, v: int) -> None:
+        """Restore topological order for a new edge u -> v when pos[u] > pos[v].
+
+        Only nodes between the two positions are touched (Pearce-Kelly). Raises
+        CycleError, without modifying anything, if v already reaches u.
+        """
+        lower, upper = self.pos[v], self.pos[u]
+        forward: list[int] = []
+        stack, seen = [v], {v}
+        while stack:
+            x = stack.pop()
+            forward.append(x)
+            for w in self.succ[x]:
+                if w == u:
+                    raise CycleError(f"{self.ids[u]} already depends on {self.ids[v]}")
+                if w not in seen and self.pos[w] <= upper:
+                    seen.add(w)
+                    stack.append(w)
+        backward: list[int] = []
+        stack, seen = [u], {u}
+        while stack:
+            x = stack.pop()
+            backward.append(x)
+            for w in self.pred[x]:
+                if w not in seen and self.pos[w] >= lower:
+                    seen.add(w)
+                    stack.append(w)
+        forward.sort(key=self.pos.__getitem__)
+        backward.sort(key=self.pos.__getitem__)
+        slots = sorted(self.pos[x] for x in backward + forward)
+        for slot, x in zip(slots, backward + forward):
+            self.pos[x] = slot
+            self.order[slot] = x
+
+    # ---------- Mutations ----------
+    def update_node(self, wp_id: str, start: Optional[date], end: Optional[date]) -> dict[str, int]:
+        """Add a package or change its dates."""
+        constraint, duration = _span(start, end)
+        v = self.index.get(wp_id)
+        if v is None:
+            v = self._add_node(wp_id, start, end)
+        elif (constraint, duration) == (self.constraint[v], self.duration[v]):
+            return {"forward_visited": 0, "backward_visited": 0}
+        else:
+            old_constraint = self.constraint[v]
+            self.constraint[v], self.duration[v] = constraint, duration
+            if old_constraint == self.project_start and constraint != old_constraint:
+                # The earliest package moved; the project start may have moved with it
+                previous = self.project_start
+                self._reset_project_start()
+                if self.project_start != previous:
+                    self.recompute()
+                    return {"forward_visited": len(self.ids), "backward_visited": len(self.ids)}
+        if constraint is not None and constraint < self.project_start:
+            self.recompute()
+            return {"forward_visited": len(self.ids), "backward_visited": len(self.ids)}
+        return self._settle([v], [v, *self.pred[v]])
+
+    def add_edge(self, pred_id: str, succ_id: str, lag: int = 0) -> dict[str, int]:
+        u, v = self.index[pred_id], self.index[succ_id]
+        if u == v:
+            raise CycleError("A work package cannot depend on itself")
+        if v not in self.succ[u] and self.pos[u] > self.pos[v]:
+            self._reorder(u, v)
+        self.succ[u][v] = lag
+        self.pred[v][u] = lag
+        return self._settle([v], [u])
+
+    def remove_edge(self, pred_id: str, succ_id: str) -> dict[str, int]:
+        u, v = self.index[pred_id], self.index[succ_id]
+        if v not in self.succ[u]:
+            return {"forward_visited": 0, "backward_visited": 0}
+        del self.succ[u][v]
+        del self.pred[v][u]
+        return self._settle([v], [u])
+
+    # ---------- Results ----------
+    def node(self, wp_id: str) -> NodeSchedule:
+        v = self.index[wp_id]
+        lf = self.project_finish - self.tail[v]
+        ls = lf - self.duration[v]
+        total_float = ls - self.es[v]
+        return NodeSchedule(
+            early_start=date.fromordinal(self.es[v]),
+            early_finish=date.fromordinal(self.ef[v] - 1),
+            late_start=date.fromordinal(ls),
+            late_finish=date.fromordinal(lf - 1),
+            total_float_days=total_float,
+            critical=total_float == 0,
+        )
+
+    def predecessors(self, wp_id: str) -> dict[str, int]:
+        return {self.ids[u]: lag for u, lag in self.pred[self.index[wp_id]].items()}
+
+    def critical_path(self) -> list[str]:
+        """The chain of zero-float packages that drives the project finish, first to last."""
+        if not self.ids:
+            return []
+
+        def is_critical(x: int) -> bool:
+            return self.project_finish - self.tail[x] - self.duration[x] == self.es[x]
+
+        # Ties between equally long chains are broken by id so the answer does not
+        # depend on the order links were added in
+        finish = max(self.ef)
+        v = min((x for x in range(len(self.ids)) if self.ef[x] == finish), key=self.ids.__getitem__)
+        chain = [v]
+        while True:
+            drivers = [
+                u for u, lag in self.pred[v].items() if self.ef[u] + lag == self.es[v] and is_critical(u)
+            ]
+            if not drivers:
+                break
+            v = min(drivers, key=self.ids.__getitem__)
+            chain.append(v)
+        return [self.ids[x] for x in reversed(chain)]
@@ -0,0 +1,164 @@
+# Schedule engine lifecycle: load from the DB once, then keep it current incrementally
+from __future__ import annotations
+
+import threading
+from datetime import date
+from typing import Any, Optional
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+
+from app.core.metrics import CACHE_REQUESTS
+from app.db.routing import read_only
+from app.Domains.turnarounds.models import WorkPackage, WorkPackageDependency
+from app.Domains.turnarounds.schedule import CycleError, ScheduleEngine
+from app.Domains.turnarounds.schemas import ScheduleSummary, WorkPackageSchedule
+
+# One engine per process. It is rebuilt whenever the data version seen in the DB
+# differs from the one it was built or last updated at, which covers writes made
+# by other workers; writes made through this module update it in place.
+_lock = threading.RLock()
+_engine: Optional[ScheduleEngine] = None
+_engine_version: Optional[tuple[Any, ...]] = None
+
+
+def data_version(db: Session) -> tuple[Any, ...]:
+    wp = db.execute(select(func.count(), func.max(WorkPackage.updated_at)).select_from(WorkPackage)).one()
+    # updated_at, not created_at: a lag change alone must move the version too
+    dep = db.execute(
+        select(func.count(), func.max(WorkPackageDependency.updated_at)).select_from(WorkPackageDependency)
+    ).one()
+    return (*wp, *dep)
+
+
+def _build(db: Session) -> ScheduleEngine:
+    nodes = db.execute(select(WorkPackage.id, WorkPackage.start_date, WorkPackage.end_date)).all()
+    edges = db.execute(
+        select(WorkPackageDependency.predecessor_id, WorkPackageDependency.successor_id, WorkPackageDependency.lag_days)
+    ).all()
+    return ScheduleEngine.build(nodes, edges)
+
+
+def get_engine(db: Session) -> ScheduleEngine:
+    global _engine, _engine_version
+    with _lock:
+        version = data_version(db)
+        if _engine is None or version != _engine_version:
+            CACHE_REQUESTS.inc(("schedule_engine", "miss"))
+            _engine = _build(db)
+            _engine_version = version
+        else:
+            CACHE_REQUESTS.inc(("schedule_engine", "hit"))
+        return _engine
+
+
+def reset_engine() -> None:
+    global _engine, _engine_version
+    with _lock:
+        _engine, _engine_version = None, None
+
+
+def work_package_changed(db: Session, wp: WorkPackage, version_before: tuple[Any, ...]) -> None:
+    """Apply a committed create/date change to the cached engine.
+
+    `version_before` is the data version read before the write; if the engine was
+    not current at that point it is simply dropped and rebuilt on next use.
+    """
+    global _engine, _engine_version
+    with _lock:
+        if _engine is None:
+            return
+        if version_before != _engine_version:
+            reset_engine()
+            return
+        _engine.update_node(wp.id, wp.start_date, wp.end_date)
+        _engine_version = data_version(db)
+
+
+def _node_read(engine: ScheduleEngine, wp_id: str) -> WorkPackageSchedule:
+    node = engine.node(wp_id)
+    return WorkPackageSchedule(id=wp_id, predecessors=engine.predecessors(wp_id), **node.__dict__)
+
+
+@read_only
+def get_work_package_schedule(db: Session, wp_id: str) -> WorkPackageSchedule:
+    engine = get_engine(db)
+    if wp_id not in engine.index:
+        raise LookupError(f"Work package {wp_id} not found")
+    return _node_read(engine, wp_id)
+
+
+@read_only
+def get_schedule_summary(db: Session) -> ScheduleSummary:
+    engine = get_engine(db)
+    with _lock:
+        critical = sum(1 for wp_id in engine.ids if engine.node(wp_id).critical)
+        return ScheduleSummary(
+            project_start=date.fromordinal(engine.project_start),
+            project_finish=date.fromordinal(max(engine.project_finish - 1, engine.project_start)),
+            work_package_count=len(engine.ids),
+            critical_count=critical,
+            critical_path=engine.critical_path(),
+        )
+
+
+def add_dependency(db: Session, successor_id: str, predecessor_id: str, lag_days: int) -> WorkPackageSchedule:
+    """Link predecessor -> successor. Raises LookupError for unknown packages, CycleError for loops."""
+    global _engine_version
+    with _lock:
+        engine = get_engine(db)
+        for wp_id in (successor_id, predecessor_id):
+            if wp_id not in engine.index:
+                raise LookupError(f"Work package {wp_id} not found")
+        existing = db.scalars(
+            select(WorkPackageDependency).where(
+                WorkPackageDependency.predecessor_id == predecessor_id,
+                WorkPackageDependency.successor_id == successor_id,
+            )
+        ).first()
+        # Validate against the graph (including the cycle check) before touching the DB
+        engine.add_edge(predecessor_id, successor_id, lag_days)
+        try:
+            if existing is None:
+                db.add(WorkPackageDependency(predecessor_id=predecessor_id, successor_id=successor_id, lag_days=lag_days))
+            else:
+                existing.lag_days = lag_days
+            db.commit()
+        except Exception:
+            # The edge is already in the cached engine; whatever kept it out of the DB, drop the engine
+            db.rollback()
+            reset_engine()
+            raise
+        _engine_version = data_version(db)
+        return _node_read(engine, successor_id)
+
+
+def remove_dependency(db: Session, successor_id: str, predecessor_id: str) -> None:
+    global _engine_version
+    with _lock:
+        engine = get_engine(db)
+        result = db.execute(
+            delete(WorkPackageDependency).where(
+                WorkPackageDependency.predecessor_id == predecessor_id,
+                WorkPackageDependency.successor_id == successor_id,
+            )
+        )
+        if result.rowcount == 0:
+            db.rollback()
+            raise LookupError("Dependency not found")
+        db.commit()
+        engine.remove_edge(predecessor_id, successor_id)
+        _engine_version = data_version(db)
+
+
+__all__ = [
+    "CycleError",
+    "add_dependency",
+    "data_version",
+    "get_engine",
+    "get_schedule_summary",
+    "get_work_package_schedule",
+    "remove_dependency",
+    "reset_engine",
+    "work_package_changed",
+]
@@ -0,0 +1,109 @@
+from __future__ import annotations
+from datetime import date, datetime
+from typing import Any, Optional
+from pydantic import BaseModel, Field, field_validator, model_validator
+from app.Domains.turnarounds.models import Discipline, WorkPackageStatus
+from app.Domains.turnarounds.cost_schemas import ContractSummaryRead, reject_null
+
+
+# ---------- Work Packages ----------
+class WorkPackageCreate(BaseModel):
+    title: str = Field(..., min_length=1, max_length=200)
+    description: Optional[str] = None
+    status: WorkPackageStatus = WorkPackageStatus.NOT_STARTED
+    discipline: Discipline
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+
+    @model_validator(mode="after")
+    def check_dates(self):
+        if self.start_date and self.end_date and self.end_date < self.start_date:
+            raise ValueError("end_date must not be before start_date")
+        return self
+
+
+class WorkPackageUpdate(BaseModel):
+    title: Optional[str] = Field(None, min_length=1, max_length=200)
+    description: Optional[str] = None
+    status: Optional[WorkPackageStatus] = None
+    discipline: Optional[Discipline] = None
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+
+    _not_null = field_validator("title", "status", "discipline")(reject_null)
+
+
+class WorkPackageRead(BaseModel):
+    id: str
+    title: str
+    description: Optional[str] = None
+    status: WorkPackageStatus
+    discipline: Discipline
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+
+    class Config:
+        from_attributes = True
+
+
+class WorkPackageListItem(WorkPackageRead):
+    # None until the package's cost tab has been opened
+    cost: Optional[ContractSummaryRead] = None
+
+
+class WorkPackagePage(BaseModel):
+    items: list[WorkPackageListItem]
+    # Opaque keyset cursor; pass back as `cursor` to fetch the next page
+    next_cursor: Optional[str] = None
+
+
+# ---------- Schedule ----------
+class DependencyCreate(BaseModel):
+    predecessor_id: str
+    lag_days: int = Field(0, ge=0, le=3650)
+
+
+class WorkPackageSchedule(BaseModel):
+    id: str
+    early_start: date
+    early_finish: date
+    late_start: date
+    late_finish: date
+    total_float_days: int
+    critical: bool
+    # predecessor id -> lag in days
+    predecessors: dict[str, int] = Field(default_factory=dict)
+
+
+class ScheduleSummary(BaseModel):
+    project_start: date
+    project_finish: date
+    work_package_count: int
+    critical_count: int
+    critical_path: list[str]
+
+
+# ---------- Analytics ----------
+class SCurveSeries(BaseModel):
+    # None for the all-disciplines total
+    discipline: Optional[Discipline] = None
+    daily_cost: list[float]
+    cumulative_cost: list[float]
+    active_packages: list[int]
+
+
+class SCurveResponse(BaseModel):
+    start_date: date
+    end_date: date
+    profile: str
+    # One entry per discipline with packages in the filter; values are per day from start_date
+    series: list[SCurveSeries]
+    total: SCurveSeries
+
+
+class AnalyticsSummary(BaseModel):
+    # When the in-memory snapshot answering this was last brought up to date
+    refreshed_at: datetime
+    work_package_count: int
+    # One row per group: the group-by values, work_package_count and summed cost metrics
+    groups: list[dict[str, Any]]
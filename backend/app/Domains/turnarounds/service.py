@@ -0,0 +1,146 @@
+# DB operations for Turnarounds work packages
+from __future__ import annotations
+
+import base64
+import json
+from datetime import date
+from typing import Optional, Sequence
+
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.orm import Session
+
+from app.db.routing import read_only
+from app.Domains.turnarounds.cost_models import VariationOrder, VariationOrderStatus, WorkPackageCost
+from app.Domains.turnarounds.cost_service import PENDING_VARIATION_STATUSES, summary_from_amounts
+from app.Domains.turnarounds.models import Discipline, WorkPackage, WorkPackageStatus
+from app.Domains.turnarounds.schemas import (
+    WorkPackageCreate,
+    WorkPackageListItem,
+    WorkPackagePage,
+    WorkPackageRead,
+    WorkPackageUpdate,
+)
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+# ---------- CRUD ----------
+def create_work_package(db: Session, payload: WorkPackageCreate) -> WorkPackage:
+    wp = WorkPackage(**payload.model_dump())
+    db.add(wp)
+    db.commit()
+    db.refresh(wp)
+    return wp
+
+
+def get_work_package(db: Session, wp_id: str) -> WorkPackage:
+    wp = db.get(WorkPackage, wp_id)
+    if wp is None:
+        raise LookupError(f"Work package {wp_id} not found")
+    return wp
+
+
+def update_work_package(db: Session, wp_id: str, payload: WorkPackageUpdate) -> WorkPackage:
+    wp = get_work_package(db, wp_id)
+    # Only the fields sent: null clears a nullable field, an omitted one is left alone
+    for field, value in payload.model_dump(exclude_unset=True).items():
+        setattr(wp, field, value)
+    if wp.start_date and wp.end_date and wp.end_date < wp.start_date:
+        db.rollback()
+        raise ValueError("end_date must not be before start_date")
+    db.commit()
+    db.refresh(wp)
+    return wp
+
+
+# ---------- Listing ----------
+def encode_cursor(start_date: Optional[date], wp_id: str) -> str:
+    raw = json.dumps([start_date.isoformat() if start_date else None, wp_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[Optional[date], str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        start, wp_id = json.loads(raw)
+        return (date.fromisoformat(start) if start else None), str(wp_id)
+    except (ValueError, TypeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def _variation_sum(statuses: Sequence[VariationOrderStatus]):
+    # Correlated per row, so it only runs for the rows on the page
+    return (
+        select(func.coalesce(func.sum(VariationOrder.value_amount), 0))
+        .where(VariationOrder.work_package_cost_id == WorkPackageCost.id, VariationOrder.status.in_(statuses))
+        .scalar_subquery()
+    )
+
+
+@read_only
+def list_work_packages(
+    db: Session,
+    disciplines: Optional[Sequence[Discipline]] = None,
+    statuses: Optional[Sequence[WorkPackageStatus]] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> WorkPackagePage:
+    """One page of work packages with their cost summaries, in a single query.
+
+    Ordered by (start_date, id) with undated packages last and paginated by keyset,
+    so deep pages cost the same as the first. A date range keeps packages whose
+    [start_date, end_date] overlaps it.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    stmt = (
+        select(
+            WorkPackage,
+            WorkPackageCost.id.label("cost_id"),
+            WorkPackageCost.original_contract_price,
+            WorkPackageCost.allowances,
+            _variation_sum([VariationOrderStatus.APPROVED]).label("approved"),
+            _variation_sum(PENDING_VARIATION_STATUSES).label("pending"),
+        )
+        .outerjoin(WorkPackageCost, WorkPackageCost.work_package_id == WorkPackage.id)
+        .order_by(WorkPackage.start_date.asc().nulls_last(), WorkPackage.id)
+        .limit(limit + 1)
+    )
+    if disciplines:
+        stmt = stmt.where(WorkPackage.discipline.in_(disciplines))
+    if statuses:
+        stmt = stmt.where(WorkPackage.status.in_(statuses))
+    if date_from is not None or date_to is not None:
+        stmt = stmt.where(WorkPackage.start_date.is_not(None))
+        if date_to is not None:
+            stmt = stmt.where(WorkPackage.start_date <= date_to)
+        if date_from is not None:
+            stmt = stmt.where(func.coalesce(WorkPackage.end_date, WorkPackage.start_date) >= date_from)
+    if cursor:
+        after_start, after_id = decode_cursor(cursor)
+        if after_start is None:
+            stmt = stmt.where(WorkPackage.start_date.is_(None), WorkPackage.id > after_id)
+        else:
+            stmt = stmt.where(
+                or_(
+                    WorkPackage.start_date > after_start,
+                    and_(WorkPackage.start_date == after_start, WorkPackage.id > after_id),
+                    WorkPackage.start_date.is_(None),
+                )
+            )
+
+    rows = db.execute(stmt).all()
+    items = [
+        WorkPackageListItem(
+            **WorkPackageRead.model_validate(wp).model_dump(),
+            cost=summary_from_amounts(original, allowances, approved, pending) if cost_id else None,
+        )
+        for wp, cost_id, original, allowances, approved, pending in rows[:limit]
+    ]
+    next_cursor = None
+    if len(rows) > limit:
+        last = rows[limit - 1][0]
+        next_cursor = encode_cursor(last.start_date, last.id)
+    return WorkPackagePage(items=items, next_cursor=next_cursor)
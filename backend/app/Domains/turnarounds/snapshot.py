@@ -0,0 +1,358 @@
+# Columnar, in-memory snapshot of work packages and their cost roll-ups for the dashboards
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from datetime import date, datetime
+from typing import Any, Iterable, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import case, func, select, union
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.metrics import CACHE_REQUESTS
+from app.core.money import Money
+from app.db.routing import read_only
+from app.Domains.turnarounds.cost_models import (
+    CostBreakdownItem,
+    RequisitionToOrder,
+    VariationOrder,
+    VariationOrderStatus,
+    WorkPackageCost,
+)
+from app.Domains.turnarounds.cost_service import PENDING_VARIATION_STATUSES
+from app.Domains.turnarounds.models import WorkPackage
+
+CATEGORICAL_COLUMNS = ("discipline", "status", "cost_status", "supplier")
+# Tables whose rows feed the snapshot, with the cost-row foreign key for the child tables
+WATERMARKED = {
+    "work_packages": (WorkPackage, None),
+    "work_package_costs": (WorkPackageCost, None),
+    "variation_orders": (VariationOrder, VariationOrder.work_package_cost_id),
+    "cost_breakdown_items": (CostBreakdownItem, CostBreakdownItem.work_package_cost_id),
+    "requisitions_to_order": (RequisitionToOrder, RequisitionToOrder.work_package_cost_id),
+}
+ID_CHUNK_SIZE = 500
+NO_DATE = 0  # date ordinals start at 1
+
+
+@dataclass(frozen=True)
+class DictColumn:
+    """Dictionary-encoded categorical: small integer codes plus the distinct values."""
+
+    codes: np.ndarray
+    values: tuple[Any, ...]
+
+    @classmethod
+    def encode(cls, raw: Sequence[Any], values: tuple[Any, ...] = ()) -> "DictColumn":
+        lookup = {v: i for i, v in enumerate(values)}
+        extra: list[Any] = []
+        codes = np.empty(len(raw), dtype=np.int32)
+        for i, v in enumerate(raw):
+            code = lookup.get(v)
+            if code is None:
+                code = lookup[v] = len(values) + len(extra)
+                extra.append(v)
+            codes[i] = code
+        return cls(codes, values + tuple(extra))
+
+    def codes_for(self, wanted: Iterable[Any]) -> list[int]:
+        lookup = {v: i for i, v in enumerate(self.values)}
+        return [lookup[v] for v in wanted if v in lookup]
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """One row per work package. Immutable; a refresh builds a new one and swaps it in."""
+
+    keys: tuple[str, ...]
+    row_of: dict[str, int]
+    start: np.ndarray  # int64 date ordinals, NO_DATE when undated
+    end: np.ndarray
+    categoricals: dict[str, DictColumn]
+    metrics: dict[str, np.ndarray]  # int64; amounts in cents
+    watermarks: dict[str, Optional[datetime]] = field(default_factory=dict)
+    counts: dict[str, int] = field(default_factory=dict)
+    refreshed_at: datetime = field(default_factory=datetime.utcnow)
+    refreshed_monotonic: float = field(default_factory=time.monotonic)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    # ---------- Query ----------
+    def query(
+        self,
+        group_by: Sequence[str] = (),
+        filters: Optional[dict[str, Sequence[Any]]] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+    ) -> list[dict[str, Any]]:
+        """Sum every metric (and count packages) per distinct combination of `group_by`.
+
+        `filters` keeps rows whose categorical value is in the given list; a date
+        range keeps dated packages overlapping it, like the work-package listing.
+        """
+        for name in [*group_by, *(filters or {})]:
+            if name not in self.categoricals:
+                raise ValueError(f"Unknown column {name!r}; expected one of {', '.join(CATEGORICAL_COLUMNS)}")
+
+        mask = np.ones(len(self), dtype=bool)
+        for name, wanted in (filters or {}).items():
+            mask &= np.isin(self.categoricals[name].codes, self.categoricals[name].codes_for(wanted))
+        if date_from is not None or date_to is not None:
+            mask &= self.start != NO_DATE
+            if date_to is not None:
+                mask &= self.start <= date_to.toordinal()
+            if date_from is not None:
+                mask &= np.where(self.end != NO_DATE, self.end, self.start) >= date_from.toordinal()
+
+        # Mixed-radix key over the group columns, then an exact integer sum per group
+        key = np.zeros(int(mask.sum()), dtype=np.int64)
+        for name in group_by:
+            col = self.categoricals[name]
+            key = key * len(col.values) + col.codes[mask]
+        groups, inverse = np.unique(key, return_inverse=True)
+        order = np.argsort(inverse, kind="stable")
+        starts = np.searchsorted(inverse[order], np.arange(len(groups)))
+        sums = {
+            name: np.add.reduceat(arr[mask][order], starts) if len(groups) else arr[:0]
+            for name, arr in self.metrics.items()
+        }
+        counts = np.diff(np.append(starts, len(order)))
+
+        rows: list[dict[str, Any]] = []
+        for g, k in enumerate(groups.tolist()):
+            row: dict[str, Any] = {}
+            for name in reversed(group_by):
+                col = self.categoricals[name]
+                k, code = divmod(k, len(col.values))
+                row[name] = col.values[code]
+            row = {name: row[name] for name in group_by}
+            row["work_package_count"] = int(counts[g])
+            for name, values in sums.items():
+                row[name] = int(values[g]) if name == "variation_count" else float(Money(int(values[g])))
+            rows.append(row)
+        return rows
+
+
+# ---------- Loading ----------
+def _rows_query():
+    """Work packages left-joined to their cost row, RTO and VO/breakdown aggregates."""
+    vo = (
+        select(
+            VariationOrder.work_package_cost_id.label("cost_id"),
+            func.sum(
+                case((VariationOrder.status == VariationOrderStatus.APPROVED, VariationOrder.value_amount), else_=0)
+            ).label("approved"),
+            func.sum(
+                case((VariationOrder.status.in_(PENDING_VARIATION_STATUSES), VariationOrder.value_amount), else_=0)
+            ).label("pending"),
+            func.count().label("n"),
+        )
+        .group_by(VariationOrder.work_package_cost_id)
+        .subquery()
+    )
+    bd = (
+        select(
+            CostBreakdownItem.work_package_cost_id.label("cost_id"),
+            func.sum(CostBreakdownItem.value_amount).label("total"),
+        )
+        .group_by(CostBreakdownItem.work_package_cost_id)
+        .subquery()
+    )
+    return (
+        select(
+            WorkPackage.id,
+            WorkPackage.start_date,
+            WorkPackage.end_date,
+            WorkPackage.discipline,
+            WorkPackage.status,
+            WorkPackageCost.status.label("cost_status"),
+            RequisitionToOrder.supplier,
+            func.coalesce(WorkPackageCost.original_contract_price, 0),
+            func.coalesce(WorkPackageCost.allowances, 0),
+            func.coalesce(vo.c.approved, 0),
+            func.coalesce(vo.c.pending, 0),
+            func.coalesce(bd.c.total, 0),
+            func.coalesce(RequisitionToOrder.subtotal_amount, 0),
+            func.coalesce(vo.c.n, 0),
+        )
+        .outerjoin(WorkPackageCost, WorkPackageCost.work_package_id == WorkPackage.id)
+        .outerjoin(RequisitionToOrder, RequisitionToOrder.work_package_cost_id == WorkPackageCost.id)
+        .outerjoin(vo, vo.c.cost_id == WorkPackageCost.id)
+        .outerjoin(bd, bd.c.cost_id == WorkPackageCost.id)
+    )
+
+
+def _fetch_rows(db: Session, wp_ids: Optional[list[str]] = None) -> list[tuple]:
+    stmt = _rows_query()
+    if wp_ids is None:
+        return db.execute(stmt).all()
+    rows: list[tuple] = []
+    for i in range(0, len(wp_ids), ID_CHUNK_SIZE):
+        rows.extend(db.execute(stmt.where(WorkPackage.id.in_(wp_ids[i : i + ID_CHUNK_SIZE]))).all())
+    return rows
+
+
+def _label(value: Any) -> Any:
+    return getattr(value, "value", value)
+
+
+def _columns(rows: list[tuple]) -> tuple[np.ndarray, np.ndarray, dict[str, list[Any]], dict[str, np.ndarray]]:
+    n = len(rows)
+    start = np.fromiter((r[1].toordinal() if r[1] else NO_DATE for r in rows), dtype=np.int64, count=n)
+    end = np.fromiter((r[2].toordinal() if r[2] else NO_DATE for r in rows), dtype=np.int64, count=n)
+    raw_categoricals = {name: [_label(r[3 + i]) for r in rows] for i, name in enumerate(CATEGORICAL_COLUMNS)}
+    cents = np.array([[Money.of(v).cents for v in r[7:13]] for r in rows], dtype=np.int64).reshape(n, 6)
+    original, allowances, approved, pending, breakdown, rto = cents.T
+    vo_count = np.fromiter((int(r[13]) for r in rows), dtype=np.int64, count=n)
+    metrics = {
+        "original_contract_price": original,
+        "allowances": allowances,
+        "approved_variations": approved,
+        "pending_variations": pending,
+        "revised_contract_price": original + approved,
+        "estimate_final_contract_price": original + approved + pending,
+        "breakdown_total": breakdown,
+        "rto_subtotal": rto,
+        "variation_count": vo_count,
+    }
+    return start, end, raw_categoricals, {k: np.ascontiguousarray(v) for k, v in metrics.items()}
+
+
+def _table_stats(db: Session, since: dict[str, Optional[datetime]]) -> tuple[dict, dict, dict]:
+    """Per table: max(updated_at), row count, and rows created after the previous watermark."""
+    watermarks, counts, inserted = {}, {}, {}
+    for table, (model, _) in WATERMARKED.items():
+        previous = since.get(table)
+        created_after = func.count().filter(model.created_at > previous) if previous is not None else func.count()
+        watermarks[table], counts[table], inserted[table] = db.execute(
+            select(func.max(model.updated_at), func.count(), created_after).select_from(model)
+        ).one()
+    return watermarks, counts, inserted
+
+
+def build_snapshot(db: Session) -> Snapshot:
+    watermarks, counts, _ = _table_stats(db, {})
+    rows = _fetch_rows(db)
+    start, end, raw, metrics = _columns(rows)
+    keys = tuple(r[0] for r in rows)
+    return Snapshot(
+        keys=keys,
+        row_of={k: i for i, k in enumerate(keys)},
+        start=start,
+        end=end,
+        categoricals={name: DictColumn.encode(values) for name, values in raw.items()},
+        metrics=metrics,
+        watermarks=watermarks,
+        counts=counts,
+    )
+
+
+def _changed_work_packages(db: Session, since: dict[str, Optional[datetime]]) -> list[str]:
+    selects = []
+    for table, (model, cost_fk) in WATERMARKED.items():
+        if model is WorkPackage:
+            stmt = select(WorkPackage.id.label("wp_id"))
+        elif model is WorkPackageCost:
+            stmt = select(WorkPackageCost.work_package_id.label("wp_id"))
+        else:
+            stmt = select(WorkPackageCost.work_package_id.label("wp_id")).join(model, cost_fk == WorkPackageCost.id)
+        # A table that was empty last time has no watermark; all of its rows are new
+        if since.get(table) is not None:
+            stmt = stmt.where(model.updated_at > since[table])
+        selects.append(stmt)
+    return list(db.scalars(union(*selects)))
+
+
+def refresh_snapshot(db: Session, snapshot: Snapshot) -> Snapshot:
+    """Apply rows changed since the snapshot's `updated_at` watermarks.
+
+    Watermarks cannot see deletes, so the row counts are checked too: if a table's
+    count is not its old count plus the rows created since, something was deleted
+    and the snapshot is rebuilt from scratch.
+    """
+    watermarks, counts, inserted = _table_stats(db, snapshot.watermarks)
+    for table in WATERMARKED:
+        if counts[table] != snapshot.counts.get(table, 0) + inserted[table]:
+            return build_snapshot(db)
+    if watermarks == snapshot.watermarks:
+        return replace(snapshot, refreshed_at=datetime.utcnow(), refreshed_monotonic=time.monotonic())
+
+    rows = _fetch_rows(db, _changed_work_packages(db, snapshot.watermarks))
+    start_new, end_new, raw, metrics_new = _columns(rows)
+    positions = np.array([snapshot.row_of.get(r[0], -1) for r in rows], dtype=np.int64)
+    existing = positions >= 0
+    added_keys = tuple(r[0] for r, pos in zip(rows, positions) if pos < 0)
+    total = len(snapshot) + len(added_keys)
+    positions[~existing] = np.arange(len(snapshot), total)
+
+    def merged(old: np.ndarray, new: np.ndarray) -> np.ndarray:
+        out = np.empty(total, dtype=old.dtype)
+        out[: len(old)] = old
+        out[positions] = new
+        return out
+
+    categoricals = {}
+    for name, column in snapshot.categoricals.items():
+        encoded = DictColumn.encode(raw[name], column.values)
+        categoricals[name] = DictColumn(merged(column.codes, encoded.codes), encoded.values)
+
+    keys = snapshot.keys + added_keys
+    row_of = dict(snapshot.row_of)
+    row_of.update((k, len(snapshot) + i) for i, k in enumerate(added_keys))
+    return Snapshot(
+        keys=keys,
+        row_of=row_of,
+        start=merged(snapshot.start, start_new),
+        end=merged(snapshot.end, end_new),
+        categoricals=categoricals,
+        metrics={name: merged(arr, metrics_new[name]) for name, arr in snapshot.metrics.items()},
+        watermarks=watermarks,
+        counts=counts,
+    )
+
+
+# ---------- Process-wide snapshot ----------
+_lock = threading.Lock()
+_current: Optional[Snapshot] = None
+
+
+@read_only
+def get_snapshot(db: Session, max_age_seconds: Optional[float] = None) -> Snapshot:
+    """The shared snapshot, refreshed lazily once it is older than the TTL.
+
+    Readers never wait on a refresh that another request already started; they
+    keep using the previous snapshot until the new one is swapped in.
+    """
+    global _current
+    ttl = settings.ANALYTICS_SNAPSHOT_TTL_SECONDS if max_age_seconds is None else max_age_seconds
+    current = _current
+    if current is not None and time.monotonic() - current.refreshed_monotonic < ttl:
+        CACHE_REQUESTS.inc(("analytics_snapshot", "hit"))
+        return current
+    if not _lock.acquire(blocking=current is None):
+        CACHE_REQUESTS.inc(("analytics_snapshot", "stale"))
+        return current
+    try:
+        current = _current
+        if current is None:
+            CACHE_REQUESTS.inc(("analytics_snapshot", "miss"))
+            current = build_snapshot(db)
+        elif time.monotonic() - current.refreshed_monotonic >= ttl:
+            CACHE_REQUESTS.inc(("analytics_snapshot", "refresh"))
+            current = refresh_snapshot(db, current)
+        else:
+            CACHE_REQUESTS.inc(("analytics_snapshot", "hit"))
+        _current = current
+        return current
+    finally:
+        _lock.release()
+
+
+def reset_snapshot() -> None:
+    global _current
+    with _lock:
+        _current = None
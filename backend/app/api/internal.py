@@ -0,0 +1,43 @@
+# Operational endpoints for sizing and debugging a running instance; kept out of the public OpenAPI schema.
+# Serve them on an internal network or behind the proxy's allow-list, not on the public listener.
+from fastapi import APIRouter, HTTPException, Query
+
+from app.core.config import settings
+from app.core.tracing import otlp_json, ring_buffer, summarize
+from app.db.pool import pool_stats
+
+router = APIRouter(prefix="/internal", tags=["internal"], include_in_schema=False)
+
+
+@router.get("/db/pools")
+def get_db_pools():
+    """Checkout counts and waits, in-use and overflow connections for every engine's pool."""
+    return {
+        "config": {
+            "pool_size": settings.DB_POOL_SIZE,
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "pool_timeout_seconds": settings.DB_POOL_TIMEOUT_SECONDS,
+            "pool_recycle_seconds": settings.DB_POOL_RECYCLE_SECONDS,
+            "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        },
+        "pools": pool_stats(),
+    }
+
+
+@router.get("/traces")
+def get_traces(limit: int = Query(20, ge=1, le=500), min_ms: float = Query(0.0, ge=0), sort: str = Query("recent", pattern="^(recent|slowest)$")):
+    """Recently sampled requests with their self time per span name; filter with min_ms, sort by recency or duration."""
+    summaries = [summarize(t) for t in reversed(ring_buffer.traces())]
+    summaries = [s for s in summaries if s["duration_ms"] >= min_ms]
+    if sort == "slowest":
+        summaries.sort(key=lambda s: -s["duration_ms"])
+    return {"sample_rate": settings.TRACE_SAMPLE_RATE, "traces": summaries[:limit]}
+
+
+@router.get("/traces/{trace_id}")
+def get_trace(trace_id: str):
+    """One buffered trace as OTLP/JSON, ready for any OTLP-aware viewer."""
+    for trace in ring_buffer.traces():
+        if trace.trace_id == trace_id:
+            return otlp_json(trace)
+    raise HTTPException(status_code=404, detail="Trace not in the buffer")
@@ -0,0 +1,103 @@
+from pathlib import Path
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import FileResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.responses import model_response
+from app.core.security import get_current_user
+from app.db.database import get_async_db
+from app.Domains.users.models import User
+from app.models.job import Job, JobStatus
+from app.schemas.job import JobCreate, JobRead
+from app.services.jobs.queue import HANDLERS, MAX_LIST_LIMIT, enqueue, get_job, list_jobs, request_cancel
+from app.services.jobs.worker import job_worker
+
+router = APIRouter(tags=["jobs"])
+
+
+def _visible(job: Job, user: User) -> Job:
+    # Users see their own jobs; admins see everyone's
+    if not user.is_admin and job.created_by != user.id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Job {job.id} not found")
+    return job
+
+
+async def _job(db: AsyncSession, job_id: int, user: User) -> Job:
+    try:
+        return _visible(await db.run_sync(get_job, job_id), user)
+    except LookupError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc))
+
+
+@router.post("/jobs", response_model=JobRead, status_code=status.HTTP_202_ACCEPTED)
+async def create_job(
+    payload: JobCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+):
+    handler = HANDLERS.get(payload.kind)
+    if handler is not None and handler.admin_only and not current_user.is_admin:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=f"Only admins can run '{payload.kind}' jobs")
+    try:
+        job = await db.run_sync(
+            enqueue, payload.kind, payload.payload, payload.priority, payload.max_attempts, created_by=current_user.id
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    # Start it now if this process's worker has a free slot, rather than at its next poll
+    job_worker.wake()
+    return model_response(JobRead.model_validate(job), status_code=status.HTTP_202_ACCEPTED)
+
+
+@router.get("/jobs", response_model=list[JobRead])
+async def get_jobs(
+    status_: Optional[JobStatus] = Query(None, alias="status"),
+    kind: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=MAX_LIST_LIMIT),
+    before_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+):
+    created_by = None if current_user.is_admin else current_user.id
+    jobs = await db.run_sync(list_jobs, status_, kind, created_by, limit, before_id)
+    return model_response([JobRead.model_validate(job) for job in jobs])
+
+
+@router.get("/jobs/{job_id}", response_model=JobRead)
+async def get_job_status(
+    job_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+):
+    return model_response(JobRead.model_validate(await _job(db, job_id, current_user)))
+
+
+@router.post("/jobs/{job_id}/cancel", response_model=JobRead)
+async def cancel_job(
+    job_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+):
+    await _job(db, job_id, current_user)
+    try:
+        job = await db.run_sync(request_cancel, job_id)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc))
+    return model_response(JobRead.model_validate(job))
+
+
+@router.get("/jobs/{job_id}/download")
+async def download_job_output(
+    job_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+):
+    job = await _job(db, job_id, current_user)
+    # Handlers that write a file return its path under "file" (see app.services.jobs.handlers)
+    result = job.result_json if job.status == JobStatus.SUCCEEDED and isinstance(job.result_json, dict) else {}
+    output = result.get("file")
+    if not output or not Path(output).is_file():
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Job {job_id} has no file to download")
+    return FileResponse(output, media_type=result.get("media_type"), filename=result.get("filename"))
@@ -0,0 +1,186 @@
+# Negotiated response compression: brotli (when the 'brotli' package is installed) or gzip, chunk by chunk
+from __future__ import annotations
+
+import zlib
+from functools import lru_cache
+from typing import Optional
+
+import anyio.to_thread
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.core.config import settings
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depends on deployment
+    brotli = None
+
+# Preference order when the client weighs several codings equally
+ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+_COMPRESSIBLE_TYPES = frozenset(
+    {
+        "application/json",
+        "application/javascript",
+        "application/xml",
+        "application/x-ndjson",
+        "application/manifest+json",
+        "application/wasm",
+        "image/svg+xml",
+        "image/x-icon",
+    }
+)
+
+# zlib and brotli release the GIL, so chunks this large are compressed on a worker thread instead of the event loop
+_OFFLOAD_BYTES = 256 * 1024
+
+
+@lru_cache(maxsize=256)
+def negotiate(accept_encoding: str, available: tuple[str, ...] = ENCODINGS) -> Optional[str]:
+    """The coding from `available` the client weighs highest in Accept-Encoding; None means identity."""
+    weights: dict[str, float] = {}
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.partition(";")
+        weight = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        if coding.strip():
+            weights[coding.strip()] = weight
+    best, best_weight = None, 0.0
+    for coding in available:
+        weight = weights.get(coding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = coding, weight
+    return best
+
+
+def is_compressible(content_type: str) -> bool:
+    media_type = content_type.partition(";")[0].strip().lower()
+    return (
+        media_type.startswith("text/")
+        or media_type in _COMPRESSIBLE_TYPES
+        or media_type.endswith("+json")
+        or media_type.endswith("+xml")
+    )
+
+
+class _Gzip:
+    def __init__(self, level: int) -> None:
+        self._z = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes, last: bool) -> bytes:
+        # A sync flush ends every chunk on a byte boundary the client can decode right away
+        return self._z.compress(data) + self._z.flush(zlib.Z_FINISH if last else zlib.Z_SYNC_FLUSH)
+
+
+class _Brotli:
+    def __init__(self, quality: int) -> None:
+        self._c = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes, last: bool) -> bytes:
+        return self._c.process(data) + (self._c.finish() if last else self._c.flush())
+
+
+def _encoder(coding: str):
+    if coding == "br":
+        return _Brotli(settings.COMPRESSION_BROTLI_QUALITY)
+    return _Gzip(settings.COMPRESSION_GZIP_LEVEL)
+
+
+class CompressionMiddleware:
+    """Pure ASGI middleware that compresses text-like responses the client accepts compressed.
+
+    The response start is held back until COMPRESSION_MINIMUM_SIZE bytes of body
+    have arrived or the body has ended; shorter bodies go out untouched. Complete
+    bodies get an exact Content-Length. Streamed bodies (exports) are compressed
+    chunk by chunk and flushed after each one, so they keep streaming and memory
+    stays bounded. Responses that already have a Content-Encoding (precompressed
+    static files), partial content and `Cache-Control: no-transform` pass through.
+    Strong ETags are weakened on compressed responses.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or not settings.COMPRESSION_ENABLED:
+            await self.app(scope, receive, send)
+            return
+        coding = negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        if coding is None:
+            await self.app(scope, receive, send)
+            return
+
+        minimum_size = settings.COMPRESSION_MINIMUM_SIZE
+        start: Optional[dict] = None
+        passthrough = False
+        pending = bytearray()
+        encoder = None
+
+        async def compress(data: bytes, last: bool) -> bytes:
+            if len(data) >= _OFFLOAD_BYTES:
+                return await anyio.to_thread.run_sync(encoder.compress, data, last)
+            return encoder.compress(data, last)
+
+        async def send_compressed(message) -> None:
+            nonlocal start, passthrough, encoder
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message.get("headers", []))
+                passthrough = (
+                    message["status"] in (204, 206, 304)
+                    or "content-encoding" in headers
+                    or "content-range" in headers
+                    or "no-transform" in headers.get("cache-control", "")
+                    or not is_compressible(headers.get("content-type", ""))
+                )
+                if passthrough:
+                    await send(message)
+                else:
+                    start = message
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if encoder is not None:
+                if body or not more_body:
+                    await send({"type": "http.response.body", "body": await compress(body, not more_body), "more_body": more_body})
+                return
+
+            pending.extend(body)
+            if more_body and len(pending) < minimum_size:
+                return
+            if not more_body and len(pending) < minimum_size:
+                await send(start)
+                await send({"type": "http.response.body", "body": bytes(pending)})
+                return
+
+            encoder = _encoder(coding)
+            compressed = await compress(bytes(pending), not more_body)
+            pending.clear()
+            headers = MutableHeaders(raw=list(start.get("headers", [])))
+            headers["content-encoding"] = coding
+            headers.add_vary_header("Accept-Encoding")
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                # The compressed bytes differ from the ones the strong validator describes
+                headers["etag"] = f"W/{etag}"
+            if more_body:
+                if "content-length" in headers:
+                    del headers["content-length"]
+            else:
+                headers["content-length"] = str(len(compressed))
+            await send({**start, "headers": headers.raw})
+            await send({"type": "http.response.body", "body": compressed, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
@@ -18,6 +18,90 @@ class Settings(BaseSettings):
     _default_sqlite_path = (Path(__file__).resolve().parents[2] / ".data" / "app_runtime.dev.sqlite").as_posix()
     DATABASE_URL: str = f"sqlite:///{_default_sqlite_path}"
 
+    # Optional read replica: GET requests and read_only service calls read from it, everything else
+    # uses DATABASE_URL. After a caller writes, their reads stay on the primary for
+    # READ_YOUR_WRITES_SECONDS to cover replica lag.
+    DATABASE_READ_URL: str | None = None
+    READ_YOUR_WRITES_SECONDS: float = 5.0
+
+    # Connection pools (server databases; SQLite file pools are sized by the SQLITE_* settings below).
+    # Size pool + overflow from the worker count: each worker needs at most one connection per
+    # concurrent request it runs, and the database's max_connections caps the total across workers.
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    DB_POOL_RECYCLE_SECONDS: int = 1800  # -1 disables recycling
+    DB_POOL_PRE_PING: bool = False
+    # Connections opened per pool at startup, capped at the pool size, so the first requests don't pay for connects
+    DB_POOL_WARMUP_CONNECTIONS: int = 2
+
+    # SQLite profile (file databases only): WAL, one writer at a time across the sync and async engines
+    # (waiting up to SQLITE_WRITE_TIMEOUT_SECONDS for its turn), and a pool of read-only connections
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_CACHE_SIZE_KIB: int = 64 * 1024
+    SQLITE_MMAP_SIZE_BYTES: int = 256 * 1024 * 1024
+    SQLITE_POOL_SIZE: int = 4
+    SQLITE_READ_POOL_SIZE: int = 8
+    SQLITE_WRITE_TIMEOUT_SECONDS: float = 30.0
+
+    # /readyz serves the result of a background database check run every READINESS_CHECK_INTERVAL_SECONDS;
+    # a check that takes longer than READINESS_CHECK_TIMEOUT_SECONDS reports the database unavailable
+    READINESS_CHECK_INTERVAL_SECONDS: float = 5.0
+    READINESS_CHECK_TIMEOUT_SECONDS: float = 2.0
+
+    # Per-request SQL audit: statements whose fingerprint repeats this often in one request are
+    # logged as N+1 suspects. In dev, counts are also returned as X-SQL-Queries / X-SQL-Repeated.
+    QUERY_AUDIT_ENABLED: bool = True
+    QUERY_AUDIT_REPEAT_THRESHOLD: int = 5
+
+    # Response compression: text-like bodies of at least COMPRESSION_MINIMUM_SIZE bytes are sent with
+    # brotli (when the 'brotli' package is installed) or gzip, whichever the client prefers
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+
+    # Built frontend (Vite `dist`) to serve at / from this process; leave unset when it is hosted separately.
+    # Run scripts/precompress_assets.py on it after `npm run build` so assets are served precompressed.
+    FRONTEND_DIST_DIR: str | None = None
+
+    # Logging: JSON lines (or "text" for local reading) on stdout, written by a background thread.
+    # LOG_SAMPLE_RATES keeps that fraction of a logger's (and its children's) records below WARNING,
+    # e.g. {"app.sql": 0.01}; "app.sql" logs every statement at DEBUG.
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "json"
+    LOG_SAMPLE_RATES: dict[str, float] = Field(default_factory=lambda: {"app.sql": 0.01})
+    # Requests at least this slow are logged with a timing breakdown
+    SLOW_REQUEST_MS: float = 1000.0
+
+    # Tracing: sampled requests record spans (request, auth, chat and cost services, SQL) into an in-memory
+    # ring buffer served at /internal/traces and, with TRACE_OTLP_FILE, append them as OTLP/JSON lines.
+    # A request is sampled when its W3C traceparent says so, otherwise with probability TRACE_SAMPLE_RATE.
+    TRACE_SAMPLE_RATE: float = 0.01
+    TRACE_RING_BUFFER_SIZE: int = 200
+    TRACE_MAX_SPANS: int = 512
+    TRACE_OTLP_FILE: str | None = None
+
+    # Background jobs: each API process runs a worker that claims queued rows from the jobs table and runs
+    # I/O-bound kinds on JOBS_THREAD_WORKERS threads and CPU-bound kinds on JOBS_PROCESS_WORKERS processes.
+    # A running job holds a lease of JOBS_LEASE_SECONDS that the worker keeps renewing; when a worker dies
+    # its jobs are retried once the lease runs out. Failed attempts retry after JOBS_RETRY_BACKOFF_SECONDS,
+    # doubling each time up to JOBS_RETRY_BACKOFF_MAX_SECONDS.
+    JOBS_WORKER_ENABLED: bool = True
+    JOBS_THREAD_WORKERS: int = 4
+    JOBS_PROCESS_WORKERS: int = 2
+    JOBS_POLL_INTERVAL_SECONDS: float = 1.0
+    JOBS_LEASE_SECONDS: float = 60.0
+    JOBS_RETRY_BACKOFF_SECONDS: float = 10.0
+    JOBS_RETRY_BACKOFF_MAX_SECONDS: float = 600.0
+    # Progress is written at most this often per job; each write also renews the lease
+    JOBS_PROGRESS_INTERVAL_SECONDS: float = 1.0
+    # On shutdown, running jobs get this long to finish before they are handed back to the queue
+    JOBS_SHUTDOWN_GRACE_SECONDS: float = 10.0
+    # Where jobs that produce files (exports) write them; defaults to a directory under the system temp dir
+    JOBS_OUTPUT_DIR: str | None = None
+    JOBS_RETENTION_DAYS: int = 14
+
     # Optional CORS list; leave empty and set a default in main.py for dev
     CORS_ALLOW_ORIGINS: List[str] = Field(default_factory=list)
 
@@ -37,6 +121,9 @@ class Settings(BaseSettings):
     SMTP_PASSWORD: str | None = None
     EMAIL_FROM: str | None = None
 
+    # Dashboards analytics snapshot: serve the in-memory copy for this long before an incremental refresh
+    ANALYTICS_SNAPSHOT_TTL_SECONDS: float = 30.0
+
     # Frontend base URL (for building links in emails)
     FRONTEND_BASE_URL: str = Field("http://localhost:5173", alias="FRONTEND_URL")
 
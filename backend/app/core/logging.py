@@ -0,0 +1,228 @@
+# Structured logging: records are queued on the calling thread and written by a listener thread,
+# so no request ever waits on stdout or a file. Also the request-id/slow-request middleware.
+from __future__ import annotations
+
+import atexit
+import itertools
+import logging
+import queue
+import re
+import sys
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from time import perf_counter
+from typing import Any, Mapping, Optional
+
+import orjson
+from starlette.datastructures import Headers
+
+from app.core.config import settings
+from app.core.tracing import current_span
+
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+logger = logging.getLogger("app.request")
+
+# Attributes every LogRecord has; anything else on a record came in through `extra=`
+# (color_message is uvicorn's ANSI-coloured copy of msg)
+_RECORD_ATTRS = frozenset(logging.LogRecord("", 0, "", 0, "", (), None).__dict__) | {
+    "message",
+    "asctime",
+    "request_id",
+    "sample_rate",
+    "color_message",
+}
+
+# Accepted from an incoming X-Request-ID; anything else is replaced so ids stay safe to log and echo
+_REQUEST_ID = re.compile(r"^[A-Za-z0-9._:-]{1,128}$")
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, msg, request_id, any `extra=` fields, exc."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        request_id = getattr(record, "request_id", None)
+        if request_id:
+            entry["request_id"] = request_id
+        sample_rate = getattr(record, "sample_rate", 1.0)
+        if sample_rate < 1.0:
+            entry["sample_rate"] = sample_rate
+        entry.update((k, v) for k, v in record.__dict__.items() if k not in _RECORD_ATTRS)
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return orjson.dumps(entry, default=str).decode()
+
+
+class TextFormatter(logging.Formatter):
+    def __init__(self) -> None:
+        super().__init__("%(asctime)s %(levelname)-7s %(name)s [%(request_id)s] %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        if not getattr(record, "request_id", None):
+            record.request_id = "-"
+        return super().format(record)
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps 1 in N records below WARNING from loggers with a configured rate.
+
+    `rates` maps logger names to the fraction to keep; a rate applies to the
+    logger and its children, the most specific name winning. Kept records carry
+    `sample_rate` so counts can be scaled back up.
+    """
+
+    def __init__(self, rates: Mapping[str, float]) -> None:
+        super().__init__()
+        self._rates = {name: rate for name, rate in rates.items() if rate < 1.0}
+        self._counters = {name: itertools.count() for name in self._rates}
+        self._rule_for: dict[str, Optional[str]] = {}
+
+    def _rule(self, name: str) -> Optional[str]:
+        rule = self._rule_for.get(name, "")
+        if rule == "":
+            candidates = [r for r in self._rates if name == r or name.startswith(r + ".")]
+            rule = self._rule_for[name] = max(candidates, key=len) if candidates else None
+        return rule
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or not self._rates:
+            return True
+        rule = self._rule(record.name)
+        if rule is None:
+            return True
+        rate = self._rates[rule]
+        if rate <= 0:
+            return False
+        # next() on itertools.count is atomic under the GIL, so no lock is needed
+        if next(self._counters[rule]) % round(1 / rate):
+            return False
+        record.sample_rate = rate
+        return True
+
+
+class ContextQueueHandler(QueueHandler):
+    """Enqueues records with the request id attached; formatting and I/O happen on the listener thread."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The listener thread can't see this request's context variables, so copy what it needs now
+        record = logging.makeLogRecord(record.__dict__)
+        record.request_id = request_id_var.get()
+        span = current_span()
+        if span is not None:
+            record.trace_id = span.trace.trace_id
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+_listener: Optional[QueueListener] = None
+
+
+def configure_logging() -> None:
+    """Route the root logger (and uvicorn's loggers) through a queue to a stdout writer thread. Idempotent."""
+    global _listener
+    if _listener is not None:
+        return
+    output = logging.StreamHandler(sys.stdout)
+    output.setFormatter(JsonFormatter() if settings.LOG_FORMAT == "json" else TextFormatter())
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    handler = ContextQueueHandler(log_queue)
+    handler.addFilter(SamplingFilter(settings.LOG_SAMPLE_RATES))
+
+    root = logging.getLogger()
+    root.addHandler(handler)
+    root.setLevel(settings.LOG_LEVEL.upper())
+    # uvicorn installs its own synchronous stream handlers; send its records through the queue too
+    for name in ("uvicorn", "uvicorn.error", "uvicorn.access"):
+        uvicorn_logger = logging.getLogger(name)
+        uvicorn_logger.handlers.clear()
+        uvicorn_logger.propagate = True
+    # SQLAlchemy logs pool events under the pool class's module, which for our timed pools is
+    # app.db.pool; hold them to WARNING like its own sqlalchemy.* loggers
+    logging.getLogger("app.db.pool").setLevel(logging.WARNING)
+
+    _listener = QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+    # Drains whatever is still queued when the process exits
+    atexit.register(_listener.stop)
+
+
+def _request_id(headers: Headers) -> str:
+    incoming = headers.get("x-request-id")
+    if incoming and _REQUEST_ID.match(incoming):
+        return incoming
+    return uuid.uuid4().hex
+
+
+class RequestContextMiddleware:
+    """Pure ASGI middleware: a request id for every HTTP request, and a log line for slow ones.
+
+    The id comes from the caller's X-Request-ID when it is a plain token,
+    otherwise it is generated; it is echoed in the response and attached to
+    every record logged while the request runs. Requests taking at least
+    SLOW_REQUEST_MS are logged with a breakdown: time to the response start,
+    time spent sending the body, and SQL time and statement count from the
+    query audit.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = _request_id(Headers(scope=scope))
+        status = 500
+        started = perf_counter()
+        response_started: Optional[float] = None
+
+        async def send_with_id(message) -> None:
+            nonlocal status, response_started
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                response_started = perf_counter()
+                message = {**message, "headers": [*message.get("headers", []), (b"x-request-id", request_id.encode())]}
+            await send(message)
+
+        token = request_id_var.set(request_id)
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            finished = perf_counter()
+            total_ms = (finished - started) * 1000
+            if total_ms >= settings.SLOW_REQUEST_MS:
+                audit = scope.get("state", {}).get("query_audit")
+                handler_end = response_started or finished
+                logger.warning(
+                    "Slow request %s %s: %.0f ms",
+                    scope["method"],
+                    scope["path"],
+                    total_ms,
+                    extra={
+                        "method": scope["method"],
+                        "route": getattr(scope.get("route"), "path", None),
+                        "status": status,
+                        "total_ms": round(total_ms, 2),
+                        "until_response_ms": round((handler_end - started) * 1000, 2),
+                        "send_body_ms": round((finished - handler_end) * 1000, 2),
+                        "db_ms": round(audit.seconds * 1000, 2) if audit else None,
+                        "db_queries": audit.count if audit else None,
+                    },
+                )
+            request_id_var.reset(token)
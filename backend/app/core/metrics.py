@@ -0,0 +1,298 @@
+# Process metrics in the Prometheus text format: a small registry, the HTTP middleware and SQL timing hooks.
+# Recording is a dict lookup and a few integer updates under a per-metric lock, so it can sit on every
+# request and every statement; see benchmarks/bench_metrics_overhead.py.
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left
+from time import perf_counter
+from typing import Any, Callable, Iterable, Optional, Sequence
+
+import anyio.to_thread
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+LabelValues = tuple
+Collector = Callable[[], Iterable[tuple[LabelValues, float]]]
+
+# Seconds; tuned for API requests and SQLite/Postgres statements
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+    def render(self) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, help, labelnames)
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, labels: LabelValues = (), amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, labels: LabelValues = ()) -> float:
+        return self._values.get(labels, 0)
+
+    def values(self) -> list[tuple[LabelValues, float]]:
+        with self._lock:
+            return list(self._values.items())
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return self._header() + [f"{self.name}{_labels(self.labelnames, k)} {_number(v)}" for k, v in items]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, labels: LabelValues = (), amount: float = 1) -> None:
+        self.inc(labels, -amount)
+
+    def set(self, labels: LabelValues, value: float) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+
+class CallbackMetric(_Metric):
+    """A gauge or counter whose samples are read from `collect` at scrape time."""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str], collect: Collector, kind: str = "gauge") -> None:
+        super().__init__(name, help, labelnames)
+        self.kind = kind
+        self.collect = collect
+
+    def render(self) -> list[str]:
+        return self._header() + [f"{self.name}{_labels(self.labelnames, k)} {_number(v)}" for k, v in self.collect()]
+
+
+class _Series:
+    __slots__ = ("counts", "sum")
+
+    def __init__(self, buckets: int) -> None:
+        self.counts = [0] * (buckets + 1)
+        self.sum = 0.0
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> None:
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: dict[LabelValues, _Series] = {}
+
+    def observe(self, value: float, labels: LabelValues = ()) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = _Series(len(self.buckets))
+            series.counts[index] += 1
+            series.sum += value
+
+    def count(self, labels: LabelValues = ()) -> int:
+        series = self._series.get(labels)
+        return sum(series.counts) if series else 0
+
+    def counts(self) -> list[tuple[LabelValues, int]]:
+        with self._lock:
+            return [(k, sum(s.counts)) for k, s in self._series.items()]
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = [(k, list(s.counts), s.sum) for k, s in self._series.items()]
+        lines = self._header()
+        for labels, counts, total in items:
+            cumulative = 0
+            for bound, n in zip((*self.buckets, float("inf")), counts):
+                cumulative += n
+                le = 'le="' + _number(bound) + '"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name!r} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, help, labelnames))  # type: ignore[return-value]
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, help, labelnames))  # type: ignore[return-value]
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help, labelnames, buckets))  # type: ignore[return-value]
+
+    def callback(self, name: str, help: str, labelnames: Sequence[str], collect: Collector, kind: str = "gauge") -> CallbackMetric:
+        return self.register(CallbackMetric(name, help, labelnames, collect, kind))  # type: ignore[return-value]
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+HTTP_LATENCY = REGISTRY.histogram(
+    "http_request_duration_seconds", "Time from request start to the end of the response body.", ("method", "route", "status")
+)
+# Read from the latency histogram's counts at scrape time rather than counted a second time per request
+HTTP_REQUESTS = REGISTRY.callback(
+    "http_requests_total", "HTTP requests by route template and status.", ("method", "route", "status"), HTTP_LATENCY.counts,
+    kind="counter",
+)
+# Only the middleware touches this, on the event loop thread, so a plain int needs no lock
+_in_flight = 0
+REGISTRY.callback("http_requests_in_flight", "Requests currently being served.", (), lambda: [((), _in_flight)])
+DB_STATEMENTS = REGISTRY.counter("db_statements_total", "SQL statements executed, by engine and statement type.", ("engine", "operation"))
+DB_STATEMENT_ERRORS = REGISTRY.counter("db_statement_errors_total", "SQL statements that raised, by engine.", ("engine",))
+DB_LATENCY = REGISTRY.histogram(
+    "db_statement_duration_seconds", "Time spent in cursor.execute, by engine and statement type.", ("engine", "operation")
+)
+CACHE_REQUESTS = REGISTRY.counter(
+    "app_cache_requests_total",
+    "Lookups in the in-process caches (schedule engine, S-curves, analytics snapshot) by result.",
+    ("cache", "result"),
+)
+JOBS_FINISHED = REGISTRY.counter(
+    "jobs_finished_total", "Background job attempts by kind and outcome (succeeded, retrying, failed, cancelled).", ("kind", "outcome")
+)
+JOB_DURATION = REGISTRY.histogram(
+    "job_duration_seconds",
+    "Run time of background job attempts, by kind.",
+    ("kind",),
+    buckets=(0.1, 0.5, 1.0, 5.0, 15.0, 30.0, 60.0, 300.0, 900.0, 3600.0),
+)
+
+
+def threadpool_stats() -> dict[str, float]:
+    """Worker threads in use, the limit, and tasks waiting for one; empty outside an event loop."""
+    # The limiter belongs to the running event loop; outside one there is nothing to report
+    try:
+        limiter = anyio.to_thread.current_default_thread_limiter()
+    except RuntimeError:
+        return {}
+    stats = limiter.statistics()
+    return {"in_use": stats.borrowed_tokens, "limit": limiter.total_tokens, "waiting": stats.tasks_waiting}
+
+
+REGISTRY.callback(
+    "threadpool_tokens",
+    "Worker threads for sync endpoints and run_in_threadpool: in use, limit, and tasks waiting for one.",
+    ("state",),
+    lambda: [((state,), value) for state, value in threadpool_stats().items()],
+)
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware: counts and times each HTTP request by its route template.
+
+    The template (e.g. /api/v1/turnarounds/work-packages/{wp_id}) comes from the
+    route FastAPI matched, so ids never become label values; requests that match
+    no route share one label.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        started = perf_counter()
+
+        async def send_with_status(message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        global _in_flight
+        _in_flight += 1
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            _in_flight -= 1
+            route = scope.get("route")
+            HTTP_LATENCY.observe(perf_counter() - started, (scope["method"], getattr(route, "path", UNMATCHED_ROUTE), status))
+
+
+_OPERATIONS = {"SELECT": "select", "INSERT": "insert", "UPDATE": "update", "DELETE": "delete", "WITH": "select"}
+
+
+def statement_operation(statement: str) -> str:
+    head = statement.lstrip()[:7].split(None, 1)
+    return _OPERATIONS.get(head[0].upper(), "other") if head else "other"
+
+
+def instrument_sql(target: Engine, name: str) -> None:
+    """Count and time every statement on `target`; pass `AsyncEngine.sync_engine` for async engines."""
+
+    @event.listens_for(target, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany) -> None:
+        if context is not None:
+            context._metrics_started = perf_counter()
+
+    @event.listens_for(target, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany) -> None:
+        started: Optional[float] = getattr(context, "_metrics_started", None)
+        if started is None:
+            return
+        labels = (name, statement_operation(statement))
+        DB_STATEMENTS.inc(labels)
+        DB_LATENCY.observe(perf_counter() - started, labels)
+
+    @event.listens_for(target, "handle_error")
+    def _error(exception_context) -> None:
+        DB_STATEMENT_ERRORS.inc((name,))
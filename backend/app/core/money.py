@@ -0,0 +1,142 @@
+# Fixed-point money: integer cents in Python, NUMERIC(18, 2) in the database, decimal strings on the wire
+from __future__ import annotations
+
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from functools import total_ordering
+from typing import Any, Optional
+
+from pydantic import GetCoreSchemaHandler
+from pydantic_core import core_schema
+from sqlalchemy import Numeric
+from sqlalchemy.types import TypeDecorator
+
+_CENT = Decimal("0.01")
+
+
+@total_ordering
+class Money:
+    """An amount held as an int number of cents.
+
+    Arithmetic and comparisons are plain integer operations, so sums never drift
+    and never pay for Decimal contexts. `Money.of` accepts anything the API or the
+    database hands us (Decimal, str, int, float, None) and rounds half-up to the
+    cent, which is what NUMERIC(18, 2) storage did before.
+    """
+
+    __slots__ = ("cents",)
+
+    def __init__(self, cents: int = 0) -> None:
+        self.cents = int(cents)
+
+    @classmethod
+    def of(cls, value: Any) -> "Money":
+        if isinstance(value, Money):
+            return value
+        if value is None:
+            return cls(0)
+        if isinstance(value, int) and not isinstance(value, bool):
+            return cls(value * 100)
+        if isinstance(value, float):
+            value = repr(value)
+        try:
+            quantized = Decimal(value).quantize(_CENT, rounding=ROUND_HALF_UP)
+        except (InvalidOperation, TypeError, ValueError) as exc:
+            raise ValueError(f"Invalid money amount: {value!r}") from exc
+        if not quantized.is_finite():
+            raise ValueError(f"Invalid money amount: {value!r}")
+        return cls(int(quantized.scaleb(2)))
+
+    def to_decimal(self) -> Decimal:
+        return Decimal(self.cents).scaleb(-2)
+
+    # ---------- Arithmetic ----------
+    def __add__(self, other: Any) -> "Money":
+        if isinstance(other, Money):
+            return Money(self.cents + other.cents)
+        if other == 0:  # lets sum() start from its default 0
+            return self
+        return NotImplemented
+
+    __radd__ = __add__
+
+    def __sub__(self, other: Any) -> "Money":
+        if isinstance(other, Money):
+            return Money(self.cents - other.cents)
+        return NotImplemented
+
+    def __neg__(self) -> "Money":
+        return Money(-self.cents)
+
+    def __abs__(self) -> "Money":
+        return Money(abs(self.cents))
+
+    def __mul__(self, factor: Any) -> "Money":
+        if isinstance(factor, int) and not isinstance(factor, bool):
+            return Money(self.cents * factor)
+        return NotImplemented
+
+    __rmul__ = __mul__
+
+    # ---------- Comparison / conversion ----------
+    def __eq__(self, other: Any) -> bool:
+        # Money only: an int would be ambiguous (cents or units) and would need a matching hash
+        if isinstance(other, Money):
+            return self.cents == other.cents
+        return NotImplemented
+
+    def __lt__(self, other: Any) -> bool:
+        if isinstance(other, Money):
+            return self.cents < other.cents
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self.cents)
+
+    def __bool__(self) -> bool:
+        return self.cents != 0
+
+    def __float__(self) -> float:
+        return self.cents / 100
+
+    def __str__(self) -> str:
+        whole, cents = divmod(abs(self.cents), 100)
+        return f"{'-' if self.cents < 0 else ''}{whole}.{cents:02d}"
+
+    def __repr__(self) -> str:
+        return f"Money('{self}')"
+
+    # ---------- pydantic ----------
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source: Any, handler: GetCoreSchemaHandler) -> core_schema.CoreSchema:
+        from_decimal = core_schema.no_info_after_validator_function(
+            cls.of, core_schema.decimal_schema(allow_inf_nan=False)
+        )
+        return core_schema.json_or_python_schema(
+            json_schema=from_decimal,
+            python_schema=core_schema.union_schema([core_schema.is_instance_schema(cls), from_decimal]),
+            # Same wire format as the Decimal fields this replaces: a string with two places
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                str, return_schema=core_schema.str_schema(), when_used="json"
+            ),
+        )
+
+
+class MoneyType(TypeDecorator):
+    """NUMERIC(18, 2) column that reads and writes `Money`; the stored schema is unchanged."""
+
+    impl = Numeric(18, 2)
+    cache_ok = True
+
+    def process_bind_param(self, value: Any, dialect) -> Optional[Decimal]:
+        if value is None:
+            return None
+        return Money.of(value).to_decimal()
+
+    def process_result_value(self, value: Any, dialect) -> Optional[Money]:
+        if value is None:
+            return None
+        return Money.of(value)
+
+    def coerce_compared_value(self, op, value):
+        # Literals in expressions (e.g. `subtotal + 5`) are bound as money too
+        return self
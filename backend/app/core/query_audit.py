@@ -0,0 +1,168 @@
+# Per-request SQL audit: counts and fingerprints every statement a request runs and flags N+1 patterns
+from __future__ import annotations
+
+import logging
+import re
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import lru_cache
+from time import perf_counter
+from typing import Callable, Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+# One debug record per statement; high volume, so sample it with LOG_SAMPLE_RATES
+sql_logger = logging.getLogger("app.sql")
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PARAM = re.compile(r"%\(\w+\)s|%s|\$\d+|\?")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=4096)
+def fingerprint(statement: str) -> str:
+    """The statement with literals and bind parameters replaced by `?` and IN lists collapsed.
+
+    Two executions of the same query shape, whatever their parameters, share a fingerprint.
+    """
+    normalized = _STRING.sub("?", statement)
+    normalized = _NUMBER.sub("?", normalized)
+    normalized = _PARAM.sub("?", normalized)
+    normalized = _IN_LIST.sub("(?...)", normalized)
+    return _SPACE.sub(" ", normalized).strip()
+
+
+@dataclass
+class QueryAudit:
+    count: int = 0
+    seconds: float = 0.0
+    fingerprints: Counter = field(default_factory=Counter)
+
+    def record(self, statement: str, seconds: float = 0.0) -> None:
+        self.count += 1
+        self.seconds += seconds
+        self.fingerprints[fingerprint(statement)] += 1
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Fingerprints run at least `threshold` times: the signature of a query issued per row."""
+        return [(fp, n) for fp, n in self.fingerprints.most_common() if n >= threshold]
+
+
+_current: ContextVar[Optional[QueryAudit]] = ContextVar("query_audit", default=None)
+
+# Called with (route, audit) after every audited request; query_budget uses this
+_listeners: list[Callable[[str, QueryAudit], None]] = []
+
+
+def current_audit() -> Optional[QueryAudit]:
+    return _current.get()
+
+
+def instrument_query_audit(target: Engine) -> None:
+    """Record statements on `target` into the running request's audit, if there is one."""
+
+    @event.listens_for(target, "before_cursor_execute")
+    def _start(conn, cursor, statement, parameters, context, executemany) -> None:
+        if context is not None:
+            context._audit_started = perf_counter()
+
+    @event.listens_for(target, "after_cursor_execute")
+    def _record(conn, cursor, statement, parameters, context, executemany) -> None:
+        started = getattr(context, "_audit_started", None)
+        seconds = perf_counter() - started if started is not None else 0.0
+        audit = _current.get()
+        if audit is not None:
+            audit.record(statement, seconds)
+        if sql_logger.isEnabledFor(logging.DEBUG):
+            sql_logger.debug("SQL %.2f ms", seconds * 1000, extra={"fingerprint": fingerprint(statement), "executemany": executemany})
+
+
+class QueryAuditMiddleware:
+    """Pure ASGI middleware that opens a QueryAudit for each HTTP request.
+
+    The audit lives in a context variable, which anyio copies into threadpool
+    workers and SQLAlchemy's async greenlets run under, so sync and async
+    handlers are both covered. Repeated fingerprints are logged as N+1
+    suspects; in dev the counts are also sent back as response headers.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or not settings.QUERY_AUDIT_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        audit = QueryAudit()
+        threshold = settings.QUERY_AUDIT_REPEAT_THRESHOLD
+        with_headers = settings.APP_ENV == "dev"
+
+        async def send_with_headers(message) -> None:
+            if with_headers and message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"x-sql-queries", str(audit.count).encode()))
+                headers.append((b"x-sql-repeated", str(len(audit.repeated(threshold))).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        # Shared with the outer middlewares (RequestContextMiddleware reports it for slow requests)
+        scope.setdefault("state", {})["query_audit"] = audit
+        token = _current.set(audit)
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            _current.reset(token)
+            route = getattr(scope.get("route"), "path", scope.get("path", ""))
+            for fp, n in audit.repeated(threshold):
+                logger.warning("Possible N+1 in %s %s: %d x %s", scope["method"], route, n, fp)
+            for listener in list(_listeners):
+                listener(route, audit)
+
+
+@contextmanager
+def query_budget(max_queries: int, max_repeats: Optional[int] = None) -> Iterator[list[tuple[str, QueryAudit]]]:
+    """Fail if any request served inside the block runs more than `max_queries` statements.
+
+    With `max_repeats`, also fail when one fingerprint runs more than that many
+    times in a request. Works as a context manager or a test decorator:
+
+        with query_budget(3):
+            client.get("/api/v1/chat/sessions", headers=auth)
+
+        @query_budget(10, max_repeats=2)
+        def test_listing(): ...
+    """
+    audits: list[tuple[str, QueryAudit]] = []
+
+    def listen(route: str, audit: QueryAudit) -> None:
+        audits.append((route, audit))
+
+    _listeners.append(listen)
+    try:
+        yield audits
+    finally:
+        _listeners.remove(listen)
+
+    problems = []
+    for route, audit in audits:
+        if audit.count > max_queries:
+            problems.append(f"{route}: {audit.count} statements (budget {max_queries})")
+        if max_repeats is not None:
+            problems.extend(
+                f"{route}: {n} x {fp} (max repeats {max_repeats})" for fp, n in audit.repeated(max_repeats + 1)
+            )
+    if problems:
+        details = "\n".join(
+            f"  {route}:\n" + "\n".join(f"    {n:3d} x {fp}" for fp, n in audit.fingerprints.most_common())
+            for route, audit in audits
+        )
+        raise AssertionError("Query budget exceeded:\n  " + "\n  ".join(problems) + "\nStatements:\n" + details)
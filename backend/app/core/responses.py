@@ -0,0 +1,29 @@
+# Serialize-once responses for handlers whose output is already validated
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Sequence, Union
+
+from fastapi.responses import Response
+from pydantic import BaseModel, TypeAdapter
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(model: type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(list[model])
+
+
+def model_response(content: Union[BaseModel, Sequence[BaseModel]], status_code: int = 200) -> Response:
+    """Dump already-validated models straight to JSON bytes in pydantic-core.
+
+    Returning models with a `response_model` makes FastAPI validate them again,
+    dump them to Python objects and then encode those; returning this response
+    skips all three. Keep `response_model` on the route for the OpenAPI schema.
+    """
+    if isinstance(content, BaseModel):
+        body = content.__pydantic_serializer__.to_json(content)
+    elif content:
+        body = _list_adapter(type(content[0])).dump_json(list(content))
+    else:
+        body = b"[]"
+    return Response(body, status_code=status_code, media_type="application/json")
@@ -1,36 +1,51 @@
 ﻿from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from typing import Optional
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
-from passlib.context import CryptContext
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
-from app.db.database import get_db
+from app.core.tracing import traced
+from app.db.database import get_async_db
 from app.Domains.users.models import User
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
+# passlib and jose (with its cryptography backend) are imported on first use rather than at
+# startup; together they are a sizeable share of the app's import time
+@lru_cache(maxsize=None)
+def pwd_context():
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
+
 def hash_password(plain: str) -> str:
-    return pwd_context.hash(plain)
+    return pwd_context().hash(plain)
 
 def verify_password(plain: str, hashed: Optional[str]) -> bool:
     if not hashed:
         return False
-    return pwd_context.verify(plain, hashed)
+    return pwd_context().verify(plain, hashed)
 
 def create_access_token(sub: str, expires_minutes: Optional[int] = None) -> str:
+    from jose import jwt
+
     expire = datetime.now(timezone.utc) + timedelta(minutes=expires_minutes or settings.JWT_EXPIRES_MIN)
     to_encode = {"sub": sub, "exp": expire}
     return jwt.encode(to_encode, settings.JWT_SECRET, algorithm=settings.JWT_ALGORITHM)
 
 def decode_token(token: str) -> dict:
+    from jose import jwt
+
     return jwt.decode(token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM])
 
-def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)) -> User:
+@traced()
+async def get_current_user(db: AsyncSession = Depends(get_async_db), token: str = Depends(oauth2_scheme)) -> User:
+    from jose import JWTError
+
     credentials_exc = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -43,7 +58,7 @@ def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_
             raise credentials_exc
     except JWTError:
         raise credentials_exc
-    user: User | None = db.query(User).filter(User.email == email).first()
+    user: User | None = (await db.scalars(select(User).where(User.email == email))).first()
     if user is None or not user.is_active:
         raise credentials_exc
     return user
\ No newline at end of file
@@ -0,0 +1,82 @@
+# Serves the built frontend (Vite dist) from the API process: precompressed variants, immutable hashed assets
+from __future__ import annotations
+
+import os
+import stat
+from functools import lru_cache
+from mimetypes import guess_type
+
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+
+from app.core.compression import negotiate
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+# Suffixes scripts/precompress_assets.py writes next to each file, in preference order
+PRECOMPRESSED = (("br", ".br"), ("gzip", ".gz"))
+
+
+@lru_cache(maxsize=4096)
+def _variants(full_path: str, mtime_ns: int) -> tuple[tuple[str, str, os.stat_result], ...]:
+    # Keyed on the original's mtime, so a rebuild is picked up without a restart
+    found = []
+    for coding, suffix in PRECOMPRESSED:
+        try:
+            variant_stat = os.stat(full_path + suffix)
+        except OSError:
+            continue
+        if stat.S_ISREG(variant_stat.st_mode):
+            found.append((coding, full_path + suffix, variant_stat))
+    return tuple(found)
+
+
+class FrontendStaticFiles(StaticFiles):
+    """StaticFiles for a single-page app build.
+
+    - When the client accepts it, `name.br` or `name.gz` next to a file is served
+      in its place, so nothing is compressed per request.
+    - Files under `assets/` carry a content hash in their name (Vite's default),
+      so they are cached for a year as immutable; everything else, index.html in
+      particular, is revalidated on every load.
+    - Paths that match no file and have no extension fall back to index.html for
+      client-side routes; unmatched `api/` paths keep their 404.
+    """
+
+    def __init__(self, *, directory: str, assets_dir: str = "assets", **kwargs) -> None:
+        super().__init__(directory=directory, html=True, **kwargs)
+        self._assets_prefix = os.path.join(os.path.realpath(directory), assets_dir) + os.sep
+
+    async def get_response(self, path: str, scope) -> Response:
+        try:
+            return await super().get_response(path, scope)
+        except HTTPException as exc:
+            first, _, _ = path.partition(os.sep)
+            if exc.status_code != 404 or first == "api" or "." in os.path.basename(path):
+                raise
+            return await super().get_response("index.html", scope)
+
+    def file_response(self, full_path, stat_result: os.stat_result, scope, status_code: int = 200) -> Response:
+        full_path = os.fspath(full_path)
+        headers = {"cache-control": IMMUTABLE if full_path.startswith(self._assets_prefix) else REVALIDATE}
+        media_type = guess_type(full_path)[0] or "text/plain"
+
+        variants = _variants(full_path, stat_result.st_mtime_ns)
+        if variants:
+            headers["vary"] = "Accept-Encoding"
+            codings = tuple(coding for coding, _, _ in variants)
+            chosen = negotiate(Headers(scope=scope).get("accept-encoding", ""), codings)
+            for coding, variant_path, variant_stat in variants:
+                if coding == chosen:
+                    headers["content-encoding"] = coding
+                    full_path, stat_result = variant_path, variant_stat
+                    break
+
+        # The ETag comes from the file actually sent, so each encoding gets its own
+        response = FileResponse(full_path, status_code=status_code, headers=headers, media_type=media_type, stat_result=stat_result)
+        if self.is_not_modified(response.headers, Headers(scope=scope)):
+            return NotModifiedResponse(response.headers)
+        return response
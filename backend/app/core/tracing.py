@@ -0,0 +1,377 @@
+# Request tracing with OpenTelemetry span semantics (W3C trace context, OTLP/JSON export) and no SDK dependency.
+# Sampling is decided once per request; unsampled requests create no spans, so the per-call cost
+# of an instrumented function is a context variable lookup.
+from __future__ import annotations
+
+import atexit
+import functools
+import inspect
+import queue
+import random
+import re
+import threading
+import time
+from collections import deque
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Any, Callable, Iterator, Optional
+
+import orjson
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import Headers
+
+from app.core.config import settings
+from app.core.metrics import statement_operation
+from app.core.query_audit import fingerprint
+
+INTERNAL, SERVER, CLIENT = "internal", "server", "client"
+# OTLP SpanKind and StatusCode enum values
+_OTLP_KIND = {INTERNAL: 1, SERVER: 2, CLIENT: 3}
+_OTLP_STATUS = {"unset": 0, "ok": 1, "error": 2}
+
+_TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+
+class Trace:
+    """The spans of one sampled request, exported together when its root span ends."""
+
+    __slots__ = ("trace_id", "spans", "dropped", "max_spans")
+
+    def __init__(self, trace_id: str, max_spans: int) -> None:
+        self.trace_id = trace_id
+        self.spans: list[Span] = []
+        self.dropped = 0
+        self.max_spans = max_spans
+
+    def add(self, span: "Span") -> bool:
+        # Bounds memory for requests that run thousands of statements; list.append is atomic under the GIL
+        if len(self.spans) >= self.max_spans:
+            self.dropped += 1
+            return False
+        self.spans.append(span)
+        return True
+
+    @property
+    def root(self) -> "Span":
+        return self.spans[0]
+
+
+class Span:
+    __slots__ = ("trace", "span_id", "parent_id", "name", "kind", "start_ns", "end_ns", "attributes", "status", "status_message", "events")
+
+    def __init__(self, trace: Trace, name: str, kind: str, parent_id: Optional[str], attributes: dict[str, Any]) -> None:
+        self.trace = trace
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes = attributes
+        self.status = "unset"
+        self.status_message = ""
+        self.events: list[tuple[int, str, dict[str, Any]]] = []
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def record_exception(self, exc: BaseException) -> None:
+        self.status, self.status_message = "error", f"{type(exc).__name__}: {exc}"
+        self.events.append((time.time_ns(), "exception", {"exception.type": type(exc).__name__, "exception.message": str(exc)}))
+
+    def end(self) -> None:
+        if self.end_ns is None:
+            self.end_ns = time.time_ns()
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e6
+
+
+_current: ContextVar[Optional[Span]] = ContextVar("trace_span", default=None)
+
+
+def current_span() -> Optional[Span]:
+    return _current.get()
+
+
+def _start(name: str, kind: str, attributes: dict[str, Any]) -> Optional[Span]:
+    parent = _current.get()
+    if parent is None:
+        return None
+    span = Span(parent.trace, name, kind, parent.span_id, attributes)
+    return span if parent.trace.add(span) else None
+
+
+_NOT_RECORDING = nullcontext()
+
+
+def span(name: str, kind: str = INTERNAL, **attributes: Any) -> AbstractContextManager[Optional[Span]]:
+    """A child of the current span; does nothing (and yields None) outside a sampled request."""
+    if _current.get() is None:
+        return _NOT_RECORDING
+    return _recording(name, kind, attributes)
+
+
+@contextmanager
+def _recording(name: str, kind: str, attributes: dict[str, Any]) -> Iterator[Optional[Span]]:
+    child = _start(name, kind, attributes)
+    if child is None:
+        yield None
+        return
+    token = _current.set(child)
+    try:
+        yield child
+    except BaseException as exc:
+        child.record_exception(exc)
+        raise
+    finally:
+        child.end()
+        _current.reset(token)
+
+
+def traced(name: Optional[str] = None, kind: str = INTERNAL) -> Callable:
+    """Decorator: run each call of a sync or async function in a span named `name` (default: its qualified name)."""
+
+    def decorate(fn: Callable) -> Callable:
+        span_name = name or fn.__qualname__
+        if inspect.iscoroutinefunction(fn):
+
+            @functools.wraps(fn)
+            async def traced_async(*args, **kwargs):
+                if _current.get() is None:
+                    return await fn(*args, **kwargs)
+                with span(span_name, kind):
+                    return await fn(*args, **kwargs)
+
+            return traced_async
+
+        @functools.wraps(fn)
+        def traced_sync(*args, **kwargs):
+            if _current.get() is None:
+                return fn(*args, **kwargs)
+            with span(span_name, kind):
+                return fn(*args, **kwargs)
+
+        return traced_sync
+
+    return decorate
+
+
+# ---------- Exporters ----------
+def otlp_json(trace: Trace) -> dict[str, Any]:
+    """The trace as an OTLP/JSON ExportTraceServiceRequest (hex ids, nanosecond timestamps)."""
+
+    def attributes(values: dict[str, Any]) -> list[dict[str, Any]]:
+        encoded = []
+        for key, value in values.items():
+            if isinstance(value, bool):
+                encoded.append({"key": key, "value": {"boolValue": value}})
+            elif isinstance(value, int):
+                encoded.append({"key": key, "value": {"intValue": str(value)}})
+            elif isinstance(value, float):
+                encoded.append({"key": key, "value": {"doubleValue": value}})
+            else:
+                encoded.append({"key": key, "value": {"stringValue": str(value)}})
+        return encoded
+
+    spans = [
+        {
+            "traceId": trace.trace_id,
+            "spanId": s.span_id,
+            "parentSpanId": s.parent_id or "",
+            "name": s.name,
+            "kind": _OTLP_KIND[s.kind],
+            "startTimeUnixNano": str(s.start_ns),
+            "endTimeUnixNano": str(s.end_ns or s.start_ns),
+            "attributes": attributes(s.attributes),
+            "events": [{"timeUnixNano": str(t), "name": n, "attributes": attributes(a)} for t, n, a in s.events],
+            "status": {"code": _OTLP_STATUS[s.status], "message": s.status_message},
+        }
+        for s in trace.spans
+    ]
+    return {
+        "resourceSpans": [
+            {
+                "resource": {"attributes": attributes({"service.name": settings.APP_NAME})},
+                "scopeSpans": [{"scope": {"name": "app.core.tracing"}, "spans": spans}],
+            }
+        ]
+    }
+
+
+class RingBufferExporter:
+    """Keeps the most recent traces in memory for /internal/traces."""
+
+    def __init__(self, size: int) -> None:
+        self._traces: deque[Trace] = deque(maxlen=size)
+
+    def export(self, trace: Trace) -> None:
+        self._traces.append(trace)
+
+    def traces(self) -> list[Trace]:
+        return list(self._traces)
+
+    def clear(self) -> None:
+        self._traces.clear()
+
+
+class OtlpFileExporter:
+    """Appends one OTLP/JSON line per trace to a file from a writer thread.
+
+    The line format is the OpenTelemetry Collector's file exporter format, so
+    its `otlpjsonfile` receiver (or any OTLP/JSON tool) can load the file.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._write, name="otlp-file-exporter", daemon=True)
+        self._thread.start()
+
+    def export(self, trace: Trace) -> None:
+        self._queue.put(trace)
+
+    def _write(self) -> None:
+        with open(self.path, "ab") as out:
+            while (trace := self._queue.get()) is not None:
+                out.write(orjson.dumps(otlp_json(trace)) + b"\n")
+                if self._queue.empty():
+                    out.flush()
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+
+
+ring_buffer = RingBufferExporter(settings.TRACE_RING_BUFFER_SIZE)
+_exporters: list = [ring_buffer]
+
+
+def configure_tracing() -> None:
+    """Add the OTLP file exporter when TRACE_OTLP_FILE is set. Idempotent."""
+    if settings.TRACE_OTLP_FILE and not any(isinstance(e, OtlpFileExporter) for e in _exporters):
+        exporter = OtlpFileExporter(settings.TRACE_OTLP_FILE)
+        _exporters.append(exporter)
+        atexit.register(exporter.close)
+
+
+# ---------- Entry points ----------
+def _sampled(headers: Headers) -> tuple[bool, Optional[str], Optional[str]]:
+    """Head sampling: follow a valid incoming traceparent, otherwise sample TRACE_SAMPLE_RATE of requests."""
+    match = _TRACEPARENT.match(headers.get("traceparent", ""))
+    if match and match.group(1) != "0" * 32:
+        trace_id, parent_id, flags = match.groups()
+        return bool(int(flags, 16) & 1), trace_id, parent_id
+    rate = settings.TRACE_SAMPLE_RATE
+    return rate > 0 and (rate >= 1 or random.random() < rate), None, None
+
+
+class TracingMiddleware:
+    """Pure ASGI middleware that opens the root server span of each sampled HTTP request.
+
+    The span is named after the matched route template once routing is done;
+    a child `http.send` span covers writing the response body. When the root
+    ends the trace goes to every exporter.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        sampled, trace_id, parent_id = _sampled(Headers(scope=scope))
+        if not sampled:
+            await self.app(scope, receive, send)
+            return
+
+        trace = Trace(trace_id or f"{random.getrandbits(128):032x}", settings.TRACE_MAX_SPANS)
+        root = Span(trace, f"{scope['method']} {scope['path']}", SERVER, parent_id, {"http.request.method": scope["method"], "url.path": scope["path"]})
+        trace.add(root)
+        sending: Optional[Span] = None
+
+        async def send_traced(message) -> None:
+            nonlocal sending
+            if message["type"] == "http.response.start":
+                root.set_attribute("http.response.status_code", message["status"])
+                if message["status"] >= 500:
+                    root.status = "error"
+                sending = Span(trace, "http.send", INTERNAL, root.span_id, {})
+                if not trace.add(sending):
+                    sending = None
+            await send(message)
+            if sending is not None and message["type"] == "http.response.body" and not message.get("more_body", False):
+                sending.end()
+
+        token = _current.set(root)
+        try:
+            await self.app(scope, receive, send_traced)
+        except BaseException as exc:
+            root.record_exception(exc)
+            raise
+        finally:
+            _current.reset(token)
+            route = getattr(scope.get("route"), "path", None)
+            if route:
+                root.name = f"{scope['method']} {route}"
+                root.set_attribute("http.route", route)
+            if sending is not None:
+                sending.end()
+            root.end()
+            for exporter in _exporters:
+                exporter.export(trace)
+
+
+def instrument_tracing(target: Engine, name: str) -> None:
+    """Record a client span for every statement on `target` run inside a sampled request."""
+
+    @event.listens_for(target, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany) -> None:
+        if context is None or _current.get() is None:
+            return
+        context._trace_span = _start(
+            statement_operation(statement).upper(),
+            CLIENT,
+            {"db.system": target.dialect.name, "db.query.text": fingerprint(statement), "app.db.engine": name, "db.executemany": executemany},
+        )
+
+    @event.listens_for(target, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany) -> None:
+        child: Optional[Span] = getattr(context, "_trace_span", None)
+        if child is not None:
+            child.end()
+
+    @event.listens_for(target, "handle_error")
+    def _error(exception_context) -> None:
+        child: Optional[Span] = getattr(exception_context.execution_context, "_trace_span", None)
+        if child is not None:
+            child.record_exception(exception_context.original_exception)
+            child.end()
+
+
+# ---------- Analysis ----------
+def summarize(trace: Trace) -> dict[str, Any]:
+    """Duration plus self time (own time minus direct children) per span name: where the request's time went."""
+    children_ms: dict[str, float] = {}
+    for s in trace.spans:
+        if s.parent_id:
+            children_ms[s.parent_id] = children_ms.get(s.parent_id, 0.0) + s.duration_ms
+    self_ms: dict[str, float] = {}
+    for s in trace.spans:
+        # The root's own time is framework work: routing, validation, response_model serialization
+        key = "(request)" if s is trace.root else s.name
+        self_ms[key] = self_ms.get(key, 0.0) + max(s.duration_ms - children_ms.get(s.span_id, 0.0), 0.0)
+    root = trace.root
+    return {
+        "trace_id": trace.trace_id,
+        "name": root.name,
+        "status": root.attributes.get("http.response.status_code"),
+        "start_ns": root.start_ns,
+        "duration_ms": round(root.duration_ms, 3),
+        "spans": len(trace.spans),
+        "dropped_spans": trace.dropped,
+        "self_ms": {k: round(v, 3) for k, v in sorted(self_ms.items(), key=lambda kv: -kv[1])},
+    }
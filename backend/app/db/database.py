@@ -1,16 +1,220 @@
 # backend/app/db/database.py
-from sqlalchemy import create_engine
+import threading
+from typing import Any
+
+from fastapi import Request
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.core.metrics import instrument_sql
+from app.core.query_audit import instrument_query_audit
+from app.core.tracing import instrument_tracing
+from app.db.pool import TimedAsyncAdaptedQueuePool, TimedQueuePool, instrument_pool
+from app.db.routing import RecentWriters, RoutingSession, caller_key, route_session
+from app.db.write_gate import gate_for, install_write_gate
+
+# Async drivers for the same database
+ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg", "mssql": "aioodbc"}
+
+
+def to_async_url(url: str) -> str:
+    """sqlite:///x -> sqlite+aiosqlite:///x, postgresql[+psycopg2]://... -> postgresql+asyncpg://..., mssql+pyodbc://... -> mssql+aioodbc://..."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend!r} databases")
+    parsed = parsed.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}")
+    if backend == "postgresql" and "sslmode" in parsed.query:
+        # asyncpg rejects libpq's sslmode; its ssl argument takes the same mode names
+        mode = parsed.query["sslmode"]
+        parsed = parsed.difference_update_query(["sslmode"]).update_query_dict({"ssl": mode})
+    return parsed.render_as_string(hide_password=False)
+
+
+def is_sqlite_file(url: str) -> bool:
+    parsed = make_url(url)
+    return parsed.get_backend_name() == "sqlite" and parsed.database not in (None, "", ":memory:")
+
+
+# ---------- SQLite profile ----------
+def sqlite_pragmas(read_only: bool = False) -> list[str]:
+    """Pragmas run on every new SQLite connection.
+
+    WAL lets readers run alongside the writer; synchronous=NORMAL is durable
+    across application crashes in WAL mode and only skips the fsync per commit.
+    journal_mode is persistent in the file, so read-only connections leave it to
+    the writer and switch on query_only instead.
+    """
+    pragmas = [
+        f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}",
+        "PRAGMA synchronous=NORMAL",
+        f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE_BYTES}",
+        f"PRAGMA cache_size=-{settings.SQLITE_CACHE_SIZE_KIB}",
+        "PRAGMA foreign_keys=ON",
+    ]
+    if read_only:
+        pragmas.append("PRAGMA query_only=ON")
+    else:
+        pragmas.insert(0, "PRAGMA journal_mode=WAL")
+    return pragmas
+
+
+def install_sqlite_pragmas(target: Engine, read_only: bool = False) -> None:
+    statements = sqlite_pragmas(read_only)
+
+    @event.listens_for(target, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for statement in statements:
+            cursor.execute(statement)
+        cursor.close()
+
+
+def _engine_options(url: str, read_only: bool) -> dict:
+    if make_url(url).get_backend_name() == "sqlite" and not is_sqlite_file(url):
+        return {}  # in-memory: SQLAlchemy's single-connection pools, nothing to size
+    if is_sqlite_file(url):
+        # A local file needs no liveness checks or recycling
+        # Writers don't need a connection of their own: they queue on the file's write gate
+        size = settings.SQLITE_READ_POOL_SIZE if read_only else settings.SQLITE_POOL_SIZE
+        return {"pool_size": size, "max_overflow": 0}
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        # Recycling connections older than the server/proxy idle timeout replaces the
+        # per-checkout round trip of pre-ping; turn pre-ping back on if connections
+        # can still be dropped underneath us
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def build_engine(url: str, read_only: bool = False, name: str | None = None) -> Engine:
+    connect_args = {"check_same_thread": False} if make_url(url).get_backend_name() == "sqlite" else {}
+    options = _engine_options(url, read_only)
+    if options:
+        options["poolclass"] = TimedQueuePool
+    built = create_engine(url, connect_args=connect_args, **options)
+    if is_sqlite_file(url):
+        install_sqlite_pragmas(built, read_only)
+        if not read_only:
+            install_write_gate(built, gate_for(url), settings.SQLITE_WRITE_TIMEOUT_SECONDS)
+    if name:
+        instrument_pool(built, name)
+        instrument_sql(built, name)
+        instrument_query_audit(built)
+        instrument_tracing(built, name)
+    return built
+
+
+def build_async_engine(url: str, read_only: bool = False, name: str | None = None) -> AsyncEngine:
+    options = _engine_options(url, read_only)
+    if options:
+        options["poolclass"] = TimedAsyncAdaptedQueuePool
+    built = create_async_engine(to_async_url(url), **options)
+    if is_sqlite_file(url):
+        install_sqlite_pragmas(built.sync_engine, read_only)
+        if not read_only:
+            # The same gate as the sync engine on this file: one writer between the two
+            install_write_gate(built.sync_engine, gate_for(url), settings.SQLITE_WRITE_TIMEOUT_SECONDS, is_async=True)
+    if name:
+        instrument_pool(built.sync_engine, name)
+        instrument_sql(built.sync_engine, name)
+        instrument_query_audit(built.sync_engine)
+        instrument_tracing(built.sync_engine, name)
+    return built
+
 
-connect_args = {"check_same_thread": False} if settings.DATABASE_URL.startswith("sqlite") else {}
+# Primary engine. The sync one serves scripts, Alembic, and the handlers that still run in the threadpool
+engine = build_engine(settings.DATABASE_URL, name="sync")
 
-engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True, connect_args=connect_args)
-SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+# Read engine: the replica when DATABASE_READ_URL is set; on a SQLite file without
+# one, a pool of query_only connections; otherwise the primary engine itself.
+if settings.DATABASE_READ_URL:
+    read_engine = build_engine(settings.DATABASE_READ_URL, read_only=True, name="sync_read")
+elif is_sqlite_file(settings.DATABASE_URL):
+    read_engine = build_engine(settings.DATABASE_URL, read_only=True, name="sync_read")
+else:
+    read_engine = engine
 
-def get_db():
+recent_writers = RecentWriters(settings.READ_YOUR_WRITES_SECONDS)
+
+# Sessions read from the primary unless routed otherwise (see app.db.routing)
+SessionLocal = sessionmaker(
+    class_=RoutingSession,
+    primary=engine,
+    replica=read_engine,
+    recent_writers=recent_writers,
+    autoflush=False,
+    autocommit=False,
+)
+# Replica-only sessions for scripts and checks that never write
+ReadSessionLocal = sessionmaker(bind=read_engine, autoflush=False, autocommit=False)
+
+
+def _build_async() -> dict[str, Any]:
+    primary = build_async_engine(settings.DATABASE_URL, name="async")
+    if settings.DATABASE_READ_URL:
+        replica = build_async_engine(settings.DATABASE_READ_URL, read_only=True, name="async_read")
+    elif is_sqlite_file(settings.DATABASE_URL):
+        replica = build_async_engine(settings.DATABASE_URL, read_only=True, name="async_read")
+    else:
+        replica = primary
+    # expire_on_commit=False: attributes stay loaded after commit, since lazy loads cannot run implicitly
+    sessions = async_sessionmaker(
+        sync_session_class=RoutingSession,
+        primary=primary.sync_engine,
+        replica=replica.sync_engine,
+        recent_writers=recent_writers,
+        autoflush=False,
+        expire_on_commit=False,
+    )
+    return {"async_engine": primary, "async_read_engine": replica, "AsyncSessionLocal": sessions}
+
+
+_async: dict[str, Any] = {}
+_async_lock = threading.Lock()
+
+
+def _lazy_async(name: str) -> Any:
+    with _async_lock:
+        if not _async:
+            _async.update(_build_async())
+    return _async[name]
+
+
+def __getattr__(name: str) -> Any:
+    # async_engine, async_read_engine and AsyncSessionLocal are built on first use, so importing
+    # this module (Alembic, scripts, the sync routes) works with a DATABASE_URL whose async
+    # driver isn't installed; the error surfaces where the async path is first needed
+    if name in ("async_engine", "async_read_engine", "AsyncSessionLocal"):
+        return _lazy_async(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def built_async_engines() -> list[AsyncEngine]:
+    """The async engines built so far (none before first use), each once."""
+    return list({id(e): e for key, e in _async.items() if key != "AsyncSessionLocal"}.values())
+
+
+def route_request(db, request: Request) -> None:
+    caller = caller_key(request.headers.get("authorization"), request.client.host if request.client else None)
+    route_session(db, request.method, caller)
+
+
+def get_db(request: Request):
     db = SessionLocal()
+    route_request(db, request)
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db(request: Request):
+    async with _lazy_async("AsyncSessionLocal")() as db:
+        route_request(db, request)
+        yield db
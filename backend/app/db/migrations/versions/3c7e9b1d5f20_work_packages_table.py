@@ -0,0 +1,58 @@
+"""work packages table
+
+Revision ID: 3c7e9b1d5f20
+Revises: a74b31f76bcf
+Create Date: 2025-09-08 09:12:41.502318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c7e9b1d5f20'
+down_revision: Union[str, Sequence[str], None] = 'a74b31f76bcf'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('work_packages',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('title', sa.String(length=200), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('status', sa.Enum('NOT_STARTED', 'IN_PROGRESS', 'COMPLETED', 'ON_HOLD', name='work_package_status_enum', native_enum=False), nullable=False),
+    sa.Column('discipline', sa.Enum('MECHANICAL', 'ELECTRICAL', 'INSTRUMENTATION', 'CIVIL', name='discipline_enum', native_enum=False), nullable=False),
+    sa.Column('start_date', sa.Date(), nullable=True),
+    sa.Column('end_date', sa.Date(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.CheckConstraint('start_date IS NULL OR end_date IS NULL OR end_date >= start_date', name='ck_wp_dates_ordered'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_work_packages_discipline_status_start', 'work_packages', ['discipline', 'status', 'start_date'], unique=False)
+    op.create_index('ix_work_packages_start_id', 'work_packages', ['start_date', 'id'], unique=False)
+
+    # Cost rows were keyed by client-side ids with no backing table. Give each
+    # orphan a placeholder package so the new foreign key holds; rename/classify later.
+    op.execute(
+        "INSERT INTO work_packages (id, title, status, discipline, created_at, updated_at) "
+        "SELECT c.work_package_id, 'Imported work package', 'NOT_STARTED', 'MECHANICAL', c.created_at, c.updated_at "
+        "FROM work_package_costs c "
+        "WHERE NOT EXISTS (SELECT 1 FROM work_packages w WHERE w.id = c.work_package_id)"
+    )
+
+    with op.batch_alter_table('work_package_costs') as batch_op:
+        batch_op.create_foreign_key('fk_costs_work_package', 'work_packages', ['work_package_id'], ['id'], ondelete='CASCADE')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('work_package_costs') as batch_op:
+        batch_op.drop_constraint('fk_costs_work_package', type_='foreignkey')
+    op.drop_index('ix_work_packages_start_id', table_name='work_packages')
+    op.drop_index('ix_work_packages_discipline_status_start', table_name='work_packages')
+    op.drop_table('work_packages')
@@ -0,0 +1,41 @@
+"""work package dependencies
+
+Revision ID: 8e4b2a6c1d93
+Revises: 3c7e9b1d5f20
+Create Date: 2025-09-10 14:03:27.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e4b2a6c1d93'
+down_revision: Union[str, Sequence[str], None] = '3c7e9b1d5f20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('work_package_dependencies',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('predecessor_id', sa.String(length=36), nullable=False),
+    sa.Column('successor_id', sa.String(length=36), nullable=False),
+    sa.Column('lag_days', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.CheckConstraint('predecessor_id <> successor_id', name='ck_wp_dependency_not_self'),
+    sa.ForeignKeyConstraint(['predecessor_id'], ['work_packages.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['successor_id'], ['work_packages.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('predecessor_id', 'successor_id', name='uq_wp_dependency')
+    )
+    op.create_index('ix_wp_dependencies_successor', 'work_package_dependencies', ['successor_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_wp_dependencies_successor', table_name='work_package_dependencies')
+    op.drop_table('work_package_dependencies')
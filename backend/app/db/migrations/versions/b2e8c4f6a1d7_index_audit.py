@@ -0,0 +1,54 @@
+"""index audit: composite indexes for hot paths, drop redundant ones
+
+Revision ID: b2e8c4f6a1d7
+Revises: 5d1f7a3e9c42
+Create Date: 2025-09-26 09:12:44.305917
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b2e8c4f6a1d7'
+down_revision: Union[str, Sequence[str], None] = '5d1f7a3e9c42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index, table, columns) dropped by the upgrade: duplicates of a primary key or unique
+# constraint, or leading columns of one of the composite indexes created below
+REDUNDANT = [
+    ('idx_costs_wp_id', 'work_package_costs', ['work_package_id']),
+    ('ix_work_package_costs_work_package_id', 'work_package_costs', ['work_package_id']),
+    ('ix_chat_sessions_id', 'chat_sessions', ['id']),
+    ('ix_chat_sessions_user_id', 'chat_sessions', ['user_id']),
+    ('ix_chat_messages_id', 'chat_messages', ['id']),
+    ('ix_chat_messages_session_id', 'chat_messages', ['session_id']),
+    ('ix_items_id', 'items', ['id']),
+    ('ix_users_id', 'users', ['id']),
+]
+
+COMPOSITE = [
+    ('ix_chat_messages_session_created', 'chat_messages', ['session_id', 'created_at']),
+    ('ix_chat_sessions_user_domain_created', 'chat_sessions', ['user_id', 'domain_id', 'created_at']),
+    ('ix_variation_orders_cost_status', 'variation_orders', ['work_package_cost_id', 'status']),
+    ('ix_breakdown_items_cost_created', 'cost_breakdown_items', ['work_package_cost_id', 'created_at']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Create first, so no hot query is left without an index in between
+    for name, table, columns in COMPOSITE:
+        op.create_index(name, table, columns, unique=False)
+    for name, table, _ in REDUNDANT:
+        op.drop_index(name, table_name=table)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, columns in REDUNDANT:
+        op.create_index(name, table, columns, unique=False)
+    for name, table, _ in reversed(COMPOSITE):
+        op.drop_index(name, table_name=table)
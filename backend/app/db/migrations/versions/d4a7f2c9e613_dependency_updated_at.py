@@ -0,0 +1,34 @@
+"""work package dependencies: updated_at
+
+Revision ID: d4a7f2c9e613
+Revises: b2e8c4f6a1d7
+Create Date: 2025-09-29 10:41:08.527390
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4a7f2c9e613'
+down_revision: Union[str, Sequence[str], None] = 'b2e8c4f6a1d7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing links start out as last updated when they were created
+    with op.batch_alter_table('work_package_dependencies') as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True))
+    op.execute('UPDATE work_package_dependencies SET updated_at = created_at')
+    with op.batch_alter_table('work_package_dependencies') as batch_op:
+        batch_op.alter_column('updated_at', existing_type=sa.DateTime(timezone=True), nullable=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('work_package_dependencies') as batch_op:
+        batch_op.drop_column('updated_at')
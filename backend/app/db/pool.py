@@ -0,0 +1,177 @@
+# Connection pool classes that time checkouts, plus per-engine pool metrics fed by pool events
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+from app.core.metrics import REGISTRY
+
+# Upper bounds (seconds) of the checkout-wait histogram buckets; the last bucket is open-ended
+WAIT_BUCKETS = (0.001, 0.005, 0.025, 0.1, 0.5, 2.5)
+
+
+@dataclass
+class PoolMetrics:
+    """Counters for one engine's pool. Updated from pool events and checkout timing."""
+
+    name: str
+    connects: int = 0
+    checkouts: int = 0
+    checkins: int = 0
+    invalidations: int = 0
+    timeouts: int = 0
+    in_use: int = 0
+    peak_in_use: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+    wait_histogram: list[int] = field(default_factory=lambda: [0] * (len(WAIT_BUCKETS) + 1))
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record_wait(self, seconds: float, timed_out: bool = False) -> None:
+        bucket = next((i for i, bound in enumerate(WAIT_BUCKETS) if seconds <= bound), len(WAIT_BUCKETS))
+        with self._lock:
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+            self.wait_histogram[bucket] += 1
+            if timed_out:
+                self.timeouts += 1
+
+    def record_checkout(self) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+
+    def record_checkin(self) -> None:
+        with self._lock:
+            self.checkins += 1
+            self.in_use = max(self.in_use - 1, 0)
+
+    def increment(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def as_dict(self, pool: Optional[Pool] = None) -> dict[str, Any]:
+        with self._lock:
+            waits = sum(self.wait_histogram)
+            data: dict[str, Any] = {
+                "name": self.name,
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "in_use": self.in_use,
+                "peak_in_use": self.peak_in_use,
+                "wait_ms_avg": round(self.wait_seconds_total / waits * 1000, 3) if waits else 0.0,
+                "wait_ms_max": round(self.wait_seconds_max * 1000, 3),
+                "wait_histogram": {
+                    **{f"le_{int(bound * 1000)}ms": n for bound, n in zip(WAIT_BUCKETS, self.wait_histogram)},
+                    "inf": self.wait_histogram[-1],
+                },
+            }
+        if isinstance(pool, QueuePool):
+            data.update(
+                size=pool.size(),
+                in_use=pool.checkedout(),
+                checked_in=pool.checkedin(),
+                overflow=max(pool.overflow(), 0),
+            )
+        return data
+
+
+class _TimedCheckout:
+    """Times `_do_get`: queueing for a free connection, plus opening one when the pool grows."""
+
+    metrics: Optional[PoolMetrics] = None
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            if self.metrics is not None:
+                self.metrics.record_wait(time.perf_counter() - started, timed_out=True)
+            raise
+        if self.metrics is not None:
+            self.metrics.record_wait(time.perf_counter() - started)
+        return connection
+
+    def recreate(self):
+        # engine.dispose() swaps in a recreated pool; keep counting into the same metrics
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class TimedQueuePool(_TimedCheckout, QueuePool):
+    pass
+
+
+class TimedAsyncAdaptedQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    pass
+
+
+_registry: dict[str, tuple[PoolMetrics, Engine]] = {}
+
+
+def instrument_pool(target: Engine, name: str) -> PoolMetrics:
+    """Attach metrics to an engine's pool. Pass `AsyncEngine.sync_engine` for async engines."""
+    metrics = PoolMetrics(name)
+    if isinstance(target.pool, _TimedCheckout):
+        target.pool.metrics = metrics
+
+    @event.listens_for(target, "connect")
+    def _connect(dbapi_connection, connection_record):
+        metrics.increment("connects")
+
+    @event.listens_for(target, "checkout")
+    def _checkout(dbapi_connection, connection_record, connection_proxy):
+        metrics.record_checkout()
+
+    @event.listens_for(target, "checkin")
+    def _checkin(dbapi_connection, connection_record):
+        metrics.record_checkin()
+
+    @event.listens_for(target, "invalidate")
+    def _invalidate(dbapi_connection, connection_record, exception):
+        metrics.increment("invalidations")
+
+    _registry[name] = (metrics, target)
+    return metrics
+
+
+def pool_stats() -> list[dict[str, Any]]:
+    """Current metrics for every instrumented pool, with live size/overflow from the pool itself."""
+    return [metrics.as_dict(target.pool) for metrics, target in _registry.values()]
+
+
+def _pool_samples(*fields: str):
+    def collect():
+        for stats in pool_stats():
+            for f in fields:
+                if f in stats:
+                    yield (stats["name"], f), stats[f]
+
+    return collect
+
+
+REGISTRY.callback(
+    "db_pool_connections",
+    "Connections per pool: in use, idle in the pool, overflow beyond pool_size, and the configured size.",
+    ("pool", "state"),
+    _pool_samples("in_use", "checked_in", "overflow", "size"),
+)
+REGISTRY.callback(
+    "db_pool_events_total",
+    "Pool connects, checkouts, invalidations and checkout timeouts since start.",
+    ("pool", "event"),
+    _pool_samples("connects", "checkouts", "invalidations", "timeouts"),
+    kind="counter",
+)
@@ -0,0 +1,156 @@
+# Primary/replica routing for ORM sessions, with read-your-writes stickiness per caller
+from __future__ import annotations
+
+import functools
+import hashlib
+import inspect
+import threading
+import time
+from contextlib import AbstractContextManager, contextmanager
+from typing import Any, Callable, Iterator, Optional, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class RecentWriters:
+    """Callers that committed a write in the last `window` seconds, in this process.
+
+    Replicas lag the primary, so a caller's reads stay on the primary for a short
+    while after they write. Workers don't share this; behind several workers the
+    window only holds for requests that land on the same one.
+    """
+
+    def __init__(self, window: float, max_entries: int = 10_000) -> None:
+        self.window = window
+        self.max_entries = max_entries
+        self._last_write: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def touch(self, caller: str) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._last_write[caller] = now
+            if len(self._last_write) > self.max_entries:
+                cutoff = now - self.window
+                self._last_write = {k: t for k, t in self._last_write.items() if t > cutoff}
+
+    def seen(self, caller: Optional[str]) -> bool:
+        if caller is None:
+            return False
+        with self._lock:
+            last = self._last_write.get(caller)
+        return last is not None and time.monotonic() - last < self.window
+
+    def clear(self) -> None:
+        with self._lock:
+            self._last_write.clear()
+
+
+def caller_key(authorization: Optional[str], client_host: Optional[str]) -> Optional[str]:
+    """Who a request is from: its bearer token if it has one, else the client address."""
+    if authorization:
+        return "auth:" + hashlib.sha1(authorization.encode()).hexdigest()
+    return f"client:{client_host}" if client_host else None
+
+
+class RoutingSession(Session):
+    """Session that sends reads to `replica` when allowed and everything else to `primary`.
+
+    Reads may use the replica when the session was opened for a read request
+    (`route_session`) or inside a `read_only` service call, and only while the
+    session has not written and its caller has not written recently. Flushes and
+    DML always go to the primary, and once a session has written, all its later
+    reads do too.
+    """
+
+    def __init__(self, *args: Any, primary: Engine, replica: Engine, recent_writers: RecentWriters, **kw: Any) -> None:
+        super().__init__(*args, **kw)
+        self.primary = primary
+        self.replica = replica
+        self.recent_writers = recent_writers
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self._flushing or getattr(clause, "is_dml", False):
+            self.info["wrote"] = True
+            return self.primary
+        if self.info.get("replica_ok") and not self.info.get("wrote") and not self.info.get("sticky"):
+            return self.replica
+        return self.primary
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _remember_writer(session: RoutingSession) -> None:
+    caller = session.info.get("caller")
+    if session.info.get("wrote") and caller:
+        session.recent_writers.touch(caller)
+
+
+def route_session(db: Session | AsyncSession, method: str, caller: Optional[str]) -> None:
+    """Set a request's routing: reads on the replica for read methods, unless the caller wrote recently."""
+    session = db.sync_session if isinstance(db, AsyncSession) else db
+    sticky = isinstance(session, RoutingSession) and session.recent_writers.seen(caller)
+    db.info.update(caller=caller, sticky=sticky, replica_ok=method.upper() in READ_METHODS)
+
+
+@contextmanager
+def _replica_ok(db: Session | AsyncSession, allowed: bool) -> Iterator[None]:
+    info = db.info
+    previous = info.get("replica_ok")
+    info["replica_ok"] = allowed
+    try:
+        yield
+    finally:
+        info["replica_ok"] = previous
+
+
+def replica_reads(db: Session | AsyncSession) -> AbstractContextManager[None]:
+    return _replica_ok(db, True)
+
+
+def primary_reads(db: Session | AsyncSession) -> AbstractContextManager[None]:
+    """Read from the primary inside the block, even in a read request.
+
+    For checks that decide whether to write: a lagging replica would report a
+    row that exists on the primary as missing.
+    """
+    return _replica_ok(db, False)
+
+
+def _find_session(args: tuple, kwargs: dict) -> Session | AsyncSession:
+    db = kwargs.get("db")
+    if db is None:
+        db = next((a for a in args if isinstance(a, (Session, AsyncSession))), None)
+    if db is None:
+        raise TypeError("read_only functions take the session as `db` or a positional argument")
+    return db
+
+
+def read_only(fn: F) -> F:
+    """Mark a service function as read-only: its queries may use the replica even in a write request.
+
+    The session's own guards still apply, so the call reads from the primary
+    once the session has written or while its caller is inside the
+    read-your-writes window.
+    """
+    if inspect.iscoroutinefunction(fn):
+
+        @functools.wraps(fn)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            with replica_reads(_find_session(args, kwargs)):
+                return await fn(*args, **kwargs)
+
+        return async_wrapper  # type: ignore[return-value]
+
+    @functools.wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        with replica_reads(_find_session(args, kwargs)):
+            return fn(*args, **kwargs)
+
+    return wrapper  # type: ignore[return-value]
@@ -0,0 +1,143 @@
+# One writer at a time for a SQLite file: a gate shared by the sync and async engines
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.util import await_only
+
+# Statements that never take SQLite's write lock (pysqlite only opens a transaction before DML)
+_READS = ("SELECT", "PRAGMA", "EXPLAIN", "SAVEPOINT", "RELEASE")
+_HELD = "holds_write_gate"
+
+
+class WriteGate:
+    """A lock for SQLite's single writer, waited on from threads or from the event loop.
+
+    SQLite lets one transaction write at a time and makes the rest spin in its
+    busy handler. Connections about to write wait here instead, whichever engine
+    (sync or async) they belong to. Release wakes the longest waiter but doesn't
+    hand the gate over: a thread that already holds the GIL may take it first,
+    which keeps commits flowing when readers compete for the interpreter. A
+    waiter that loses that race keeps its place at the front.
+    """
+
+    def __init__(self) -> None:
+        self._mutex = threading.Lock()
+        self._held = False
+        # Each waiter's wake() returns False if the waiter is gone (its event loop has closed)
+        self._waiters: deque[Callable[[], bool]] = deque()
+
+    def _take_or_queue(self, wake: Callable[[], bool], front: bool) -> bool:
+        with self._mutex:
+            if not self._held:
+                self._held = True
+                return True
+            if front:
+                self._waiters.appendleft(wake)
+            else:
+                self._waiters.append(wake)
+            return False
+
+    def _wake_next(self) -> None:
+        # Called with the mutex held
+        while self._waiters and not self._waiters.popleft()():
+            pass
+
+    def _give_up(self, wake: Callable[[], bool]) -> None:
+        with self._mutex:
+            if wake in self._waiters:
+                self._waiters.remove(wake)
+            elif not self._held:
+                self._wake_next()  # woken just as it gave up: pass the wake-up on
+
+    def acquire(self, timeout: float) -> None:
+        deadline = time.monotonic() + timeout
+        woken = threading.Event()
+
+        def wake() -> bool:
+            woken.set()
+            return True
+
+        retry = False
+        while not self._take_or_queue(wake, front=retry):
+            if not woken.wait(max(deadline - time.monotonic(), 0)):
+                self._give_up(wake)
+                raise exc.TimeoutError(f"Timed out after {timeout}s waiting for the SQLite writer")
+            woken.clear()
+            retry = True
+
+    async def acquire_async(self, timeout: float) -> None:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        retry = False
+        while True:
+            woken = loop.create_future()
+
+            def wake(woken: asyncio.Future = woken) -> bool:
+                try:
+                    loop.call_soon_threadsafe(lambda: woken.done() or woken.set_result(None))
+                except RuntimeError:  # the waiter's loop has closed
+                    return False
+                return True
+
+            if self._take_or_queue(wake, front=retry):
+                return
+            try:
+                await asyncio.wait_for(woken, max(deadline - loop.time(), 0))
+            except BaseException as error:
+                self._give_up(wake)
+                if isinstance(error, asyncio.TimeoutError):
+                    raise exc.TimeoutError(f"Timed out after {timeout}s waiting for the SQLite writer") from None
+                raise
+            retry = True
+
+    def release(self) -> None:
+        with self._mutex:
+            self._held = False
+            self._wake_next()
+
+
+_gates: dict[str, WriteGate] = {}
+_gates_lock = threading.Lock()
+
+
+def gate_for(url: str) -> WriteGate:
+    """The gate of a SQLite file; every engine on the same file gets the same one."""
+    path = os.path.abspath(make_url(url).database)
+    with _gates_lock:
+        return _gates.setdefault(path, WriteGate())
+
+
+def install_write_gate(target: Engine, gate: WriteGate, timeout: float, is_async: bool = False) -> None:
+    """Make `target`'s connections take `gate` before their first write, until they go back to the pool.
+
+    Connections that only read never wait, so a session left open for reads
+    doesn't hold up writers. For an AsyncEngine, pass its sync_engine with
+    is_async=True: the events run inside its greenlet, which awaits the gate
+    without blocking the event loop.
+    """
+
+    @event.listens_for(target, "before_cursor_execute")
+    def _acquire(conn, cursor, statement, parameters, context, executemany):
+        info = conn.connection.info
+        if info.get(_HELD) or statement.lstrip()[:9].upper().startswith(_READS):
+            return
+        if is_async:
+            await_only(gate.acquire_async(timeout))
+        else:
+            gate.acquire(timeout)
+        info[_HELD] = True
+
+    @event.listens_for(target, "checkin")
+    @event.listens_for(target, "detach")
+    def _release(dbapi_connection, connection_record):
+        # checkin runs after the pool's reset, so the transaction has committed or rolled back by now
+        if connection_record is not None and connection_record.info.pop(_HELD, False):
+            gate.release()
@@ -1,18 +1,193 @@
-from fastapi import APIRouter, Depends
+# Liveness, cached readiness and on-demand deep diagnostics
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Optional
+
+from fastapi import APIRouter
+from fastapi.responses import ORJSONResponse
 from sqlalchemy import text
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.concurrency import run_in_threadpool
 
-from app.db.database import get_db
+from app.core.config import settings
+from app.core.metrics import CACHE_REQUESTS, threadpool_stats
+from app.db import database
+from app.db.database import read_engine
+from app.db.pool import pool_stats
+from app.services.jobs.queue import queue_stats
+from app.services.jobs.worker import job_worker
 
 router = APIRouter(tags=["health"])
 
+ALEMBIC_INI = Path(__file__).resolve().parents[1] / "alembic.ini"
+
+
+def _engines() -> dict[str, AsyncEngine]:
+    primary, read = database.async_engine, database.async_read_engine
+    # Without a replica or SQLite read pools the read engine is the primary one
+    if read is primary:
+        return {"primary": primary}
+    # SQLite read pools open the primary's own file: checking through them proves the
+    # database is there without waiting behind a long write on the primary's connections
+    if not settings.DATABASE_READ_URL:
+        return {"primary": read}
+    return {"primary": primary, "read": read}
+
+
+async def ping(target: AsyncEngine, timeout: float) -> dict[str, Any]:
+    """Run `SELECT 1` on a pooled connection; never raises, never waits longer than `timeout`."""
+    started = time.perf_counter()
+
+    async def select_one() -> None:
+        async with target.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+
+    try:
+        await asyncio.wait_for(select_one(), timeout)
+    except asyncio.TimeoutError:
+        return {"status": "timeout", "latency_ms": round(timeout * 1000, 1)}
+    except Exception as exc:
+        return {"status": "error", "error": f"{type(exc).__name__}: {exc}"}
+    return {"status": "ok", "latency_ms": round((time.perf_counter() - started) * 1000, 2)}
+
+
+@dataclass
+class ReadinessChecker:
+    """Database readiness, checked every `interval` seconds instead of on every probe.
+
+    Started from the lifespan, a background task refreshes the cached result.
+    When it isn't running (or has stalled), a probe that finds the result older
+    than three intervals refreshes it itself; concurrent probes share that one
+    check, so a slow database never piles probes up on the pool.
+    """
+
+    interval: float = field(default_factory=lambda: settings.READINESS_CHECK_INTERVAL_SECONDS)
+    timeout: float = field(default_factory=lambda: settings.READINESS_CHECK_TIMEOUT_SECONDS)
+    result: Optional[dict[str, Any]] = None
+    checked_monotonic: float = 0.0
+    _refreshing: Optional[asyncio.Future] = None
+    _task: Optional[asyncio.Task] = None
+
+    async def check(self) -> dict[str, Any]:
+        engines = _engines()
+        results = await asyncio.gather(*(ping(target, self.timeout) for target in engines.values()))
+        db = dict(zip(engines, results))
+        self.result = {
+            "status": "ok" if all(r["status"] == "ok" for r in results) else "unavailable",
+            "db": db,
+            "checked_at": time.time(),
+        }
+        self.checked_monotonic = time.monotonic()
+        return self.result
+
+    async def current(self) -> dict[str, Any]:
+        if self.result is not None and time.monotonic() - self.checked_monotonic < 3 * self.interval:
+            return self.result
+        if self._refreshing is None or self._refreshing.done():
+            self._refreshing = asyncio.ensure_future(self.check())
+        # shield: a probe that disconnects must not cancel the check other probes wait on
+        return await asyncio.shield(self._refreshing)
+
+    async def _run(self) -> None:
+        while True:
+            await self.check()
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run(), name="readiness-checker")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+readiness = ReadinessChecker()
+
+
+@lru_cache(maxsize=1)
+def _migration_heads() -> tuple[str, ...]:
+    # The scripts on disk don't change while the process runs
+    from alembic.config import Config
+    from alembic.script import ScriptDirectory
+
+    return tuple(ScriptDirectory.from_config(Config(str(ALEMBIC_INI))).get_heads())
+
+
+def migration_status() -> dict[str, Any]:
+    try:
+        from alembic.runtime.migration import MigrationContext
+    except ImportError:  # pragma: no cover - depends on deployment
+        return {"status": "unknown", "error": "alembic is not installed"}
+    heads = _migration_heads()
+    # alembic_version is only read, so the read engine will do (on SQLite, the read pool on the same file)
+    with read_engine.connect() as connection:
+        current = tuple(MigrationContext.configure(connection).get_current_heads())
+    if not current:
+        status = "unversioned"
+    else:
+        status = "current" if set(current) == set(heads) else "mismatch"
+    return {"status": status, "head": list(heads), "current": list(current)}
+
+
+def cache_stats() -> dict[str, dict[str, Any]]:
+    caches: dict[str, dict[str, Any]] = {}
+    for (cache, result), n in CACHE_REQUESTS.values():
+        caches.setdefault(cache, {})[result] = int(n)
+    for counts in caches.values():
+        lookups = sum(counts.values())
+        counts["hit_ratio"] = round(counts.get("hit", 0) / lookups, 3) if lookups else None
+    return caches
+
+
 @router.get("/healthz")
 def healthz():
     # Process is up
     return {"status": "ok"}
 
+
 @router.get("/readyz")
-def readyz(db: Session = Depends(get_db)):
-    # DB reachable and answering basic query
-    db.execute(text("SELECT 1"))
-    return {"status": "ready"}
+async def readyz():
+    # Served from the checker's cached result: probes don't touch the pool
+    result = await readiness.current()
+    body = {"status": result["status"], "db": {name: r["status"] for name, r in result["db"].items()}, "checked_at": result["checked_at"]}
+    return ORJSONResponse(body, status_code=200 if result["status"] == "ok" else 503)
+
+
+@router.get("/healthz/deep", include_in_schema=False)
+async def healthz_deep():
+    """Live diagnostics for an operator: runs queries, so keep it off the probe path."""
+    engines = _engines()
+    db = dict(zip(engines, await asyncio.gather(*(ping(target, settings.READINESS_CHECK_TIMEOUT_SECONDS) for target in engines.values()))))
+    try:
+        migrations = await run_in_threadpool(migration_status)
+    except Exception as exc:
+        migrations = {"status": "error", "error": f"{type(exc).__name__}: {exc}"}
+    try:
+        jobs = {"queue": await run_in_threadpool(queue_stats), "worker": job_worker.stats()}
+    except Exception as exc:
+        jobs = {"error": f"{type(exc).__name__}: {exc}", "worker": job_worker.stats()}
+    healthy = all(r["status"] == "ok" for r in db.values()) and migrations["status"] in ("current", "unversioned", "unknown")
+    return ORJSONResponse(
+        {
+            "status": "ok" if healthy else "degraded",
+            "db": db,
+            "pools": pool_stats(),
+            "migrations": migrations,
+            "caches": cache_stats(),
+            "threadpool": threadpool_stats(),
+            "readiness": readiness.result,
+            "jobs": jobs,
+        },
+        status_code=200 if healthy else 503,
+    )
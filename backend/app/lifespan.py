@@ -1,4 +1,108 @@
-# Ensure the default 'how' domain exists
-    if not db.query(Domain).filter(Domain.id == "how").first():
-        db.add(Domain(id="how", name="How"))
-        db.commit()
+# Application lifespan: startup checks and pool warm-up run concurrently, then the readiness checker and the
+# job worker start; on shutdown the worker hands back unfinished jobs before the engines are disposed
+from __future__ import annotations
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from fastapi import FastAPI
+from sqlalchemy import exists, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import QueuePool
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.db import database
+from app.db.database import built_async_engines, engine, read_engine
+from app.health import readiness
+from app.services.jobs.worker import job_worker
+import app.models  # noqa: F401  (registers every model before the domain modules import them)
+from app.Domains.users.models import User
+
+logger = logging.getLogger(__name__)
+
+
+async def bootstrap_first_admin() -> None:
+    """Create the first admin from ADMIN_EMAIL/ADMIN_PASSWORD while the users table is empty."""
+    if not settings.ADMIN_EMAIL:
+        return
+    async with database.AsyncSessionLocal() as db:
+        if await db.scalar(select(exists().select_from(User))):
+            return
+        if not settings.ADMIN_PASSWORD:
+            logger.warning("ADMIN_EMAIL set without ADMIN_PASSWORD. Invite flow will handle first admin.")
+            return
+        from app.core.security import hash_password
+
+        # bcrypt is slow on purpose; keep it off the event loop so the warm-up runs alongside
+        password_hash = await run_in_threadpool(hash_password, settings.ADMIN_PASSWORD)
+        db.add(User(email=settings.ADMIN_EMAIL, password_hash=password_hash, is_active=True, is_admin=True))
+        try:
+            await db.commit()
+        except IntegrityError:
+            # Another worker starting at the same time created it first
+            await db.rollback()
+            return
+        logger.info("Created first admin user: %s", settings.ADMIN_EMAIL)
+
+
+def _warmup_size(target: Engine) -> int:
+    pool = target.pool
+    return min(settings.DB_POOL_WARMUP_CONNECTIONS, pool.size()) if isinstance(pool, QueuePool) else 0
+
+
+def warm_sync_pool(target: Engine) -> None:
+    connections = [target.connect() for _ in range(_warmup_size(target))]
+    for connection in connections:
+        connection.close()
+
+
+async def warm_async_pool(target: AsyncEngine) -> None:
+    connections = await asyncio.gather(*(target.connect() for _ in range(_warmup_size(target.sync_engine))))
+    await asyncio.gather(*(connection.close() for connection in connections))
+
+
+def _unique(*engines):
+    # Without a replica or SQLite read pools the read engines are the primary ones
+    return list({id(e): e for e in engines}.values())
+
+
+async def startup() -> None:
+    results = await asyncio.gather(
+        bootstrap_first_admin(),
+        *(run_in_threadpool(warm_sync_pool, e) for e in _unique(engine, read_engine)),
+        *(warm_async_pool(e) for e in _unique(database.async_engine, database.async_read_engine)),
+        return_exceptions=True,
+    )
+    # Raise only once every task has finished, so none opens a connection after shutdown disposes the pools
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    readiness.start()
+    if settings.JOBS_WORKER_ENABLED:
+        job_worker.start()
+
+
+async def shutdown() -> None:
+    await readiness.stop()
+    # Blocks for up to JOBS_SHUTDOWN_GRACE_SECONDS while running jobs finish
+    await run_in_threadpool(job_worker.stop)
+    # Closes pooled aiosqlite/asyncpg connections (aiosqlite keeps a thread per connection);
+    # after a failed startup the async engines may never have been built
+    await asyncio.gather(*(e.dispose() for e in built_async_engines()))
+    for e in _unique(engine, read_engine):
+        e.dispose()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    try:
+        await startup()
+        yield
+    finally:
+        # Also after a failed startup: undisposed aiosqlite threads would keep the worker from exiting
+        await shutdown()
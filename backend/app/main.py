@@ -1,14 +1,29 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
+from app.core.compression import CompressionMiddleware
 from app.core.config import settings
+from app.core.logging import RequestContextMiddleware, configure_logging
+from app.core.metrics import MetricsMiddleware
+from app.core.query_audit import QueryAuditMiddleware
+from app.core.static_files import FrontendStaticFiles
+from app.core.tracing import TracingMiddleware, configure_tracing
+from app.lifespan import lifespan
 from app.health import router as health_router
+from app.api.internal import router as internal_router
+from app.api.metrics import router as metrics_router
 from app.api.v1.items import router as items_router  # your example router
 from app.api.v1.chat import router as chat_router
+from app.api.v1.jobs import router as jobs_router
 from app.Domains.users.router import router as users_router
 from app.Domains.turnarounds.router import router as turnarounds_router
 
-app = FastAPI(title="my_cloud_api")
+configure_logging()
+configure_tracing()
+
+# orjson encodes the response_model output several times faster than the stdlib json encoder
+app = FastAPI(title="my_cloud_api", lifespan=lifespan, default_response_class=ORJSONResponse)
 
 # CORS: allow front-end to call the API in browser (adjust origins as needed)
 # A more permissive CORS policy for development
@@ -28,39 +43,27 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(QueryAuditMiddleware)
+app.add_middleware(CompressionMiddleware)
+# Outside the query audit, so its N+1 warnings carry the request id and its totals reach the slow-request log
+app.add_middleware(RequestContextMiddleware)
+# Around the request context, so the root span is still open when the slow-request log records its trace id
+app.add_middleware(TracingMiddleware)
+# Outermost, so the timings include every other middleware
+app.add_middleware(MetricsMiddleware)
 
 # Health endpoints
 app.include_router(health_router)
+app.include_router(internal_router)
+app.include_router(metrics_router)
 
 # Versioned API
 app.include_router(items_router, prefix="/api/v1")
 app.include_router(chat_router, prefix="/api/v1")
+app.include_router(jobs_router, prefix="/api/v1")
 app.include_router(users_router, prefix="/api/v1")
 app.include_router(turnarounds_router, prefix="/api/v1/turnarounds", tags=["Turnarounds"])
 
-from sqlalchemy.orm import Session
-from app.db.database import SessionLocal
-from app.core.security import hash_password
-from app.Domains.users.models import User
-from app.core.config import settings
-
-@app.on_event("startup")
-def bootstrap_first_admin():
-    db: Session = SessionLocal()
-    try:
-        count = db.query(User).count()
-        if count == 0 and settings.ADMIN_EMAIL:
-            if settings.ADMIN_PASSWORD:
-                u = User(
-                    email=settings.ADMIN_EMAIL,
-                    password_hash=hash_password(settings.ADMIN_PASSWORD),
-                    is_active=True,
-                    is_admin=True,
-                )
-                db.add(u)
-                db.commit()
-                print(f"[bootstrap] Created first admin user: {settings.ADMIN_EMAIL}")
-            else:
-                print("[bootstrap] ADMIN_EMAIL set without ADMIN_PASSWORD. Invite flow will handle first admin.")
-    finally:
-        db.close()
+# Optional: serve the built frontend too. Mounted last so every API route above matches first.
+if settings.FRONTEND_DIST_DIR:
+    app.mount("/", FrontendStaticFiles(directory=settings.FRONTEND_DIST_DIR), name="frontend")
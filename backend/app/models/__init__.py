@@ -16,3 +16,5 @@ from app.Domains.turnarounds.cost_models import (  # noqa: F401
     RequisitionToOrder,
     RtoSelectedItem,
 )
+from app.Domains.turnarounds.models import WorkPackage, WorkPackageDependency  # noqa: F401
+from .job import Job  # noqa: F401
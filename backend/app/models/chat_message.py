@@ -1,14 +1,19 @@
-from sqlalchemy import Column, Integer, String, DateTime, JSON, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, JSON, ForeignKey, Index
 from sqlalchemy.sql import func
 from app.models import Base
 
 class ChatMessage(Base):
     __tablename__ = "chat_messages"
 
-    id = Column(Integer, primary_key=True, index=True)
-    session_id = Column(Integer, ForeignKey("chat_sessions.id", ondelete="CASCADE"), index=True, nullable=False)
+    id = Column(Integer, primary_key=True)
+    session_id = Column(Integer, ForeignKey("chat_sessions.id", ondelete="CASCADE"), nullable=False)
     role = Column(String, nullable=False)  # "user" | "assistant" | "system"
     content_json = Column(JSON, nullable=True)  # assistant structured JSON
     content_text = Column(String, nullable=True)  # fallback/raw text
     usage_json = Column(JSON, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        # A session's messages in order (also serves lookups and deletes by session)
+        Index("ix_chat_messages_session_created", "session_id", "created_at"),
+    )
@@ -1,15 +1,20 @@
-from sqlalchemy import Column, Integer, String, DateTime, JSON
+from sqlalchemy import Column, Integer, String, DateTime, JSON, Index
 from sqlalchemy.sql import func
 from app.models import Base
 
 class ChatSession(Base):
     __tablename__ = "chat_sessions"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     domain_id = Column(String, index=True, nullable=False)
-    user_id = Column(Integer, index=True, nullable=True)  # hook into your auth/user model
+    user_id = Column(Integer, nullable=True)  # hook into your auth/user model
     title = Column(String, nullable=True)
     meta_json = Column(JSON, nullable=True)
     tags = Column(JSON, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    __table_args__ = (
+        # A user's sessions in a domain, newest first (also serves user-only lookups)
+        Index("ix_chat_sessions_user_domain_created", "user_id", "domain_id", "created_at"),
+    )
@@ -0,0 +1,65 @@
+# Background jobs: one row per unit of work, claimed and run by the in-process worker (app.services.jobs)
+from __future__ import annotations
+
+from datetime import datetime
+from enum import Enum
+from typing import Any, Optional
+
+from sqlalchemy import JSON, Boolean, DateTime, Enum as SAEnum, Float, Index, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models import Base
+
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+FINISHED_STATUSES = (JobStatus.SUCCEEDED, JobStatus.FAILED, JobStatus.CANCELLED)
+
+
+class Job(Base):
+    __tablename__ = "jobs"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    kind: Mapped[str] = mapped_column(String(64), nullable=False)
+    payload_json: Mapped[Optional[dict[str, Any]]] = mapped_column(JSON, nullable=True)
+    status: Mapped[JobStatus] = mapped_column(
+        SAEnum(JobStatus, name="job_status_enum", native_enum=False),
+        default=JobStatus.QUEUED,
+        nullable=False,
+    )
+    # Higher runs first; equal priorities run in run_at order
+    priority: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    # Not claimed before this time: set at enqueue and pushed back by retry backoff
+    run_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    max_attempts: Mapped[int] = mapped_column(Integer, default=3, nullable=False)
+
+    # Lease: the worker holding the job and until when; an expired lease means that worker died
+    locked_by: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    locked_until: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    cancel_requested: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+
+    progress: Mapped[float] = mapped_column(Float, default=0.0, nullable=False)
+    progress_message: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    result_json: Mapped[Optional[dict[str, Any]]] = mapped_column(JSON, nullable=True)
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    created_by: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
+    started_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        # The claim query: next queued job by priority, then run_at
+        Index("ix_jobs_claim", "status", "priority", "run_at"),
+        # The lease reaper: running jobs whose lease has expired
+        Index("ix_jobs_status_locked_until", "status", "locked_until"),
+        Index("ix_jobs_kind_created_at", "kind", "created_at"),
+    )
@@ -0,0 +1,35 @@
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from app.models.job import JobStatus
+
+
+class JobCreate(BaseModel):
+    kind: str
+    payload: Dict[str, Any] = Field(default_factory=dict)
+    # Higher runs first
+    priority: int = Field(0, ge=-100, le=100)
+    max_attempts: Optional[int] = Field(None, ge=1, le=10)
+
+
+class JobRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    kind: str
+    status: JobStatus
+    priority: int
+    payload: Optional[Dict[str, Any]] = Field(None, validation_alias="payload_json")
+    attempts: int
+    max_attempts: int
+    progress: float
+    progress_message: Optional[str] = None
+    cancel_requested: bool
+    result: Optional[Any] = Field(None, validation_alias="result_json")
+    error: Optional[str] = None
+    run_at: datetime
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
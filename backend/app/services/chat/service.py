@@ -1,7 +1,12 @@
 from typing import Any, Dict, List, Optional
-from sqlalchemy.orm import Session
+
+import orjson
+from sqlalchemy import Text, case, cast, delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql import exists
 
+from app.core.tracing import traced
+from app.db.routing import read_only
 from app.models.chat_session import ChatSession
 from app.models.chat_message import ChatMessage
 
@@ -24,7 +29,14 @@ DEFAULT_POLICY: Dict[str, Any] = {
     "style": "concise",
 }
 
+def _needs_derived_title(title: Optional[str]) -> bool:
+    # Sessions created without a real title get one from their first message
+    title = (title or "").strip()
+    return not title or title.lower() in {"chat", "my first chat"}
+
+
 class ChatService:
+    @traced()
     def get_config(self, domain_id: str) -> ChatConfig:
         # Per-domain overrides could be loaded from DB or config
         return ChatConfig(
@@ -34,37 +46,27 @@ class ChatService:
             response_schema_version="v1",
         )
 
-    def list_sessions(self, db: Session, user_id: Optional[int], domain_id: Optional[str]) -> List[ChatSessionOut]:
-        q = db.query(ChatSession)
+    @traced()
+    @read_only
+    async def list_sessions(self, db: AsyncSession, user_id: Optional[int], domain_id: Optional[str]) -> List[ChatSessionOut]:
+        q = select(ChatSession)
         if user_id is not None:
-            q = q.filter(ChatSession.user_id == user_id)
+            q = q.where(ChatSession.user_id == user_id)
         if domain_id:
-            q = q.filter(ChatSession.domain_id == domain_id)
+            q = q.where(ChatSession.domain_id == domain_id)
         # Exclude sessions with zero messages (avoid placeholder/dummy sessions)
-        q = q.filter(exists().where(ChatMessage.session_id == ChatSession.id))
-        rows = q.order_by(ChatSession.created_at.desc()).limit(50).all()
+        q = q.where(exists().where(ChatMessage.session_id == ChatSession.id))
+        rows = (await db.scalars(q.order_by(ChatSession.created_at.desc()).limit(50))).all()
+        untitled = [r.id for r in rows if _needs_derived_title(r.title)]
+        first_messages = await self._first_messages(db, untitled) if untitled else {}
         out: List[ChatSessionOut] = []
         for r in rows:
             title = (r.title or "").strip()
-            if not title or title.lower() in {"chat", "my first chat"}:
-                # derive from first user message, else first assistant
-                first_user = (
-                    db.query(ChatMessage)
-                    .filter(ChatMessage.session_id == r.id, ChatMessage.role == "user")
-                    .order_by(ChatMessage.created_at.asc())
-                    .first()
-                )
-                first_any = first_user or (
-                    db.query(ChatMessage)
-                    .filter(ChatMessage.session_id == r.id)
-                    .order_by(ChatMessage.created_at.asc())
-                    .first()
+            if r.id in first_messages:
+                first_any = first_messages[r.id]
+                candidate = first_any.content_text or (
+                    (first_any.content_json or {}).get("summary") if isinstance(first_any.content_json, dict) else None
                 )
-                candidate = None
-                if first_any is not None:
-                    candidate = first_any.content_text or (
-                        (first_any.content_json or {}).get("summary") if isinstance(first_any.content_json, dict) else None
-                    )
                 if candidate:
                     words = " ".join([w.strip("\t\n\r ,.;:!?") for w in str(candidate).split()[:5] if w])
                     title = words[:80].strip().capitalize() if words else ""
@@ -79,9 +81,26 @@ class ChatService:
             )
         return out
 
-    def create_session(
+    async def _first_messages(self, db: AsyncSession, session_ids: List[int]) -> Dict[int, ChatMessage]:
+        """First user message of each session, or its first message of any role if it has none, in one query."""
+        rank = func.row_number().over(
+            partition_by=ChatMessage.session_id,
+            order_by=(
+                case((ChatMessage.role == "user", 0), else_=1),
+                ChatMessage.created_at.asc(),
+                ChatMessage.id.asc(),
+            ),
+        ).label("rank")
+        ranked = select(ChatMessage.id, rank).where(ChatMessage.session_id.in_(session_ids)).subquery()
+        firsts = await db.scalars(
+            select(ChatMessage).join(ranked, ranked.c.id == ChatMessage.id).where(ranked.c.rank == 1)
+        )
+        return {m.session_id: m for m in firsts.all()}
+
+    @traced()
+    async def create_session(
         self,
-        db: Session,
+        db: AsyncSession,
         user_id: Optional[int],
         domain_id: str,
         title: Optional[str],
@@ -96,8 +115,8 @@ class ChatService:
             tags=tags or [],
         )
         db.add(s)
-        db.commit()
-        db.refresh(s)
+        await db.commit()
+        await db.refresh(s)
         return ChatSessionOut(
             id=s.id,
             domain_id=s.domain_id,
@@ -106,47 +125,57 @@ class ChatService:
             tags=s.tags or [],
         )
 
-    def list_messages(self, db: Session, session_id: int) -> List[ChatMessageOut]:
-        rows = (
-            db.query(ChatMessage)
-            .filter(ChatMessage.session_id == session_id)
+    @traced()
+    @read_only
+    async def list_messages(self, db: AsyncSession, session_id: int) -> List[Dict[str, Any]]:
+        """The session's messages as JSON-ready dicts in the ChatMessageOut shape, oldest first.
+
+        content_json is selected as its stored JSON text and passed through as an
+        orjson Fragment, so large assistant payloads are never parsed into Python
+        objects only to be encoded again.
+        """
+        rows = await db.execute(
+            select(ChatMessage.id, ChatMessage.role, cast(ChatMessage.content_json, Text), ChatMessage.content_text)
+            .where(ChatMessage.session_id == session_id)
             .order_by(ChatMessage.created_at.asc())
-            .all()
         )
         return [
-            ChatMessageOut(
-                id=r.id,
-                role=r.role,  # type: ignore
-                content_json=r.content_json,
-                content_text=r.content_text,
-            )
-            for r in rows
+            {
+                "id": id_,
+                "role": role,
+                "content_json": orjson.Fragment(content_json) if content_json is not None else None,
+                "content_text": content_text,
+            }
+            for id_, role, content_json, content_text in rows
         ]
 
-    def append_user_message(self, db: Session, session_id: int, content: str) -> ChatMessageOut:
+    @traced()
+    async def append_user_message(self, db: AsyncSession, session_id: int, content: str) -> ChatMessageOut:
         m = ChatMessage(session_id=session_id, role="user", content_text=content)
         db.add(m)
-        db.commit()
-        db.refresh(m)
+        await db.commit()
+        await db.refresh(m)
         return ChatMessageOut(id=m.id, role="user", content_text=m.content_text)
 
-    def append_assistant_message(self, db: Session, session_id: int, payload: ChatAssistantMessage) -> ChatMessageOut:
+    @traced()
+    async def append_assistant_message(self, db: AsyncSession, session_id: int, payload: ChatAssistantMessage) -> ChatMessageOut:
         m = ChatMessage(session_id=session_id, role="assistant", content_json=payload.model_dump())
         db.add(m)
-        db.commit()
-        db.refresh(m)
+        await db.commit()
+        await db.refresh(m)
         return ChatMessageOut(id=m.id, role="assistant", content_json=m.content_json)
 
-    def delete_session(self, db: Session, user_id: Optional[int], session_id: int) -> None:
+    @traced()
+    async def delete_session(self, db: AsyncSession, user_id: Optional[int], session_id: int) -> None:
         # Verify the session exists and belongs to the user (if user_id provided)
-        s = db.query(ChatSession).filter(ChatSession.id == session_id).first()
+        s = await db.get(ChatSession, session_id)
         if not s:
             raise ValueError("not_found")
         # Allow deletion if the session has no owner (legacy/unowned). Enforce ownership otherwise.
         if user_id is not None and s.user_id is not None and s.user_id != user_id:
             raise PermissionError("forbidden")
         # Delete child messages first to be safe across DBs
-        db.query(ChatMessage).filter(ChatMessage.session_id == session_id).delete()
+        await db.execute(delete(ChatMessage).where(ChatMessage.session_id == session_id))
         # Then delete the session
-        db.delete(s)
-        db.commit()
+        await db.delete(s)
+        await db.commit()
@@ -0,0 +1,2 @@
+# Background jobs. Importing the package registers the built-in kinds, in worker processes too.
+from app.services.jobs import handlers  # noqa: F401
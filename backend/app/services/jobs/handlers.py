@@ -0,0 +1,108 @@
+# Built-in job kinds: cost export to a file, RTO subtotal verification, S-curve forecasts and job retention
+from __future__ import annotations
+
+import os
+import tempfile
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Iterator, Optional, Sequence
+
+from sqlalchemy import func, select
+from sqlalchemy.engine import Row
+
+from app.core.config import settings
+from app.db.database import ReadSessionLocal, SessionLocal
+import app.models  # noqa: F401  (registers every model before the domain modules import them)
+from app.Domains.turnarounds.analytics import SpendProfile, compute_s_curves, load_arrays
+from app.Domains.turnarounds.cost_export import EXPORT_BATCH_SIZE, check_export_format, iter_export_batches, stream_csv, stream_parquet
+from app.Domains.turnarounds.cost_models import WorkPackageCost
+from app.Domains.turnarounds.cost_service import verify_rto_subtotals
+from app.Domains.turnarounds.models import Discipline, WorkPackageStatus
+from app.services.jobs.queue import JobContext, job_handler, purge_finished
+
+MEDIA_TYPES = {"csv": "text/csv", "parquet": "application/vnd.apache.parquet"}
+
+
+def output_dir() -> Path:
+    path = Path(settings.JOBS_OUTPUT_DIR or Path(tempfile.gettempdir()) / "app-jobs")
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+@job_handler("cost_export")
+def export_costs(ctx: JobContext, payload: dict[str, Any]) -> dict[str, Any]:
+    """The /cost/export download, written to a file under JOBS_OUTPUT_DIR; the result names it for /jobs/{id}/download."""
+    fmt = payload.get("format", "csv")
+    batch_size = int(payload.get("batch_size", EXPORT_BATCH_SIZE))
+    check_export_format(fmt)
+    path = output_dir() / f"job-{ctx.job_id}-turnaround-costs.{fmt}"
+    partial = path.with_suffix(path.suffix + ".partial")
+    rows = 0
+    # Only reads: the read pool
+    with ReadSessionLocal() as db:
+        total = db.scalar(select(func.count()).select_from(WorkPackageCost)) or 0
+
+        def counted(batches: Iterator[Sequence[Row]]) -> Iterator[Sequence[Row]]:
+            nonlocal rows
+            for batch in batches:
+                yield batch
+                rows += len(batch)
+                ctx.progress(rows / total if total else 1.0, f"{rows} of {total} rows")
+
+        batches = counted(iter_export_batches(db, batch_size))
+        try:
+            with open(partial, "wb") as out:
+                for chunk in stream_csv(batches) if fmt == "csv" else stream_parquet(batches):
+                    out.write(chunk)
+        except BaseException:
+            partial.unlink(missing_ok=True)
+            raise
+    os.replace(partial, path)
+    return {"file": str(path), "media_type": MEDIA_TYPES[fmt], "filename": f"turnaround-costs.{fmt}", "rows": rows, "bytes": path.stat().st_size}
+
+
+@job_handler("rto_subtotals", admin_only=True)
+def check_rto_subtotals(ctx: JobContext, payload: dict[str, Any]) -> dict[str, Any]:
+    """scripts/verify_rto_subtotals.py as a job: report RTOs whose stored subtotal drifted, fixing them with {"fix": true}."""
+    fix = bool(payload.get("fix", False))
+    with SessionLocal() as db:
+        drift = verify_rto_subtotals(db, fix=fix)
+    return {
+        "fixed": fix,
+        "drift_count": len(drift),
+        "drift": [{"rto_id": d.rto_id, "stored": str(d.stored), "computed": str(d.computed)} for d in drift[:100]],
+    }
+
+
+def _optional_date(value: Optional[str]) -> Optional[date]:
+    return date.fromisoformat(value) if value else None
+
+
+@job_handler("s_curves", executor="process")
+def forecast_s_curves(ctx: JobContext, payload: dict[str, Any]) -> dict[str, Any]:
+    """The /analytics/s-curves computation for a payload of the same filters, run in a worker process."""
+    disciplines = [Discipline(d) for d in payload.get("discipline") or ()]
+    statuses = [WorkPackageStatus(s) for s in payload.get("status") or ()]
+    profile = SpendProfile(payload.get("profile", SpendProfile.UNIFORM.value))
+    with ReadSessionLocal() as db:
+        arrays = load_arrays(db)
+    ctx.progress(0.5, "Loaded work packages")
+    curves = compute_s_curves(
+        arrays, disciplines, statuses, _optional_date(payload.get("date_from")), _optional_date(payload.get("date_to")), profile
+    )
+    return curves.model_dump(mode="json")
+
+
+@job_handler("jobs_retention", max_attempts=1, admin_only=True)
+def purge_old_jobs(ctx: JobContext, payload: dict[str, Any]) -> dict[str, Any]:
+    """Delete jobs finished more than `days` (default JOBS_RETENTION_DAYS) ago, and the files they produced."""
+    days = int(payload.get("days", settings.JOBS_RETENTION_DAYS))
+    if days < 0:
+        raise ValueError("days must not be negative")
+    results = purge_finished(datetime.utcnow() - timedelta(days=days))
+    files = 0
+    for result in results:
+        if result and result.get("file"):
+            Path(result["file"]).unlink(missing_ok=True)
+            files += 1
+    return {"deleted_jobs": len(results), "deleted_files": files}
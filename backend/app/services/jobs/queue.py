@@ -0,0 +1,352 @@
+# Job queue on the jobs table: handler registry, enqueue, atomic claim, leases, progress and outcomes
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Literal, Optional, Sequence
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.database import engine, read_engine
+from app.models.job import FINISHED_STATUSES, Job, JobStatus
+
+Executor = Literal["thread", "process"]
+Handler = Callable[["JobContext", dict[str, Any]], Any]
+
+MAX_LIST_LIMIT = 200
+
+
+@dataclass(frozen=True)
+class JobHandler:
+    kind: str
+    fn: Handler
+    executor: Executor
+    max_attempts: int
+    admin_only: bool
+
+
+HANDLERS: dict[str, JobHandler] = {}
+
+
+def job_handler(
+    kind: str, executor: Executor = "thread", max_attempts: int = 3, admin_only: bool = False
+) -> Callable[[Handler], Handler]:
+    """Register `fn(ctx, payload) -> result` as the handler for jobs of `kind`.
+
+    Use executor="process" for CPU-bound work; such handlers run in a spawned
+    process, so they must be module-level functions and take and return plain
+    JSON-compatible values. ValueError and LookupError mean the payload can
+    never succeed and fail the job at once; any other exception is retried.
+    Kinds that change other users' data are admin_only: the API refuses to
+    enqueue them for anyone else.
+    """
+
+    def register(fn: Handler) -> Handler:
+        if kind in HANDLERS:
+            raise ValueError(f"Job kind '{kind}' is already registered")
+        HANDLERS[kind] = JobHandler(kind, fn, executor, max_attempts, admin_only)
+        return fn
+
+    return register
+
+
+class JobCancelled(Exception):
+    """Raised in a handler by JobContext.progress once its job is cancelled or its lease is lost."""
+
+
+@dataclass(frozen=True)
+class ClaimedJob:
+    id: int
+    kind: str
+    payload: dict[str, Any]
+    attempt: int
+    max_attempts: int
+
+
+def _lease(now: datetime) -> datetime:
+    return now + timedelta(seconds=settings.JOBS_LEASE_SECONDS)
+
+
+def retry_delay(attempt: int) -> float:
+    return min(settings.JOBS_RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1), settings.JOBS_RETRY_BACKOFF_MAX_SECONDS)
+
+
+# ---------- API side ----------
+def enqueue(
+    db: Session,
+    kind: str,
+    payload: Optional[dict[str, Any]] = None,
+    priority: int = 0,
+    max_attempts: Optional[int] = None,
+    run_at: Optional[datetime] = None,
+    created_by: Optional[int] = None,
+) -> Job:
+    handler = HANDLERS.get(kind)
+    if handler is None:
+        raise ValueError(f"Unknown job kind '{kind}'; expected one of {', '.join(sorted(HANDLERS))}")
+    job = Job(
+        kind=kind,
+        payload_json=payload or {},
+        priority=priority,
+        max_attempts=max_attempts or handler.max_attempts,
+        run_at=run_at or datetime.utcnow(),
+        created_by=created_by,
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def get_job(db: Session, job_id: int) -> Job:
+    job = db.get(Job, job_id)
+    if job is None:
+        raise LookupError(f"Job {job_id} not found")
+    return job
+
+
+def list_jobs(
+    db: Session,
+    status: Optional[JobStatus] = None,
+    kind: Optional[str] = None,
+    created_by: Optional[int] = None,
+    limit: int = 50,
+    before_id: Optional[int] = None,
+) -> list[Job]:
+    """Newest first; page backwards with the last id as `before_id`."""
+    query = select(Job).order_by(Job.id.desc()).limit(min(limit, MAX_LIST_LIMIT))
+    if status is not None:
+        query = query.where(Job.status == status)
+    if kind is not None:
+        query = query.where(Job.kind == kind)
+    if created_by is not None:
+        query = query.where(Job.created_by == created_by)
+    if before_id is not None:
+        query = query.where(Job.id < before_id)
+    return list(db.scalars(query))
+
+
+def request_cancel(db: Session, job_id: int) -> Job:
+    """Cancel a queued job now; ask a running one to stop at its next progress report."""
+    now = datetime.utcnow()
+    by_id = (Job.id == job_id,)
+    cancelled = db.execute(
+        update(Job).where(*by_id, Job.status == JobStatus.QUEUED).values(status=JobStatus.CANCELLED, finished_at=now, updated_at=now),
+        execution_options={"synchronize_session": False},
+    ).rowcount
+    if not cancelled:
+        db.execute(
+            update(Job).where(*by_id, Job.status == JobStatus.RUNNING).values(cancel_requested=True, updated_at=now),
+            execution_options={"synchronize_session": False},
+        )
+    db.commit()
+    job = get_job(db, job_id)
+    db.refresh(job)
+    if job.status in FINISHED_STATUSES and job.status != JobStatus.CANCELLED:
+        raise ValueError(f"Job {job_id} has already finished ({job.status.value})")
+    return job
+
+
+def queue_stats() -> dict[str, Any]:
+    """Jobs per status and the age of the oldest job waiting to run."""
+    now = datetime.utcnow()
+    with engine.connect() as connection:
+        counts = dict(connection.execute(select(Job.status, func.count()).group_by(Job.status)).all())
+        oldest = connection.scalar(select(func.min(Job.run_at)).where(Job.status == JobStatus.QUEUED, Job.run_at <= now))
+    return {
+        "counts": {status.value: counts.get(status, 0) for status in JobStatus},
+        "oldest_queued_seconds": round((now - oldest).total_seconds(), 1) if oldest else None,
+    }
+
+
+# ---------- Worker side ----------
+def has_due_job(kinds: Sequence[str]) -> bool:
+    """Whether a job of one of `kinds` is waiting to run; a read, so idle polls stay off the writer."""
+    due = select(Job.id).where(Job.status == JobStatus.QUEUED, Job.run_at <= datetime.utcnow(), Job.kind.in_(kinds)).limit(1)
+    with read_engine.connect() as connection:
+        return connection.scalar(due) is not None
+
+
+def claim(worker_id: str, kinds: Sequence[str]) -> Optional[ClaimedJob]:
+    """Take the next due job of one of `kinds` and lease it to `worker_id`, or return None.
+
+    One statement picks and updates the row, so two workers can never claim the
+    same job: on Postgres the subquery's FOR UPDATE SKIP LOCKED makes a second
+    worker pass over a row being claimed instead of waiting for it; SQLite runs
+    one write transaction at a time and drops the locking clause.
+    """
+    now = datetime.utcnow()
+    next_job = (
+        select(Job.id)
+        .where(Job.status == JobStatus.QUEUED, Job.run_at <= now, Job.kind.in_(kinds))
+        .order_by(Job.priority.desc(), Job.run_at, Job.id)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    statement = (
+        update(Job)
+        .where(Job.id == next_job, Job.status == JobStatus.QUEUED)
+        .values(
+            status=JobStatus.RUNNING,
+            attempts=Job.attempts + 1,
+            locked_by=worker_id,
+            locked_until=_lease(now),
+            started_at=now,
+            updated_at=now,
+        )
+        .returning(Job.id, Job.kind, Job.payload_json, Job.attempts, Job.max_attempts)
+    )
+    with engine.begin() as connection:
+        row = connection.execute(statement).first()
+    if row is None:
+        return None
+    return ClaimedJob(id=row.id, kind=row.kind, payload=row.payload_json or {}, attempt=row.attempts, max_attempts=row.max_attempts)
+
+
+def _held(job_id: int, worker_id: str) -> tuple:
+    # Outcome writes only land while the lease is still ours: once the reaper has handed
+    # the job to another worker, this worker's late result is dropped
+    return (Job.id == job_id, Job.locked_by == worker_id, Job.status == JobStatus.RUNNING)
+
+
+def _released(now: datetime, **values: Any) -> dict[str, Any]:
+    return {"locked_by": None, "locked_until": None, "updated_at": now, **values}
+
+
+def renew_leases(worker_id: str, job_ids: Sequence[int]) -> None:
+    if not job_ids:
+        return
+    now = datetime.utcnow()
+    with engine.begin() as connection:
+        connection.execute(
+            update(Job)
+            .where(Job.id.in_(job_ids), Job.locked_by == worker_id, Job.status == JobStatus.RUNNING)
+            .values(locked_until=_lease(now))
+        )
+
+
+def report_progress(job_id: int, worker_id: str, fraction: float, message: Optional[str]) -> Optional[bool]:
+    """Store progress and renew the lease; returns whether cancellation was requested, None if the lease is lost."""
+    now = datetime.utcnow()
+    with engine.begin() as connection:
+        row = connection.execute(
+            update(Job)
+            .where(*_held(job_id, worker_id))
+            .values(progress=fraction, progress_message=message, locked_until=_lease(now), updated_at=now)
+            .returning(Job.cancel_requested)
+        ).first()
+    return None if row is None else row.cancel_requested
+
+
+def complete(job: ClaimedJob, worker_id: str, result: Any) -> bool:
+    now = datetime.utcnow()
+    with engine.begin() as connection:
+        return bool(
+            connection.execute(
+                update(Job)
+                .where(*_held(job.id, worker_id))
+                .values(**_released(now, status=JobStatus.SUCCEEDED, result_json=result, progress=1.0, error=None, finished_at=now))
+            ).rowcount
+        )
+
+
+def mark_cancelled(job: ClaimedJob, worker_id: str) -> bool:
+    now = datetime.utcnow()
+    with engine.begin() as connection:
+        return bool(
+            connection.execute(
+                update(Job).where(*_held(job.id, worker_id)).values(**_released(now, status=JobStatus.CANCELLED, finished_at=now))
+            ).rowcount
+        )
+
+
+def fail(job: ClaimedJob, worker_id: str, error: str, retry: bool = True) -> Optional[JobStatus]:
+    """Requeue the job after a backoff while it has attempts left, otherwise mark it failed.
+
+    Returns the job's new status, or None when the lease was no longer ours.
+    """
+    now = datetime.utcnow()
+    if retry and job.attempt < job.max_attempts:
+        status = JobStatus.QUEUED
+        values = _released(now, status=status, error=error, run_at=now + timedelta(seconds=retry_delay(job.attempt)))
+    else:
+        status = JobStatus.FAILED
+        values = _released(now, status=status, error=error, finished_at=now)
+    with engine.begin() as connection:
+        updated = connection.execute(update(Job).where(*_held(job.id, worker_id)).values(**values)).rowcount
+    return status if updated else None
+
+
+def release(worker_id: str, job_ids: Sequence[int]) -> int:
+    """Hand unfinished jobs back to the queue at shutdown, without counting the interrupted attempt."""
+    if not job_ids:
+        return 0
+    now = datetime.utcnow()
+    with engine.begin() as connection:
+        return connection.execute(
+            update(Job)
+            .where(Job.id.in_(job_ids), Job.locked_by == worker_id, Job.status == JobStatus.RUNNING)
+            .values(**_released(now, status=JobStatus.QUEUED, attempts=Job.attempts - 1, run_at=now))
+        ).rowcount
+
+
+def requeue_expired() -> tuple[int, int]:
+    """Recover jobs whose worker stopped renewing its lease: retry them, or fail them when out of attempts.
+
+    Returns (requeued, failed).
+    """
+    now = datetime.utcnow()
+    expired = (Job.status == JobStatus.RUNNING, Job.locked_until < now)
+    error = "Lease expired: the worker running this job stopped responding"
+    with engine.begin() as connection:
+        failed = connection.execute(
+            update(Job)
+            .where(*expired, Job.attempts >= Job.max_attempts)
+            .values(**_released(now, status=JobStatus.FAILED, error=error, finished_at=now))
+        ).rowcount
+        requeued = connection.execute(
+            update(Job).where(*expired).values(**_released(now, status=JobStatus.QUEUED, error=error, run_at=now))
+        ).rowcount
+    return requeued, failed
+
+
+def purge_finished(older_than: datetime) -> list[Optional[dict[str, Any]]]:
+    """Delete finished jobs last updated before `older_than`; returns their results."""
+    finished = (Job.status.in_(FINISHED_STATUSES), Job.updated_at < older_than)
+    with engine.begin() as connection:
+        results = list(connection.scalars(select(Job.result_json).where(*finished)))
+        connection.execute(delete(Job).where(*finished))
+    return results
+
+
+class JobContext:
+    """Passed to every handler with its payload: the job id and attempt number, and progress reporting.
+
+    progress() writes at most once per JOBS_PROGRESS_INTERVAL_SECONDS (and
+    always at 1.0), renewing the job's lease each time, and raises JobCancelled
+    when the job has been cancelled. Long handlers should call it between units
+    of work and outside open write transactions: on SQLite the write waits for
+    the file's one writer, which an open write transaction in the same thread holds.
+    """
+
+    def __init__(self, job_id: int, attempt: int, worker_id: str) -> None:
+        self.job_id = job_id
+        self.attempt = attempt
+        self.worker_id = worker_id
+        self._last_write = 0.0
+
+    def progress(self, fraction: float, message: Optional[str] = None) -> None:
+        fraction = min(max(fraction, 0.0), 1.0)
+        now = time.monotonic()
+        if fraction < 1.0 and now - self._last_write < settings.JOBS_PROGRESS_INTERVAL_SECONDS:
+            return
+        self._last_write = now
+        cancel_requested = report_progress(self.job_id, self.worker_id, fraction, message)
+        if cancel_requested is None:
+            raise JobCancelled(f"Job {self.job_id} is no longer leased to this worker")
+        if cancel_requested:
+            raise JobCancelled(f"Job {self.job_id} was cancelled")
@@ -0,0 +1,208 @@
+# In-process job worker: a dispatcher thread claims due jobs and runs them on a thread pool (I/O-bound kinds)
+# or a spawned process pool (CPU-bound kinds), renews their leases and records each outcome
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import Executor as PoolExecutor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from app.core.config import settings
+from app.core.metrics import JOB_DURATION, JOBS_FINISHED
+from app.models.job import JobStatus
+from app.services.jobs.queue import (
+    HANDLERS,
+    ClaimedJob,
+    Executor,
+    Handler,
+    JobCancelled,
+    JobContext,
+    claim,
+    complete,
+    has_due_job,
+    fail,
+    mark_cancelled,
+    release,
+    renew_leases,
+    requeue_expired,
+)
+
+logger = logging.getLogger(__name__)
+
+# Payload problems: retrying cannot help (the services' convention for bad input)
+PERMANENT_ERRORS = (ValueError, LookupError)
+
+
+def run_job(fn: Handler, job: ClaimedJob, worker_id: str) -> Any:
+    # Module-level so the process pool can pickle it; in a spawned process the imports above
+    # build that process's own engines, which JobContext uses for progress
+    return fn(JobContext(job.id, job.attempt, worker_id), dict(job.payload))
+
+
+@dataclass
+class _Running:
+    job: ClaimedJob
+    executor: Executor
+    started: float
+
+
+class JobWorker:
+    """Claims jobs for the kinds registered in this process and runs them.
+
+    Several workers (one per API process, or standalone) can share the jobs
+    table: claims are atomic, and each worker only touches jobs it holds a
+    lease on. The dispatcher sleeps for JOBS_POLL_INTERVAL_SECONDS between
+    polls; wake() cuts that short after an enqueue in this process.
+    """
+
+    def __init__(self, threads: Optional[int] = None, processes: Optional[int] = None) -> None:
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.limits: dict[Executor, int] = {
+            "thread": settings.JOBS_THREAD_WORKERS if threads is None else threads,
+            "process": settings.JOBS_PROCESS_WORKERS if processes is None else processes,
+        }
+        self._pools: dict[Executor, PoolExecutor] = {}
+        self._running: dict[Future, _Running] = {}
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # ---------- lifecycle ----------
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stopping.clear()
+        if self.limits["thread"] > 0:
+            self._pools["thread"] = ThreadPoolExecutor(self.limits["thread"], thread_name_prefix="job")
+        if self.limits["process"] > 0:
+            self._pools["process"] = self._process_pool()
+        self._thread = threading.Thread(target=self._run, name="job-dispatcher", daemon=True)
+        self._thread.start()
+        logger.info("Job worker %s started", self.worker_id, extra={"limits": self.limits})
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop claiming, give running jobs JOBS_SHUTDOWN_GRACE_SECONDS, then hand the rest back to the queue."""
+        if self._thread is None:
+            return
+        self._stopping.set()
+        self._wake.set()
+        grace = settings.JOBS_SHUTDOWN_GRACE_SECONDS
+        self._thread.join(timeout if timeout is not None else grace + 5)
+        self._thread = None
+        for pool in self._pools.values():
+            pool.shutdown(wait=False, cancel_futures=True)
+        self._pools.clear()
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    def stats(self) -> dict[str, Any]:
+        running = list(self._running.values())
+        return {
+            "worker_id": self.worker_id,
+            "alive": self._thread is not None and self._thread.is_alive(),
+            "limits": self.limits,
+            "running": {executor: sum(r.executor == executor for r in running) for executor in self.limits},
+        }
+
+    # ---------- dispatcher ----------
+    def _process_pool(self) -> ProcessPoolExecutor:
+        # spawn, not fork: a forked child would inherit this process's pooled connections and threads
+        return ProcessPoolExecutor(self.limits["process"], mp_context=multiprocessing.get_context("spawn"))
+
+    def _run(self) -> None:
+        lease = settings.JOBS_LEASE_SECONDS
+        next_reap = next_renewal = 0.0
+        deadline: Optional[float] = None
+        while True:
+            self._wake.clear()
+            self._guarded("record outcomes", self._record_finished)
+            now = time.monotonic()
+            if self._stopping.is_set():
+                deadline = deadline or now + settings.JOBS_SHUTDOWN_GRACE_SECONDS
+                if not self._running or now >= deadline:
+                    break
+            else:
+                if now >= next_reap:
+                    next_reap = now + lease / 2
+                    self._guarded("requeue expired jobs", self._reap)
+                self._guarded("claim jobs", self._fill)
+            if self._running and now >= next_renewal:
+                next_renewal = now + lease / 3
+                self._guarded("renew leases", lambda: renew_leases(self.worker_id, self._running_ids()))
+            self._wake.wait(settings.JOBS_POLL_INTERVAL_SECONDS if not self._stopping.is_set() else 0.1)
+        leftover = self._running_ids()
+        if leftover:
+            self._guarded("release jobs", lambda: release(self.worker_id, leftover))
+            logger.warning("Job worker stopped with %d jobs running; they were returned to the queue", len(leftover))
+        self._running.clear()
+
+    def _guarded(self, what: str, fn) -> None:
+        # The dispatcher must outlive a database outage; the next loop tries again
+        try:
+            fn()
+        except Exception:
+            logger.exception("Job worker failed to %s", what)
+
+    def _running_ids(self) -> list[int]:
+        return [r.job.id for r in self._running.values()]
+
+    def _reap(self) -> None:
+        requeued, failed = requeue_expired()
+        if requeued or failed:
+            logger.warning("Recovered jobs with expired leases", extra={"requeued": requeued, "failed": failed})
+
+    def _fill(self) -> None:
+        for executor in list(self._pools):
+            kinds = [kind for kind, handler in HANDLERS.items() if handler.executor == executor]
+            # claim() is a write; checking with a read first keeps idle polls off SQLite's single writer
+            if not kinds or not has_due_job(kinds):
+                continue
+            while sum(r.executor == executor for r in self._running.values()) < self.limits[executor]:
+                job = claim(self.worker_id, kinds)
+                if job is None:
+                    break
+                self._submit(executor, job)
+
+    def _submit(self, executor: Executor, job: ClaimedJob) -> None:
+        try:
+            future = self._pools[executor].submit(run_job, HANDLERS[job.kind].fn, job, self.worker_id)
+        except BrokenProcessPool:
+            # A child died (killed, out of memory) and took the pool with it; start a fresh one
+            pool = self._pools[executor] = self._process_pool()
+            future = pool.submit(run_job, HANDLERS[job.kind].fn, job, self.worker_id)
+        self._running[future] = _Running(job, executor, time.monotonic())
+        future.add_done_callback(lambda _: self._wake.set())
+
+    def _record_finished(self) -> None:
+        for future in [f for f in self._running if f.done()]:
+            running = self._running.pop(future)
+            JOB_DURATION.observe(time.monotonic() - running.started, (running.job.kind,))
+            JOBS_FINISHED.inc((running.job.kind, self._record(future, running.job)))
+
+    def _record(self, future: Future, job: ClaimedJob) -> str:
+        extra = {"job_id": job.id, "kind": job.kind, "attempt": job.attempt}
+        try:
+            result = future.result()
+        except JobCancelled:
+            mark_cancelled(job, self.worker_id)
+            logger.info("Job %d (%s) cancelled", job.id, job.kind, extra=extra)
+            return "cancelled"
+        except Exception as exc:
+            status = fail(job, self.worker_id, f"{type(exc).__name__}: {exc}", retry=not isinstance(exc, PERMANENT_ERRORS))
+            outcome = "retrying" if status is JobStatus.QUEUED else "failed"
+            logger.warning("Job %d (%s) attempt %d failed", job.id, job.kind, job.attempt, exc_info=exc, extra={**extra, "outcome": outcome})
+            return outcome
+        complete(job, self.worker_id, result)
+        logger.info("Job %d (%s) succeeded", job.id, job.kind, extra=extra)
+        return "succeeded"
+
+
+job_worker = JobWorker()
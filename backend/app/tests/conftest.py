@@ -0,0 +1,66 @@
+import os
+import tempfile
+import uuid
+from pathlib import Path
+from typing import Callable, Optional
+
+import pytest
+from fastapi.testclient import TestClient
+
+# Point the app at a throwaway SQLite file before anything imports app.core.config
+_TEST_DB = Path(tempfile.mkdtemp(prefix="app-tests-")) / "test.sqlite"
+os.environ["DATABASE_URL"] = f"sqlite:///{_TEST_DB.as_posix()}"
+
+from app.db.database import SessionLocal, engine  # noqa: E402
+from app.models import Base  # noqa: E402
+from app.Domains.turnarounds.models import Discipline, WorkPackage  # noqa: E402
+from app.main import app  # noqa: E402
+
+Base.metadata.create_all(engine)
+
+
+@pytest.fixture
+def wp_id() -> str:
+    """Id of a freshly created work package."""
+    db = SessionLocal()
+    try:
+        wp = WorkPackage(title="Test package", discipline=Discipline.MECHANICAL)
+        db.add(wp)
+        db.commit()
+        return wp.id
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def make_work_package() -> Callable[..., str]:
+    """Create work packages through the API and return their ids; titles are random unless given."""
+    client = TestClient(app)
+
+    def make(
+        discipline: str = "Mechanical",
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        title: Optional[str] = None,
+    ) -> str:
+        body = {
+            "title": title or f"package-{uuid.uuid4().hex[:8]}",
+            "discipline": discipline,
+            "start_date": start,
+            "end_date": end,
+        }
+        response = client.post("/api/v1/turnarounds/work-packages", json=body)
+        assert response.status_code == 201
+        return response.json()["id"]
+
+    return make
+
+
+@pytest.fixture
+def cost_url() -> Callable[[str, str], str]:
+    """URL of a work package's cost endpoint, e.g. cost_url(wp_id, "breakdown-items/batch")."""
+
+    def url(wp_id: str, path: str) -> str:
+        return f"/api/v1/turnarounds/work-packages/{wp_id}/cost/{path}"
+
+    return url
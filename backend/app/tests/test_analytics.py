@@ -0,0 +1,56 @@
+import numpy as np
+from fastapi.testclient import TestClient
+
+from app.Domains.turnarounds.analytics import SpendProfile, daily_spend
+from app.main import app
+
+client = TestClient(app)
+
+URL = "/api/v1/turnarounds"
+
+
+def _loop_spend(start, duration, value, group, groups, days, profile):
+    out = np.zeros((groups, days))
+    for s, d, v, g in zip(start, duration, value, group):
+        for k in range(d):
+            share = v / d if profile is SpendProfile.UNIFORM else v * (d - k) / (d * (d + 1) / 2)
+            out[g, s + k] += share
+    return out
+
+
+def test_difference_arrays_match_per_day_loop():
+    rnd = np.random.default_rng(5)
+    n, days, groups = 400, 120, 4
+    duration = rnd.integers(1, 30, n)
+    start = rnd.integers(0, days - duration + 1)
+    value = rnd.uniform(0, 1e6, n)
+    group = rnd.integers(0, groups, n)
+    for profile in SpendProfile:
+        fast = daily_spend(start, duration, value, group, groups, days, profile)
+        slow = _loop_spend(start, duration, value, group, groups, days, profile)
+        np.testing.assert_allclose(fast, slow, rtol=1e-9, atol=1e-6)
+        np.testing.assert_allclose(fast.sum(), value.sum(), rtol=1e-9)
+
+
+def test_s_curve_endpoint_filters_and_refreshes_on_writes():
+    body = {"title": "Curve", "discipline": "Instrumentation", "start_date": "2031-03-01", "end_date": "2031-03-04"}
+    wp_id = client.post(f"{URL}/work-packages", json=body).json()["id"]
+    client.put(f"{URL}/work-packages/{wp_id}/cost/summary", json={"original_contract_price": 1000})
+
+    params = {"discipline": "Instrumentation", "date_from": "2031-02-28", "date_to": "2031-03-05"}
+    data = client.get(f"{URL}/analytics/s-curves", params=params).json()
+    assert [s["discipline"] for s in data["series"]] == ["Instrumentation"]
+    assert data["total"]["daily_cost"] == [0, 250, 250, 250, 250, 0]
+    assert data["total"]["cumulative_cost"][-1] - data["total"]["cumulative_cost"][0] == 1000
+    assert data["total"]["active_packages"] == [0, 1, 1, 1, 1, 0]
+
+    front = client.get(f"{URL}/analytics/s-curves", params={**params, "profile": "front_loaded"}).json()
+    assert front["total"]["daily_cost"] == [0, 400, 300, 200, 100, 0]
+
+    # A write bumps the data version, so the cached curve is not served again
+    client.put(f"{URL}/work-packages/{wp_id}/cost/summary", json={"original_contract_price": 2000})
+    data = client.get(f"{URL}/analytics/s-curves", params=params).json()
+    assert data["total"]["daily_cost"][1] == 500
+
+    params["date_to"] = "2031-02-01"
+    assert client.get(f"{URL}/analytics/s-curves", params=params).status_code == 400
@@ -0,0 +1,55 @@
+import uuid
+
+from fastapi.testclient import TestClient
+
+from app.core import security
+from app.db.database import SessionLocal
+from app.Domains.users.models import User
+from app.main import app
+from app.models.chat_message import ChatMessage
+from app.models.chat_session import ChatSession
+
+client = TestClient(app)
+
+PAYLOAD = {
+    "version": "v1",
+    "summary": "Replace the seal",
+    "sections": [{"key": "s0", "title": "Steps", "items": [{"kind": "list", "content": ["Isolate", "Drain", "Ünïcode ✓"]}]}],
+}
+
+
+def test_messages_are_served_in_the_response_model_shape():
+    email = f"chat-{uuid.uuid4().hex[:8]}@example.com"
+    db = SessionLocal()
+    try:
+        user = User(email=email, password_hash="unused")
+        db.add(user)
+        db.flush()
+        session = ChatSession(domain_id="turnaround", user_id=user.id, title="Pump seal")
+        db.add(session)
+        db.flush()
+        db.add(ChatMessage(session_id=session.id, role="user", content_text="How do I replace the seal?"))
+        db.flush()
+        db.add(ChatMessage(session_id=session.id, role="assistant", content_json=PAYLOAD))
+        db.commit()
+        session_id = session.id
+    finally:
+        db.close()
+    headers = {"Authorization": f"Bearer {security.create_access_token(email)}"}
+
+    response = client.get(f"/api/v1/chat/sessions/{session_id}/messages", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    body = response.json()
+    assert [(m["role"], m["content_text"], m["content_json"]) for m in body] == [
+        ("user", "How do I replace the seal?", None),
+        ("assistant", None, PAYLOAD),
+    ]
+    assert all(set(m) == {"id", "role", "content_json", "content_text"} for m in body)
+
+    sessions = client.get("/api/v1/chat/sessions", headers=headers).json()
+    assert sessions == [{"id": session_id, "domain_id": "turnaround", "title": "Pump seal", "meta": {}, "tags": []}]
+
+    posted = client.post(f"/api/v1/chat/sessions/{session_id}/messages", json={"content": "Thanks"}, headers=headers)
+    assert posted.status_code == 200
+    assert posted.json() == {"id": posted.json()["id"], "role": "user", "content_json": None, "content_text": "Thanks"}
@@ -0,0 +1,131 @@
+import gzip
+import io
+import json
+
+import anyio
+import brotli
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core.compression import CompressionMiddleware, negotiate
+from app.core.static_files import IMMUTABLE, REVALIDATE, FrontendStaticFiles
+
+ROWS = [{"id": i, "text": "replace the pump seal"} for i in range(200)]
+
+api = FastAPI()
+api.add_middleware(CompressionMiddleware)
+
+
+@api.get("/rows")
+def rows():
+    return ROWS
+
+
+@api.get("/small")
+def small():
+    return {"ok": True}
+
+
+@api.get("/export")
+def export():
+    return StreamingResponse((f"{r['id']},{r['text']}\n".encode() for r in ROWS), media_type="text/csv")
+
+
+@api.get("/precompressed")
+def precompressed():
+    return PlainTextResponse(gzip.compress(b"x" * 4096), headers={"content-encoding": "gzip"})
+
+
+client = TestClient(api)
+
+
+def test_negotiation_honours_q_values():
+    assert negotiate("gzip, deflate, br") == "br"
+    assert negotiate("br;q=0.5, gzip") == "gzip"
+    assert negotiate("gzip;q=0, *;q=0.1") == "br"
+    assert negotiate("identity") is None
+    assert negotiate("") is None
+
+
+def test_large_json_is_compressed_with_an_exact_length():
+    for coding, decode in (("br", brotli.decompress), ("gzip", gzip.decompress)):
+        with client.stream("GET", "/rows", headers={"accept-encoding": coding}) as response:
+            raw = b"".join(response.iter_raw())
+        assert response.headers["content-encoding"] == coding
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert int(response.headers["content-length"]) == len(raw)
+        assert json.loads(decode(raw)) == ROWS
+
+
+def test_small_unaccepted_and_already_encoded_bodies_pass_through():
+    assert "content-encoding" not in client.get("/small", headers={"accept-encoding": "gzip"}).headers
+    assert "content-encoding" not in client.get("/rows", headers={"accept-encoding": "identity"}).headers
+    with client.stream("GET", "/precompressed", headers={"accept-encoding": "br"}) as response:
+        raw = b"".join(response.iter_raw())
+    assert response.headers["content-encoding"] == "gzip"
+    assert gzip.decompress(raw) == b"x" * 4096
+
+
+def test_streamed_bodies_are_compressed_chunk_by_chunk():
+    # TestClient buffers the body, so drive the ASGI app directly to see each message
+    sent = []
+    requested = False
+
+    async def receive():
+        nonlocal requested
+        if requested:
+            await anyio.sleep_forever()  # no disconnect; the response cancels its listener when done
+        requested = True
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+        "path": "/export", "raw_path": b"/export", "query_string": b"", "root_path": "",
+        "headers": [(b"accept-encoding", b"gzip")], "client": ("test", 1), "server": ("test", 80),
+    }
+    anyio.run(api, scope, receive, send)
+
+    start, *bodies = sent
+    headers = dict(start["headers"])
+    assert headers[b"content-encoding"] == b"gzip"
+    assert b"content-length" not in headers
+    assert len(bodies) > 2 and all(message["more_body"] for message in bodies[:-1])
+    # Every chunk is flushed, so the stream decodes up to each boundary
+    first_rows = gzip.GzipFile(fileobj=io.BytesIO(bodies[0]["body"])).read1()
+    assert first_rows.startswith(b"0,replace the pump seal\n")
+    assert gzip.decompress(b"".join(m["body"] for m in bodies)).decode() == "".join(f"{r['id']},{r['text']}\n" for r in ROWS)
+
+
+def test_frontend_build_is_served_precompressed_with_cache_headers(tmp_path):
+    script = b"console.log('turnaround');" * 100
+    (tmp_path / "assets").mkdir()
+    (tmp_path / "index.html").write_text("<div id=root></div>")
+    (tmp_path / "assets" / "index-4f9a2c1b.js").write_bytes(script)
+    (tmp_path / "assets" / "index-4f9a2c1b.js.br").write_bytes(brotli.compress(script))
+    (tmp_path / "assets" / "index-4f9a2c1b.js.gz").write_bytes(gzip.compress(script))
+
+    site = FastAPI()
+    site.mount("/", FrontendStaticFiles(directory=str(tmp_path)), name="frontend")
+    frontend = TestClient(site)
+
+    with frontend.stream("GET", "/assets/index-4f9a2c1b.js", headers={"accept-encoding": "gzip, br"}) as response:
+        raw = b"".join(response.iter_raw())
+    assert response.headers["content-encoding"] == "br"
+    assert response.headers["content-type"].startswith("text/javascript")
+    assert response.headers["cache-control"] == IMMUTABLE
+    assert brotli.decompress(raw) == script
+
+    plain = frontend.get("/assets/index-4f9a2c1b.js", headers={"accept-encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    assert plain.headers["vary"] == "Accept-Encoding"
+    assert plain.content == script
+
+    index = frontend.get("/")
+    assert index.headers["cache-control"] == REVALIDATE
+    assert frontend.get("/work-packages/42").text == index.text
+    assert frontend.get("/api/v1/nope").status_code == 404
+    assert frontend.get("/assets/missing-00000000.js").status_code == 404
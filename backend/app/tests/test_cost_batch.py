@@ -0,0 +1,89 @@
+from fastapi.testclient import TestClient
+from app.main import app
+
+client = TestClient(app)
+
+
+def test_breakdown_batch_reports_invalid_rows_and_applies_valid_ones(wp_id, cost_url):
+    """Invalid rows are reported per index; valid rows are still written."""
+    response = client.post(
+        cost_url(wp_id, "breakdown-items/batch"),
+        json={
+            "create": [
+                {"item": "Scaffolding", "value_amount": "1200.50"},
+                {"item": "", "value_amount": "10"},
+                {"item": "Cranage", "value_amount": "-5"},
+                {"item": "Insulation", "value_amount": "300"},
+            ]
+        },
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert len(body["created"]) == 2
+    assert [(e["op"], e["index"]) for e in body["errors"]] == [("create", 1), ("create", 2)]
+
+    rows = client.get(cost_url(wp_id, "breakdown-items")).json()
+    assert {r["item"] for r in rows} == {"Scaffolding", "Insulation"}
+
+    insulation, scaffolding = sorted(rows, key=lambda r: r["item"])
+    response = client.post(
+        cost_url(wp_id, "breakdown-items/batch"),
+        json={
+            "update": [{"id": scaffolding["id"], "value_amount": "99.99"}, {"id": "missing"}],
+            "delete": [insulation["id"], insulation["id"]],
+        },
+    )
+    body = response.json()
+    assert body["updated"] == [scaffolding["id"]]
+    assert body["deleted"] == [insulation["id"]]
+    assert [(e["op"], e["errors"][0]["type"]) for e in body["errors"]] == [
+        ("update", "not_found"),
+        ("delete", "duplicate"),
+    ]
+
+    rows = client.get(cost_url(wp_id, "breakdown-items")).json()
+    assert [(r["item"], r["value_amount"]) for r in rows] == [("Scaffolding", "99.99")]
+
+
+def test_batch_update_clears_nullable_fields_and_rejects_null_required_ones(wp_id, cost_url):
+    (item_id,) = client.post(
+        cost_url(wp_id, "breakdown-items/batch"),
+        json={"create": [{"item": "Scaffolding", "description": "North side", "value_amount": "10"}]},
+    ).json()["created"]
+
+    body = client.post(
+        cost_url(wp_id, "breakdown-items/batch"),
+        json={"update": [{"id": item_id, "description": None}, {"id": item_id, "item": None}]},
+    ).json()
+    assert body["updated"] == [item_id]
+    assert [(e["index"], e["errors"][0]["loc"]) for e in body["errors"]] == [(1, ["item"])]
+    (row,) = client.get(cost_url(wp_id, "breakdown-items")).json()
+    assert (row["item"], row["description"], row["value_amount"]) == ("Scaffolding", None, "10.00")
+
+
+def test_variation_batch_returns_summary_once(wp_id, cost_url):
+    """The batch response carries the recomputed contract summary."""
+    client.put(cost_url(wp_id, "summary"), json={"original_contract_price": 1000})
+    response = client.post(
+        cost_url(wp_id, "variation-orders/batch"),
+        json={
+            "create": [
+                {"vo_number": "VO-1", "value_amount": "100", "status": "Approved", "date_raised": "2025-09-01"},
+                {"vo_number": "VO-2", "value_amount": "50", "status": "Pending", "date_raised": "2025-09-02"},
+                {"vo_number": "VO-3", "value_amount": "10", "status": "Bogus", "date_raised": "2025-09-03"},
+            ]
+        },
+    )
+    body = response.json()
+    assert len(body["created"]) == 2
+    assert body["errors"][0]["index"] == 2
+    summary = body["summary"]
+    assert float(summary["approved_variations"]) == 100
+    assert float(summary["pending_variations"]) == 50
+    assert float(summary["estimate_final_contract_price"]) == 1150
+
+
+def test_batch_rejected_when_locked(wp_id, cost_url):
+    client.put(cost_url(wp_id, "header"), json={"locked": True})
+    response = client.post(cost_url(wp_id, "breakdown-items/batch"), json={"create": []})
+    assert response.status_code == 423
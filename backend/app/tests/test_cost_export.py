@@ -0,0 +1,31 @@
+import io
+
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+
+client = TestClient(app)
+
+
+def test_export_streams_csv_with_variation_totals(wp_id):
+    client.put(f"/api/v1/turnarounds/work-packages/{wp_id}/cost/summary", json={"original_contract_price": 500})
+    client.post(
+        f"/api/v1/turnarounds/work-packages/{wp_id}/cost/variation-orders/batch",
+        json={"create": [{"vo_number": "VO-1", "value_amount": "25.5", "status": "Approved", "date_raised": "2025-09-01"}]},
+    )
+    response = client.get("/api/v1/turnarounds/cost/export?format=csv")
+    assert response.status_code == 200
+    header, *lines = response.text.splitlines()
+    columns = header.split(",")
+    row = dict(zip(columns, next(line for line in lines if line.startswith(wp_id)).split(",")))
+    assert row["approved_variations"] == "25.50"
+    assert row["revised_contract_price"] == "525.50"
+    assert row["variation_count"] == "1"
+
+
+def test_export_parquet_round_trips():
+    pq = pytest.importorskip("pyarrow.parquet")
+    response = client.get("/api/v1/turnarounds/cost/export?format=parquet")
+    assert response.status_code == 200
+    table = pq.read_table(io.BytesIO(response.content))
+    assert "estimate_final_contract_price" in table.column_names
@@ -0,0 +1,35 @@
+from fastapi.testclient import TestClient
+from app.main import app
+
+client = TestClient(app)
+
+
+def test_csv_import_reports_rows_and_imports_valid_lines(wp_id):
+    """Bad lines are reported with their spreadsheet row number."""
+    csv_body = (
+        "Item,Description,Value Amount\n"
+        "Scaffolding,Erect and strip,1500.00\n"
+        ",missing item,20\n"
+        "\n"
+        "Cranage,50t crane,not-a-number\n"
+        "Insulation,,250.25\n"
+    )
+    response = client.post(
+        f"/api/v1/turnarounds/work-packages/{wp_id}/cost/breakdown-items/import",
+        files={"file": ("tender.csv", csv_body.encode(), "text/csv")},
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["rows_read"], body["rows_imported"], body["rows_failed"]) == (4, 2, 2)
+    assert [e["row"] for e in body["errors"]] == [3, 5]
+
+    rows = client.get(f"/api/v1/turnarounds/work-packages/{wp_id}/cost/breakdown-items").json()
+    assert sorted(r["item"] for r in rows) == ["Insulation", "Scaffolding"]
+
+
+def test_import_rejects_unknown_file_type(wp_id):
+    response = client.post(
+        f"/api/v1/turnarounds/work-packages/{wp_id}/cost/variation-orders/import",
+        files={"file": ("tender.pdf", b"%PDF", "application/pdf")},
+    )
+    assert response.status_code == 400
@@ -0,0 +1,20 @@
+import pytest
+
+from app.db.database import to_async_url
+
+
+def test_to_async_url_picks_the_async_driver():
+    assert to_async_url("sqlite:///./app.db") == "sqlite+aiosqlite:///./app.db"
+    assert to_async_url("postgresql://u:p@db:5432/app") == "postgresql+asyncpg://u:p@db:5432/app"
+    assert to_async_url("postgresql+psycopg2://u:p@db/app") == "postgresql+asyncpg://u:p@db/app"
+    assert to_async_url("mssql+pyodbc://u:p@dsn") == "mssql+aioodbc://u:p@dsn"
+
+
+def test_to_async_url_passes_sslmode_as_asyncpgs_ssl_argument():
+    url = to_async_url("postgresql://u:p@db/app?sslmode=require&application_name=api")
+    assert url == "postgresql+asyncpg://u:p@db/app?application_name=api&ssl=require"
+
+
+def test_to_async_url_rejects_unknown_backends():
+    with pytest.raises(ValueError):
+        to_async_url("mysql://u:p@db/app")
@@ -15,3 +15,40 @@ def test_readyz():
     assert response.status_code == 200
     assert response.json()["status"] == "ok"
     assert "db" in response.json()
+
+def test_readiness_probes_share_one_cached_check(monkeypatch):
+    import asyncio
+
+    from app import health
+
+    pings = []
+
+    async def counting_ping(target, timeout):
+        pings.append(target)
+        await asyncio.sleep(0.01)
+        return {"status": "ok", "latency_ms": 10.0}
+
+    monkeypatch.setattr(health, "ping", counting_ping)
+    checker = health.ReadinessChecker(interval=60, timeout=1)
+
+    async def probe_burst():
+        return await asyncio.gather(*(checker.current() for _ in range(20)))
+
+    results = asyncio.run(probe_burst())
+    assert all(r is results[0] and r["status"] == "ok" for r in results)
+    checks = len(pings)
+    assert checks == len(health._engines())
+    asyncio.run(checker.current())
+    assert len(pings) == checks  # still fresh: served from cache
+
+
+def test_deep_health_reports_db_pools_migrations_and_caches():
+    response = client.get("/healthz/deep")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["status"] == "ok"
+    assert body["db"]["primary"]["status"] == "ok"
+    assert {"pools", "caches", "threadpool", "readiness"} <= set(body)
+    # The test database is built with create_all, not migrations
+    assert body["migrations"]["status"] == "unversioned"
+    assert body["migrations"]["head"]
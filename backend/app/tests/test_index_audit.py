@@ -0,0 +1,101 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import UniqueConstraint, func, select
+
+from app.db.database import engine
+from app.Domains.turnarounds.cost_models import (
+    CostBreakdownItem,
+    VariationOrder,
+    VariationOrderStatus,
+    WorkPackageCost,
+)
+from app.Domains.turnarounds.cost_service import PENDING_VARIATION_STATUSES
+from app.models import Base
+from app.models.chat_message import ChatMessage
+from app.models.chat_session import ChatSession
+from app.models.job import Job, JobStatus
+
+# The hot queries (as the services build them) and the index each must search with
+HOT_QUERIES = {
+    "chat messages of a session": (
+        select(ChatMessage).where(ChatMessage.session_id == 1).order_by(ChatMessage.created_at.asc()),
+        "ix_chat_messages_session_created",
+    ),
+    "chat sessions of a user in a domain": (
+        select(ChatSession)
+        .where(ChatSession.user_id == 1, ChatSession.domain_id == "turnaround")
+        .order_by(ChatSession.created_at.desc())
+        .limit(50),
+        "ix_chat_sessions_user_domain_created",
+    ),
+    "approved variation total": (
+        select(func.sum(VariationOrder.value_amount)).where(
+            VariationOrder.work_package_cost_id == "c", VariationOrder.status == VariationOrderStatus.APPROVED
+        ),
+        "ix_variation_orders_cost_status",
+    ),
+    "pending variation total": (
+        select(func.sum(VariationOrder.value_amount)).where(
+            VariationOrder.work_package_cost_id == "c", VariationOrder.status.in_(PENDING_VARIATION_STATUSES)
+        ),
+        "ix_variation_orders_cost_status",
+    ),
+    "variation orders of a cost": (
+        select(VariationOrder).where(VariationOrder.work_package_cost_id == "c"),
+        "ix_variation_orders_cost_status",
+    ),
+    "breakdown items of a cost": (
+        select(CostBreakdownItem)
+        .where(CostBreakdownItem.work_package_cost_id == "c")
+        .order_by(CostBreakdownItem.created_at, CostBreakdownItem.id),
+        "ix_breakdown_items_cost_created",
+    ),
+    # The unique constraint's index, which SQLite names itself
+    "cost row of a work package": (
+        select(WorkPackageCost).where(WorkPackageCost.work_package_id == "w"),
+        "sqlite_autoindex_work_package_costs_",
+    ),
+    "next job to claim": (
+        select(Job.id)
+        .where(Job.status == JobStatus.QUEUED, Job.run_at <= datetime(2030, 1, 1), Job.kind.in_(["cost_export"]))
+        .order_by(Job.priority.desc(), Job.run_at, Job.id)
+        .limit(1),
+        "ix_jobs_claim",
+    ),
+}
+
+
+def _plan(statement) -> list[str]:
+    sql = str(statement.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True}))
+    with engine.connect() as connection:
+        return [row[-1] for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")]
+
+
+@pytest.mark.parametrize("name", HOT_QUERIES)
+def test_hot_queries_search_an_index(name):
+    statement, index = HOT_QUERIES[name]
+    plan = _plan(statement)
+    table = statement.get_final_froms()[0].name
+    searches = [step for step in plan if step.startswith(f"SEARCH {table} ")]
+    assert searches and all(f"INDEX {index}" in step for step in searches), plan
+    assert not any(step.startswith(f"SCAN {table}") for step in plan), plan
+
+
+def test_sessions_and_messages_come_back_in_index_order():
+    for name in ("chat messages of a session", "chat sessions of a user in a domain"):
+        plan = _plan(HOT_QUERIES[name][0])
+        assert not any("TEMP B-TREE" in step for step in plan), (name, plan)
+
+
+def test_no_index_duplicates_a_key_or_the_leading_columns_of_another():
+    redundant = []
+    for table in Base.metadata.sorted_tables:
+        keys = [tuple(c.name for c in table.primary_key.columns)]
+        keys += [tuple(c.name for c in con.columns) for con in table.constraints if isinstance(con, UniqueConstraint)]
+        indexes = {ix.name: tuple(c.name for c in ix.columns) for ix in table.indexes}
+        for name, columns in indexes.items():
+            wider = keys + [other for other_name, other in indexes.items() if other_name != name]
+            if any(other[: len(columns)] == columns for other in wider):
+                redundant.append((table.name, name, columns))
+    assert redundant == []
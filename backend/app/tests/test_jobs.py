@@ -0,0 +1,219 @@
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+
+from app.core import security
+from app.core.config import settings
+from app.db.database import SessionLocal, engine
+from app.Domains.users.models import User
+from app.main import app
+from app.models.job import Job, JobStatus
+from app.services.jobs.queue import claim, complete, enqueue, has_due_job, job_handler, requeue_expired
+from app.services.jobs.worker import JobWorker
+
+client = TestClient(app)
+
+_calls: dict[int, int] = {}
+_release = threading.Event()
+
+
+@job_handler("test_flaky")
+def flaky(ctx, payload):
+    _calls[ctx.job_id] = _calls.get(ctx.job_id, 0) + 1
+    if ctx.attempt < payload.get("succeed_on", 1):
+        raise RuntimeError(f"attempt {ctx.attempt} failed")
+    if payload.get("bad"):
+        raise ValueError("payload can never work")
+    ctx.progress(0.5, "halfway")
+    return {"attempt": ctx.attempt}
+
+
+@job_handler("test_blocking")
+def blocking(ctx, payload):
+    while True:
+        ctx.progress(0.1, "waiting")
+        if _release.wait(0.01):
+            return None
+
+
+@pytest.fixture
+def fast_worker(monkeypatch):
+    monkeypatch.setattr(settings, "JOBS_POLL_INTERVAL_SECONDS", 0.02)
+    monkeypatch.setattr(settings, "JOBS_PROGRESS_INTERVAL_SECONDS", 0.0)
+    monkeypatch.setattr(settings, "JOBS_RETRY_BACKOFF_SECONDS", 0.0)
+    worker = JobWorker(threads=2, processes=0)
+    worker.start()
+    yield worker
+    _release.set()
+    worker.stop()
+    _release.clear()
+
+
+def _job(job_id: int) -> Job:
+    with SessionLocal() as db:
+        return db.get(Job, job_id)
+
+
+def _wait(job_id: int, *statuses: JobStatus, timeout: float = 10.0) -> Job:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = _job(job_id)
+        if job.status in statuses:
+            return job
+        time.sleep(0.02)
+    raise AssertionError(f"job {job_id} stayed {job.status}")
+
+
+def _user_headers(is_admin: bool = False) -> tuple[int, dict]:
+    email = f"jobs-{uuid.uuid4().hex[:8]}@example.com"
+    with SessionLocal() as db:
+        user = User(email=email, password_hash="unused", is_admin=is_admin)
+        db.add(user)
+        db.commit()
+        user_id = user.id
+    return user_id, {"Authorization": f"Bearer {security.create_access_token(email)}"}
+
+
+def test_claims_are_atomic_and_follow_priority():
+    kind = "test_flaky"
+    # Backdated so they come before any other due job of the kind
+    due = datetime.utcnow() - timedelta(days=400)
+    with SessionLocal() as db:
+        ordered = [enqueue(db, kind, priority=p, run_at=due).id for p in (0, 5, 5, -1)]
+    assert has_due_job([kind]) and not has_due_job(["no_such_kind"])
+    first = [claim("w-order", [kind]) for _ in ordered]
+    assert [job.id for job in first] == [ordered[1], ordered[2], ordered[0], ordered[3]]
+    for job in first:
+        complete(job, "w-order", None)
+
+    with SessionLocal() as db:
+        ids = {enqueue(db, kind, run_at=due).id for _ in range(20)}
+    claimed: list[int] = []
+
+    def grab(worker_id: str) -> None:
+        while (job := claim(worker_id, [kind])) is not None:
+            claimed.append(job.id)
+            complete(job, worker_id, None)
+
+    threads = [threading.Thread(target=grab, args=(f"w-{n}",)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    mine = [i for i in claimed if i in ids]
+    assert sorted(mine) == sorted(ids)  # every job claimed exactly once
+    assert all(_job(i).attempts == 1 and _job(i).status == JobStatus.SUCCEEDED for i in ids)
+
+
+def test_worker_retries_then_succeeds_and_fails_bad_payloads_at_once(fast_worker):
+    with SessionLocal() as db:
+        retried = enqueue(db, "test_flaky", {"succeed_on": 2}).id
+        bad = enqueue(db, "test_flaky", {"bad": True}).id
+        exhausted = enqueue(db, "test_flaky", {"succeed_on": 9}, max_attempts=2).id
+    fast_worker.wake()
+
+    done = _wait(retried, JobStatus.SUCCEEDED)
+    assert done.attempts == 2 and done.result_json == {"attempt": 2}
+    assert done.progress == 1.0 and done.error is None and done.locked_by is None
+
+    failed = _wait(bad, JobStatus.FAILED)
+    assert failed.attempts == 1 and failed.error == "ValueError: payload can never work"
+    assert _wait(exhausted, JobStatus.FAILED).attempts == 2
+    assert _calls[exhausted] == 2
+
+
+def test_status_api_enqueue_progress_cancel_and_visibility(fast_worker):
+    user_id, headers = _user_headers()
+    _, other = _user_headers()
+    _, admin = _user_headers(is_admin=True)
+
+    assert client.post("/api/v1/jobs", json={"kind": "nope"}, headers=headers).status_code == 400
+    created = client.post("/api/v1/jobs", json={"kind": "test_blocking", "priority": 10}, headers=headers)
+    assert created.status_code == 202
+    job_id = created.json()["id"]
+    assert created.json()["status"] == "queued"
+
+    running = _wait(job_id, JobStatus.RUNNING)
+    assert running.created_by == user_id
+    deadline = time.monotonic() + 5
+    while client.get(f"/api/v1/jobs/{job_id}", headers=headers).json()["progress_message"] != "waiting":
+        assert time.monotonic() < deadline
+        time.sleep(0.02)
+
+    assert client.get(f"/api/v1/jobs/{job_id}", headers=other).status_code == 404
+    assert job_id in [j["id"] for j in client.get("/api/v1/jobs", params={"kind": "test_blocking"}, headers=admin).json()]
+    assert job_id not in [j["id"] for j in client.get("/api/v1/jobs", headers=other).json()]
+
+    assert client.post(f"/api/v1/jobs/{job_id}/cancel", headers=headers).json()["cancel_requested"] is True
+    assert _wait(job_id, JobStatus.CANCELLED).finished_at is not None
+    assert client.post(f"/api/v1/jobs/{job_id}/cancel", headers=headers).status_code == 200
+
+    finished = client.post("/api/v1/jobs", json={"kind": "test_flaky"}, headers=headers).json()["id"]
+    _wait(finished, JobStatus.SUCCEEDED)
+    assert client.post(f"/api/v1/jobs/{finished}/cancel", headers=headers).status_code == 409
+
+    # Kinds that touch everyone's data are for admins (a negative retention fails without deleting)
+    retention = {"kind": "jobs_retention", "payload": {"days": -1}}
+    assert client.post("/api/v1/jobs", json=retention, headers=headers).status_code == 403
+    assert client.post("/api/v1/jobs", json={"kind": "rto_subtotals", "payload": {"fix": True}}, headers=headers).status_code == 403
+    assert client.post("/api/v1/jobs", json=retention, headers=admin).status_code == 202
+
+
+def test_cost_export_job_writes_a_downloadable_file(fast_worker, monkeypatch, tmp_path, wp_id):
+    monkeypatch.setattr(settings, "JOBS_OUTPUT_DIR", str(tmp_path))
+    client.get(f"/api/v1/turnarounds/work-packages/{wp_id}/cost/summary")
+    _, headers = _user_headers()
+
+    job_id = client.post("/api/v1/jobs", json={"kind": "cost_export", "payload": {"format": "csv"}}, headers=headers).json()["id"]
+    job = _wait(job_id, JobStatus.SUCCEEDED)
+    assert job.result_json["rows"] >= 1
+
+    download = client.get(f"/api/v1/jobs/{job_id}/download", headers=headers)
+    assert download.status_code == 200
+    assert download.headers["content-type"].startswith("text/csv")
+    assert wp_id in download.text
+    assert download.text == client.get("/api/v1/turnarounds/cost/export").text
+
+
+def test_expired_leases_are_requeued_and_late_results_dropped():
+    with SessionLocal() as db:
+        job_id = enqueue(db, "test_flaky", run_at=datetime.utcnow() - timedelta(days=500), max_attempts=2).id
+    first = claim("dead-worker", ["test_flaky"])
+    assert first.id == job_id
+    expire = update(Job).where(Job.id == job_id).values(locked_until=datetime.utcnow() - timedelta(seconds=1))
+    with engine.begin() as connection:
+        connection.execute(expire)
+
+    assert requeue_expired()[0] >= 1
+    assert _job(job_id).status == JobStatus.QUEUED
+    second = claim("live-worker", ["test_flaky"])
+    assert second.id == job_id and second.attempt == 2
+    # The dead worker comes back and reports: its lease is gone, so nothing changes
+    assert complete(first, "dead-worker", {"late": True}) is False
+    assert _job(job_id).locked_by == "live-worker"
+
+    with engine.begin() as connection:
+        connection.execute(expire)
+    requeue_expired()
+    job = _job(job_id)
+    assert job.status == JobStatus.FAILED and "Lease expired" in job.error
+
+
+def test_cpu_bound_kind_runs_in_a_worker_process(monkeypatch, wp_id):
+    monkeypatch.setattr(settings, "JOBS_POLL_INTERVAL_SECONDS", 0.02)
+    worker = JobWorker(threads=0, processes=1)
+    worker.start()
+    try:
+        with SessionLocal() as db:
+            job_id = enqueue(db, "s_curves", {"profile": "front_loaded"}).id
+        job = _wait(job_id, JobStatus.SUCCEEDED, JobStatus.FAILED, timeout=60)
+    finally:
+        worker.stop()
+    assert job.status == JobStatus.SUCCEEDED, job.error
+    assert job.result_json["profile"] == "front_loaded"
+    assert job.progress == 1.0
@@ -0,0 +1,72 @@
+import io
+import json
+import logging
+import queue
+from logging.handlers import QueueListener
+
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.core.logging import ContextQueueHandler, JsonFormatter, SamplingFilter, request_id_var
+from app.main import app
+
+client = TestClient(app)
+
+
+def test_records_are_written_as_json_by_the_listener_thread():
+    stream = io.StringIO()
+    output = logging.StreamHandler(stream)
+    output.setFormatter(JsonFormatter())
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, output)
+    log = logging.getLogger("test.json")
+    log.propagate = False
+    log.addHandler(ContextQueueHandler(log_queue))
+    token = request_id_var.set("req-1")
+    listener.start()
+    try:
+        log.warning("Imported %d rows", 3, extra={"work_package_id": "wp-9"})
+        try:
+            raise ValueError("bad row")
+        except ValueError:
+            log.exception("Import failed")
+    finally:
+        request_id_var.reset(token)
+        listener.stop()
+        log.handlers.clear()
+
+    first, second = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert first["msg"] == "Imported 3 rows"
+    assert first["level"] == "WARNING" and first["logger"] == "test.json"
+    assert first["request_id"] == "req-1" and first["work_package_id"] == "wp-9"
+    assert "ValueError: bad row" in second["exc"]
+
+
+def test_sampling_keeps_one_in_n_below_warning():
+    sampler = SamplingFilter({"app.sql": 0.1, "app.sql.bulk": 0.0})
+
+    def kept(name, level, n):
+        return sum(sampler.filter(logging.LogRecord(name, level, "", 0, "q", (), None)) for _ in range(n))
+
+    assert kept("app.sql", logging.DEBUG, 100) == 10
+    assert kept("app.sql.sync", logging.DEBUG, 100) == 10
+    assert kept("app.sql.bulk", logging.DEBUG, 100) == 0
+    assert kept("app.sql", logging.WARNING, 5) == 5
+    assert kept("app.request", logging.INFO, 5) == 5
+
+
+def test_request_ids_are_echoed_and_slow_requests_logged(monkeypatch, caplog, wp_id):
+    generated = client.get("/healthz").headers["x-request-id"]
+    assert len(generated) == 32
+    assert client.get("/healthz", headers={"x-request-id": "edge-42"}).headers["x-request-id"] == "edge-42"
+    assert client.get("/healthz", headers={"x-request-id": "bad id\n"}).headers["x-request-id"] != "bad id\n"
+
+    monkeypatch.setattr(settings, "SLOW_REQUEST_MS", 0.0)
+    with caplog.at_level(logging.WARNING, logger="app.request"):
+        client.get(f"/api/v1/turnarounds/work-packages/{wp_id}", headers={"x-request-id": "slow-1"})
+    record = next(r for r in caplog.records if r.name == "app.request")
+    assert record.route == "/api/v1/turnarounds/work-packages/{wp_id}"
+    assert record.status == 200
+    assert record.db_queries >= 1 and record.db_ms > 0
+    assert record.total_ms >= record.until_response_ms
+    assert request_id_var.get() is None
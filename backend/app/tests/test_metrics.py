@@ -0,0 +1,44 @@
+from fastapi.testclient import TestClient
+
+from app.core.metrics import HTTP_LATENCY, Registry, statement_operation
+from app.main import app
+
+client = TestClient(app)
+
+
+def test_requests_are_labelled_by_route_template(wp_id):
+    labels = ("GET", "/api/v1/turnarounds/work-packages/{wp_id}", 200)
+    before = HTTP_LATENCY.count(labels)
+    client.get(f"/api/v1/turnarounds/work-packages/{wp_id}")
+    assert HTTP_LATENCY.count(labels) == before + 1
+
+    client.get("/no/such/path")
+    assert HTTP_LATENCY.count(("GET", "<unmatched>", 404)) >= 1
+
+
+def test_metrics_endpoint_renders_prometheus_text(wp_id):
+    client.get(f"/api/v1/turnarounds/work-packages/{wp_id}/schedule")
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    assert 'http_requests_total{method="GET",route="/api/v1/turnarounds/work-packages/{wp_id}/schedule",status="200"}' in body
+    assert 'db_statements_total{engine="sync",operation="select"}' in body
+    assert 'app_cache_requests_total{cache="schedule_engine"' in body
+    assert 'threadpool_tokens{state="limit"}' in body
+    assert "http_requests_in_flight 1" in body  # the scrape itself
+    assert 'db_pool_connections{pool="sync",state="in_use"}' in body
+
+
+def test_histogram_rendering_is_cumulative():
+    registry = Registry()
+    h = registry.histogram("t_seconds", "test", ("op",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        h.observe(value, ('a"b',))
+    lines = registry.render().splitlines()
+    assert 't_seconds_bucket{op="a\\"b",le="0.1"} 1' in lines
+    assert 't_seconds_bucket{op="a\\"b",le="1"} 2' in lines
+    assert 't_seconds_bucket{op="a\\"b",le="+Inf"} 3' in lines
+    assert 't_seconds_count{op="a\\"b"} 3' in lines
+    assert statement_operation("  with x as (select 1) select * from x") == "select"
+    assert statement_operation("PRAGMA foreign_keys=ON") == "other"
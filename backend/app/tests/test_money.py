@@ -0,0 +1,47 @@
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import func, insert, select
+
+from app.core.money import Money
+from app.db.database import SessionLocal
+from app.Domains.turnarounds.cost_models import CostBreakdownItem
+from app.Domains.turnarounds.cost_schemas import BreakdownItemRead, ContractSummaryRead
+from app.Domains.turnarounds.cost_service import ensure_cost_row
+
+
+def test_parsing_rounds_half_up_and_arithmetic_is_exact():
+    assert Money.of("700.5").cents == 70050
+    assert Money.of(Decimal("0.005")) == Money(1)
+    assert Money.of(0.1) + Money.of(0.2) == Money.of("0.3")
+    assert Money.of(12) == Money(1200) and Money.of(None) == Money(0)
+    assert Money(500) != 5 and len({Money(500), Money.of(5)}) == 1
+    assert sum([Money.of("1.10")] * 3) == Money.of("3.30")
+    assert str(-Money.of("1.05")) == "-1.05" and str(Money(7)) == "0.07"
+    with pytest.raises(ValueError):
+        Money.of("abc")
+
+
+def test_wire_format_matches_the_decimal_fields():
+    zero, amount = Money(0), Money.of("706")
+    summary = ContractSummaryRead(
+        original_contract_price=amount, allowances=zero, approved_variations=zero,
+        pending_variations=zero, revised_contract_price=amount, estimate_final_contract_price=amount,
+    )
+    assert summary.model_dump(mode="json")["original_contract_price"] == "706.00"
+    assert summary.model_dump(mode="json")["allowances"] == "0"
+    item = BreakdownItemRead(id="x", item="a", value_amount="0")
+    assert item.model_dump(mode="json")["value_amount"] == "0.00"
+
+
+def test_column_round_trip_and_sql_sum(wp_id):
+    with SessionLocal() as db:
+        cost = ensure_cost_row(db, wp_id)
+        assert isinstance(cost.original_contract_price, Money)
+        rows = [{"work_package_cost_id": cost.id, "item": f"i{n}", "value_amount": Money.of("0.10")} for n in range(30)]
+        db.execute(insert(CostBreakdownItem), rows)
+        db.commit()
+        total = db.scalar(
+            select(func.sum(CostBreakdownItem.value_amount)).where(CostBreakdownItem.work_package_cost_id == cost.id)
+        )
+        assert total == Money.of("3.00")
@@ -0,0 +1,49 @@
+import threading
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import QueuePool
+
+from app.db.pool import TimedQueuePool, instrument_pool
+from app.main import app
+
+client = TestClient(app)
+
+
+def test_checkout_waits_and_timeouts_are_recorded(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.sqlite'}", poolclass=TimedQueuePool, pool_size=1, max_overflow=0, pool_timeout=0.2
+    )
+    metrics = instrument_pool(engine, "test_pool")
+
+    held = engine.connect()
+    released = threading.Timer(0.05, held.close)
+    released.start()
+    with engine.connect() as conn:  # waits for the held connection to come back
+        conn.execute(text("SELECT 1"))
+    released.join()
+
+    assert metrics.checkouts == 2 and metrics.connects == 1
+    assert metrics.wait_seconds_max >= 0.04
+
+    with engine.connect():
+        try:
+            engine.connect()
+        except Exception:
+            pass
+    assert metrics.timeouts == 1
+
+    # dispose() recreates the pool; metrics carry over
+    engine.dispose()
+    with engine.connect():
+        pass
+    assert isinstance(engine.pool, QueuePool) and metrics.connects == 2
+    assert metrics.as_dict(engine.pool)["in_use"] == 0
+
+
+def test_pools_endpoint_lists_the_app_engines():
+    client.get("/api/v1/turnarounds/work-packages")
+    data = client.get("/internal/db/pools").json()
+    names = {pool["name"] for pool in data["pools"]}
+    assert {"sync", "async"} <= names
+    assert all(pool["checkouts"] >= pool["in_use"] for pool in data["pools"])
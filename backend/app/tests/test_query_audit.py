@@ -0,0 +1,65 @@
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import security
+from app.core.query_audit import QueryAudit, fingerprint, query_budget
+from app.db.database import SessionLocal
+from app.Domains.users.models import User
+from app.main import app
+from app.models.chat_message import ChatMessage
+from app.models.chat_session import ChatSession
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def chat_user() -> dict:
+    """Auth headers for a user with several untitled chat sessions, each with messages."""
+    email = f"audit-{uuid.uuid4().hex[:8]}@example.com"
+    db = SessionLocal()
+    try:
+        user = User(email=email, password_hash="unused")
+        db.add(user)
+        db.flush()
+        for i in range(6):
+            session = ChatSession(domain_id="turnaround", user_id=user.id, title="Chat" if i % 2 else None)
+            db.add(session)
+            db.flush()
+            db.add(ChatMessage(session_id=session.id, role="assistant", content_text="Hello, how can I help?"))
+            db.add(ChatMessage(session_id=session.id, role="user", content_text=f"pump {i} seal leaking again"))
+        db.commit()
+    finally:
+        db.close()
+    return {"Authorization": f"Bearer {security.create_access_token(email)}"}
+
+
+def test_fingerprints_ignore_parameters_and_literals():
+    a = fingerprint("SELECT * FROM t WHERE id = ? AND name = 'x'  AND n IN (?, ?, ?)")
+    b = fingerprint("SELECT *\nFROM t WHERE id = ? AND name = 'it''s' AND n IN (?, ?)")
+    assert a == b == "SELECT * FROM t WHERE id = ? AND name = ? AND n IN (?...)"
+    assert fingerprint("select * from t1 where x = %(x_1)s limit 10") == "select * from t1 where x = ? limit ?"
+
+    audit = QueryAudit()
+    for i in range(3):
+        audit.record(f"SELECT * FROM t WHERE id = {i}")
+    audit.record("SELECT * FROM u")
+    assert audit.count == 4
+    assert audit.repeated(3) == [("SELECT * FROM t WHERE id = ?", 3)]
+
+
+def test_listing_chat_sessions_stays_within_budget(chat_user):
+    with query_budget(3, max_repeats=1) as audits:
+        response = client.get("/api/v1/chat/sessions", headers=chat_user)
+    assert response.status_code == 200
+    assert {s["title"] for s in response.json()} == {f"Pump {i} seal leaking again" for i in range(6)}
+    assert [route for route, _ in audits] == ["/api/v1/chat/sessions"]
+    assert response.headers["x-sql-queries"] == str(audits[0][1].count)
+    assert response.headers["x-sql-repeated"] == "0"
+
+
+def test_budget_failures_list_the_statements(wp_id):
+    with pytest.raises(AssertionError, match="budget 0"):
+        with query_budget(0):
+            client.get(f"/api/v1/turnarounds/work-packages/{wp_id}")
@@ -0,0 +1,139 @@
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+
+from app.db.database import build_async_engine, build_engine
+from app.db.routing import RecentWriters, RoutingSession, read_only, route_session
+from app.Domains.turnarounds.cost_models import RequisitionToOrder, WorkPackageCost
+from app.Domains.turnarounds.cost_service import ensure_cost_row, ensure_rto_row
+from app.Domains.turnarounds.models import Discipline, WorkPackage
+from app.models import Base
+from app.models.item import Item
+
+
+@pytest.fixture
+def urls(tmp_path):
+    """A primary and a 'replica' SQLite file holding different rows under the same id."""
+    primary_url = f"sqlite:///{(tmp_path / 'primary.sqlite').as_posix()}"
+    replica_url = f"sqlite:///{(tmp_path / 'replica.sqlite').as_posix()}"
+    for url, name in ((primary_url, "primary"), (replica_url, "replica")):
+        seed = create_engine(url)
+        Item.__table__.create(seed)
+        with seed.begin() as conn:
+            conn.execute(insert(Item).values(id=1, name=name))
+        seed.dispose()
+    return primary_url, replica_url
+
+
+@pytest.fixture
+def make_session(urls):
+    primary, replica = build_engine(urls[0]), build_engine(urls[1], read_only=True)
+    factory = sessionmaker(class_=RoutingSession, primary=primary, replica=replica, recent_writers=RecentWriters(60))
+    yield factory
+    primary.dispose()
+    replica.dispose()
+
+
+def _source(db) -> str:
+    return db.scalar(select(Item.name).where(Item.id == 1))
+
+
+@read_only
+def _read_only_source(db) -> str:
+    return _source(db)
+
+
+def test_reads_follow_the_request_method(make_session):
+    with make_session() as db:
+        route_session(db, "GET", "client:a")
+        assert _source(db) == "replica"
+    with make_session() as db:
+        route_session(db, "POST", "client:a")
+        assert _source(db) == "primary"
+        assert _read_only_source(db) == "replica"
+    with make_session() as db:  # scripts: no routing, primary only
+        assert _source(db) == "primary"
+
+
+def test_writes_stick_to_the_primary_and_the_caller(make_session):
+    with make_session() as db:
+        route_session(db, "POST", "client:a")
+        db.add(Item(id=2, name="new"))
+        db.flush()
+        assert _read_only_source(db) == "primary"  # after a write, even read_only calls see it
+        db.commit()
+
+    with make_session() as db:
+        route_session(db, "GET", "client:a")
+        assert _source(db) == "primary"  # inside the read-your-writes window
+    with make_session() as db:
+        route_session(db, "GET", "client:b")
+        assert _source(db) == "replica"
+
+    db = make_session()
+    db.recent_writers.window = 0
+    route_session(db, "GET", "client:a")
+    assert _source(db) == "replica"
+    db.close()
+
+
+def test_async_sessions_route_the_same_way(urls):
+    async def run():
+        primary, replica = build_async_engine(urls[0]), build_async_engine(urls[1], read_only=True)
+        factory = async_sessionmaker(
+            sync_session_class=RoutingSession,
+            primary=primary.sync_engine,
+            replica=replica.sync_engine,
+            recent_writers=RecentWriters(60),
+        )
+        try:
+            async with factory() as db:
+                route_session(db, "GET", "client:a")
+                read = await db.scalar(select(Item.name).where(Item.id == 1))
+                db.add(Item(id=3, name="async"))
+                await db.commit()
+                after_write = await db.scalar(select(Item.name).where(Item.id == 3))
+            return read, after_write
+        finally:
+            await primary.dispose()
+            await replica.dispose()
+
+    assert asyncio.run(run()) == ("replica", "async")
+
+
+def test_create_on_first_access_decides_on_the_primary(urls, make_session):
+    """The replica lags: it has a package but not its cost rows, and not a newer package at all."""
+    for url in urls:
+        seed = create_engine(url)
+        Base.metadata.create_all(seed)
+        seed.dispose()
+    primary, replica = (sessionmaker(bind=create_engine(url))() for url in urls)
+    primary.add_all(
+        [
+            WorkPackage(id="wp-lag", title="Lagging", discipline=Discipline.CIVIL),
+            WorkPackage(id="wp-new", title="Not replicated yet", discipline=Discipline.CIVIL),
+        ]
+    )
+    primary.flush()
+    cost = WorkPackageCost(work_package_id="wp-lag")
+    primary.add(cost)
+    primary.flush()
+    rto = RequisitionToOrder(work_package_cost_id=cost.id)
+    primary.add(rto)
+    primary.commit()
+    replica.add(WorkPackage(id="wp-lag", title="Lagging", discipline=Discipline.CIVIL))
+    replica.commit()
+
+    with make_session() as db:
+        route_session(db, "GET", "client:a")
+        found = ensure_cost_row(db, "wp-lag")  # not a second insert into uq_costs_wp_id
+        assert found.id == cost.id
+        assert ensure_rto_row(db, found).id == rto.id
+        assert ensure_cost_row(db, "wp-new").work_package_id == "wp-new"
+    assert primary.get(WorkPackage, "wp-new").title == "Not replicated yet"  # no placeholder over it
+    for session in (primary, replica):
+        session.bind.dispose()
+        session.close()
@@ -0,0 +1,64 @@
+from datetime import datetime
+from decimal import Decimal
+
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+
+from app.core.money import Money
+from app.db.database import SessionLocal
+from app.Domains.turnarounds.cost_models import RequisitionToOrder
+from app.Domains.turnarounds.cost_service import verify_rto_subtotals
+from app.main import app
+
+client = TestClient(app)
+
+
+def test_subtotal_follows_inclusion_value_changes_and_deletes(wp_id, cost_url):
+    created = client.post(
+        cost_url(wp_id, "breakdown-items/batch"),
+        json={"create": [{"item": "A", "value_amount": "100"}, {"item": "B", "value_amount": "40"}]},
+    ).json()["created"]
+    a, b = created
+
+    rto = client.put(
+        cost_url(wp_id, "rto/items"),
+        json={"items": [{"breakdown_item_id": a}, {"breakdown_item_id": b}]},
+    ).json()
+    assert Decimal(rto["subtotal_amount"]) == 140
+
+    rto = client.put(cost_url(wp_id, "rto/items"), json={"items": [{"breakdown_item_id": b, "included": False}]}).json()
+    assert Decimal(rto["subtotal_amount"]) == 100
+
+    client.post(
+        cost_url(wp_id, "breakdown-items/batch"),
+        json={"update": [{"id": a, "value_amount": "120"}, {"id": b, "value_amount": "45"}]},
+    )
+    assert Decimal(client.get(cost_url(wp_id, "rto")).json()["subtotal_amount"]) == 120
+
+    client.post(cost_url(wp_id, "breakdown-items/batch"), json={"delete": [a]})
+    assert Decimal(client.get(cost_url(wp_id, "rto")).json()["subtotal_amount"]) == 0
+
+    response = client.put(cost_url(wp_id, "rto/items"), json={"items": [{"breakdown_item_id": "nope"}]})
+    assert response.status_code == 400
+
+
+def test_verify_reports_and_fixes_drift(wp_id, cost_url):
+    (a,) = client.post(
+        cost_url(wp_id, "breakdown-items/batch"), json={"create": [{"item": "A", "value_amount": "10"}]}
+    ).json()["created"]
+    rto_id = client.put(cost_url(wp_id, "rto/items"), json={"items": [{"breakdown_item_id": a}]}).json()["id"]
+
+    db = SessionLocal()
+    try:
+        assert rto_id not in {d.rto_id for d in verify_rto_subtotals(db)}
+        stale = datetime(2000, 1, 1)
+        db.execute(
+            update(RequisitionToOrder).where(RequisitionToOrder.id == rto_id).values(subtotal_amount=999, updated_at=stale)
+        )
+        db.commit()
+        drift = {d.rto_id: d for d in verify_rto_subtotals(db, fix=True)}
+        assert drift[rto_id].computed == Money.of(10)
+        assert db.get(RequisitionToOrder, rto_id).updated_at > stale  # seen by updated_at watermarks
+        assert rto_id not in {d.rto_id for d in verify_rto_subtotals(db)}
+    finally:
+        db.close()
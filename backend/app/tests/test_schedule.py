@@ -0,0 +1,109 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import delete, select
+
+from app.db.database import SessionLocal
+from app.Domains.turnarounds.models import WorkPackage, WorkPackageDependency
+from app.Domains.turnarounds.schedule import CycleError, ScheduleEngine
+from app.main import app
+
+client = TestClient(app)
+
+URL = "/api/v1/turnarounds/work-packages"
+
+
+@pytest.fixture
+def empty_project():
+    """The schedule spans every work package, so run from an empty project and leave it empty."""
+
+    def clear() -> None:
+        # Costs and dependencies go with their packages (ON DELETE CASCADE)
+        with SessionLocal() as db:
+            db.execute(delete(WorkPackage))
+            db.commit()
+
+    clear()
+    yield
+    clear()
+
+
+def test_incremental_updates_match_full_recompute():
+    rnd = random.Random(3)
+    base = date(2025, 10, 1)
+    ids = [f"n{i}" for i in range(300)]
+    nodes = [(wp_id, base + timedelta(days=rnd.randint(0, 20)), None) if i % 7 == 0 else (wp_id, None, None) for i, wp_id in enumerate(ids)]
+    edges = [(ids[rnd.randint(0, i - 1)], ids[i], rnd.randint(0, 2)) for i in range(1, 300) for _ in range(2)]
+    engine = ScheduleEngine.build(nodes, edges)
+
+    for _ in range(150):
+        wp_id = rnd.choice(ids)
+        start = base + timedelta(days=rnd.randint(0, 40))
+        engine.update_node(wp_id, start, start + timedelta(days=rnd.randint(0, 9)))
+        pred, succ = rnd.sample(ids, 2)
+        try:
+            engine.add_edge(pred, succ, rnd.randint(0, 2))
+        except CycleError:
+            pass
+        if rnd.random() < 0.3:
+            u = rnd.randrange(len(ids))
+            if engine.succ[u]:
+                engine.remove_edge(ids[u], ids[next(iter(engine.succ[u]))])
+
+    def dates(v: int):
+        if engine.constraint[v] is None:
+            return None, None
+        start = date.fromordinal(engine.constraint[v])
+        return start, start + timedelta(days=engine.duration[v] - 1)
+
+    fresh = ScheduleEngine.build(
+        [(wp_id, *dates(v)) for v, wp_id in enumerate(ids)],
+        [(ids[u], ids[v], lag) for u in range(len(ids)) for v, lag in engine.succ[u].items()],
+    )
+    assert all(fresh.node(wp_id) == engine.node(wp_id) for wp_id in ids)
+    assert fresh.critical_path() == engine.critical_path()
+
+
+def test_predecessor_api_computes_float_and_rejects_cycles(empty_project, make_work_package):
+    a = make_work_package(start="2025-10-01", end="2025-10-04")  # 4 days
+    b = make_work_package(start="2025-10-01", end="2025-10-10")  # 10 days
+    c = make_work_package(start="2025-10-01", end="2025-10-02")  # 2 days
+
+    for pred in (a, b):
+        response = client.post(f"{URL}/{c}/predecessors", json={"predecessor_id": pred})
+        assert response.status_code == 201
+    body = response.json()
+    assert body["early_start"] == "2025-10-11"
+    assert body["predecessors"] == {a: 0, b: 0}
+
+    a_sched = client.get(f"{URL}/{a}/schedule").json()
+    assert a_sched["total_float_days"] == 6 and not a_sched["critical"]
+    assert client.get(f"{URL}/{b}/schedule").json()["critical"]
+
+    response = client.post(f"{URL}/{a}/predecessors", json={"predecessor_id": c})
+    assert response.status_code == 409
+    assert client.post(f"{URL}/{a}/predecessors", json={"predecessor_id": "missing"}).status_code == 404
+
+    # Moving b earlier hands the driving role to a
+    client.put(f"{URL}/{b}", json={"end_date": "2025-10-02"})
+    assert client.get(f"{URL}/{c}/schedule").json()["early_start"] == "2025-10-05"
+    assert client.get(f"{URL}/{a}/schedule").json()["critical"]
+
+    assert client.delete(f"{URL}/{c}/predecessors/{a}").status_code == 204
+    assert client.delete(f"{URL}/{c}/predecessors/{a}").status_code == 404
+    assert client.get(f"{URL}/{c}/schedule").json()["predecessors"] == {b: 0}
+
+
+def test_lag_change_made_by_another_worker_is_picked_up(make_work_package):
+    a = make_work_package(start="2025-11-03", end="2025-11-04")
+    b = make_work_package(start="2025-11-03", end="2025-11-05")
+    client.post(f"{URL}/{b}/predecessors", json={"predecessor_id": a})
+    assert client.get(f"{URL}/{b}/schedule").json()["early_start"] == "2025-11-05"
+
+    # Written straight to the DB, as another process would: only the lag changes
+    with SessionLocal() as db:
+        db.scalars(select(WorkPackageDependency).where(WorkPackageDependency.successor_id == b)).one().lag_days = 3
+        db.commit()
+    assert client.get(f"{URL}/{b}/schedule").json()["early_start"] == "2025-11-08"
@@ -0,0 +1,97 @@
+import json
+import uuid
+
+from fastapi.testclient import TestClient
+
+from app.core import security
+from app.core.config import settings
+from app.core.tracing import OtlpFileExporter, ring_buffer
+from app.db.database import SessionLocal
+from app.Domains.users.models import User
+from app.main import app
+from app.models.chat_message import ChatMessage
+from app.models.chat_session import ChatSession
+
+client = TestClient(app)
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+
+
+def _traceparent(trace_id: str, sampled: bool) -> dict:
+    return {"traceparent": f"00-{trace_id}-00f067aa0ba902b7-{'01' if sampled else '00'}"}
+
+
+def _find(trace_id: str):
+    return next((t for t in ring_buffer.traces() if t.trace_id == trace_id), None)
+
+
+def test_sampled_chat_request_records_auth_service_and_sql_spans():
+    email = f"trace-{uuid.uuid4().hex[:8]}@example.com"
+    db = SessionLocal()
+    try:
+        user = User(email=email, password_hash="unused")
+        db.add(user)
+        db.flush()
+        session = ChatSession(domain_id="turnaround", user_id=user.id, title="Traced")
+        db.add(session)
+        db.flush()
+        db.add(ChatMessage(session_id=session.id, role="user", content_text="Where did the time go?"))
+        db.commit()
+        session_id = session.id
+    finally:
+        db.close()
+    headers = {"Authorization": f"Bearer {security.create_access_token(email)}", **_traceparent(TRACE_ID, True)}
+
+    assert client.get(f"/api/v1/chat/sessions/{session_id}/messages", headers=headers).status_code == 200
+
+    trace = _find(TRACE_ID)
+    assert trace is not None
+    by_name = {s.name: s for s in trace.spans}
+    root = trace.root
+    assert root.name == "GET /api/v1/chat/sessions/{session_id}/messages"
+    assert root.parent_id == "00f067aa0ba902b7" and root.kind == "server"
+    assert root.attributes["http.response.status_code"] == 200
+    assert by_name["get_current_user"].parent_id == root.span_id
+    service = by_name["ChatService.list_messages"]
+    sql = [s for s in trace.spans if s.kind == "client"]
+    assert any(s.parent_id == service.span_id and s.name == "SELECT" for s in sql)
+    assert all(s.attributes["db.system"] == "sqlite" and s.attributes["app.db.engine"] for s in sql)
+    assert "http.send" in by_name
+    assert all(s.end_ns is not None for s in trace.spans)
+
+    listed = client.get("/internal/traces", params={"limit": 500}).json()["traces"]
+    summary = next(t for t in listed if t["trace_id"] == TRACE_ID)
+    assert {"(request)", "get_current_user", "ChatService.list_messages", "SELECT"} <= set(summary["self_ms"])
+    otlp = client.get(f"/internal/traces/{TRACE_ID}").json()
+    assert otlp["resourceSpans"][0]["scopeSpans"][0]["spans"][0]["traceId"] == TRACE_ID
+
+
+def test_cost_helpers_are_traced_and_unsampled_requests_record_nothing(monkeypatch, wp_id):
+    trace_id = uuid.uuid4().hex
+    client.get(f"/api/v1/turnarounds/work-packages/{wp_id}/cost/summary", headers=_traceparent(trace_id, True))
+    names = {s.name for s in _find(trace_id).spans}
+    assert {"_cost_row", "compute_summary", "SELECT", "INSERT"} <= names
+
+    monkeypatch.setattr(settings, "TRACE_SAMPLE_RATE", 0.0)
+    before = len(ring_buffer.traces())
+    unsampled = uuid.uuid4().hex
+    client.get(f"/api/v1/turnarounds/work-packages/{wp_id}/cost/summary", headers=_traceparent(unsampled, False))
+    client.get(f"/api/v1/turnarounds/work-packages/{wp_id}/cost/summary")
+    assert _find(unsampled) is None
+    assert len(ring_buffer.traces()) == before
+
+
+def test_otlp_file_exporter_writes_one_json_line_per_trace(tmp_path):
+    client.get("/healthz", headers=_traceparent(TRACE_ID[::-1], True))
+    trace = _find(TRACE_ID[::-1])
+    exporter = OtlpFileExporter(str(tmp_path / "traces.jsonl"))
+    exporter.export(trace)
+    exporter.export(trace)
+    exporter.close()
+
+    lines = (tmp_path / "traces.jsonl").read_text().splitlines()
+    assert len(lines) == 2
+    span = json.loads(lines[0])["resourceSpans"][0]["scopeSpans"][0]["spans"][0]
+    assert span["name"] == "GET /healthz" and span["kind"] == 2
+    assert int(span["endTimeUnixNano"]) >= int(span["startTimeUnixNano"])
+    assert {"key": "http.route", "value": {"stringValue": "/healthz"}} in span["attributes"]
@@ -0,0 +1,53 @@
+import uuid
+
+from fastapi.testclient import TestClient
+from app.main import app
+
+client = TestClient(app)
+
+URL = "/api/v1/turnarounds/work-packages"
+
+
+def test_keyset_listing_filters_and_joins_cost_summary(make_work_package):
+    """Pages follow (start_date, id) with undated packages last, and carry cost summaries."""
+    tag = uuid.uuid4().hex[:8]
+    ids = [
+        make_work_package("Civil", "2025-10-01", "2025-10-05", f"{tag}-a"),
+        make_work_package("Civil", "2025-10-03", "2025-10-20", f"{tag}-b"),
+        make_work_package("Civil", "2025-11-01", "2025-11-02", f"{tag}-c"),
+        make_work_package("Civil", None, None, f"{tag}-d"),
+        make_work_package("Electrical", "2025-10-04", "2025-10-06", f"{tag}-e"),
+    ]
+    client.put(f"{URL}/{ids[0]}/cost/summary", json={"original_contract_price": 700})
+
+    seen, cursor = [], None
+    while True:
+        params = {"discipline": "Civil", "limit": 2, **({"cursor": cursor} if cursor else {})}
+        page = client.get(URL, params=params).json()
+        seen += [item for item in page["items"] if item["title"].startswith(tag)]
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+    assert [item["id"] for item in seen] == ids[:4]
+    assert float(seen[0]["cost"]["revised_contract_price"]) == 700
+    assert seen[1]["cost"] is None
+
+    overlap = client.get(URL, params={"date_from": "2025-10-04", "date_to": "2025-10-10", "limit": 1000}).json()
+    titles = {item["title"] for item in overlap["items"] if item["title"].startswith(tag)}
+    assert titles == {f"{tag}-a", f"{tag}-b", f"{tag}-e"}
+
+
+def test_cost_endpoints_provision_a_placeholder_for_unknown_ids():
+    wp_id = f"wp-{uuid.uuid4().hex[:8]}"  # the cost pages still use client-side ids like wp-1
+    assert client.get(f"{URL}/{wp_id}/cost/header").status_code == 200
+    assert client.get(f"{URL}/{wp_id}/cost/summary").status_code == 200
+    package = client.get(f"{URL}/{wp_id}").json()
+    assert package["title"] == "Imported work package"
+    assert package["discipline"] == "Mechanical"
+
+
+def test_update_clears_nullable_fields_and_keeps_omitted_ones(make_work_package):
+    wp_id = make_work_package("Civil", "2025-10-01", "2025-10-05")
+    updated = client.put(f"{URL}/{wp_id}", json={"end_date": None, "description": "Scope"}).json()
+    assert (updated["start_date"], updated["end_date"], updated["description"]) == ("2025-10-01", None, "Scope")
+    assert client.put(f"{URL}/{wp_id}", json={"title": None}).status_code == 422
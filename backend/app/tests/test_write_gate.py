@@ -0,0 +1,76 @@
+import asyncio
+import threading
+
+import pytest
+from sqlalchemy import exc, text
+
+from app.db.database import build_async_engine, build_engine
+from app.db.write_gate import WriteGate, gate_for
+
+
+@pytest.fixture
+def url(tmp_path):
+    url = f"sqlite:///{tmp_path / 'gate.sqlite'}"
+    setup = build_engine(url)
+    with setup.begin() as connection:
+        connection.execute(text("CREATE TABLE rows (id INTEGER PRIMARY KEY, source TEXT NOT NULL)"))
+    setup.dispose()
+    return url
+
+
+def test_sync_and_async_writers_take_turns_and_readers_never_wait(url):
+    engine, async_engine = build_engine(url), build_async_engine(url)
+    gate = gate_for(url)
+    writing = engine.connect()
+    writing.execute(text("INSERT INTO rows (source) VALUES ('sync')"))  # holds the gate until returned
+
+    async def run():
+        # A connection that only reads goes ahead, on either engine
+        with engine.connect() as reader:
+            assert reader.scalar(text("SELECT count(*) FROM rows")) == 0
+        async with async_engine.connect() as reader:
+            assert await reader.scalar(text("SELECT count(*) FROM rows")) == 0
+
+        async def write():
+            async with async_engine.begin() as connection:
+                await connection.execute(text("INSERT INTO rows (source) VALUES ('async')"))
+
+        waiting = asyncio.ensure_future(write())
+        await asyncio.sleep(0.1)
+        assert not waiting.done()  # queued on the gate, not in SQLite's busy handler
+        writing.commit()
+        writing.close()
+        await asyncio.wait_for(waiting, 5)
+        async with async_engine.connect() as reader:
+            return (await reader.execute(text("SELECT source FROM rows ORDER BY id"))).scalars().all()
+
+    try:
+        assert asyncio.run(run()) == ["sync", "async"]
+        assert not gate._held
+    finally:
+        asyncio.run(async_engine.dispose())
+        engine.dispose()
+
+
+def test_gate_wakes_waiters_in_arrival_order_and_times_out():
+    gate, order = WriteGate(), []
+    gate.acquire(1)
+
+    def wait(n: int) -> None:
+        gate.acquire(5)
+        order.append(n)
+        gate.release()
+
+    threads = []
+    for n in range(3):
+        threads.append(threading.Thread(target=wait, args=(n,)))
+        threads[-1].start()
+        while len(gate._waiters) <= n:
+            pass
+    with pytest.raises(exc.TimeoutError):
+        asyncio.run(gate.acquire_async(0.05))
+    gate.release()
+    for t in threads:
+        t.join()
+    assert order == [0, 1, 2]
+    assert not gate._held and not gate._waiters
@@ -0,0 +1 @@
+# Benchmarks for the backend. Run from backend/, e.g. `python -m benchmarks.bench_cost_import`.
@@ -0,0 +1,21 @@
+# Shared setup: point the app at a scratch SQLite database before it is imported
+import os
+import tempfile
+from pathlib import Path
+
+
+def use_scratch_database(prefix: str = "bench-") -> Path:
+    """Set DATABASE_URL to a fresh SQLite file unless one is already configured."""
+    if os.environ.get("BENCH_DATABASE_URL"):
+        os.environ["DATABASE_URL"] = os.environ["BENCH_DATABASE_URL"]
+        return Path(os.environ["BENCH_DATABASE_URL"])
+    path = Path(tempfile.mkdtemp(prefix=prefix)) / "bench.sqlite"
+    os.environ["DATABASE_URL"] = f"sqlite:///{path.as_posix()}"
+    return path
+
+
+def create_schema() -> None:
+    from app.db.database import engine
+    from app.models import Base
+
+    Base.metadata.create_all(engine)
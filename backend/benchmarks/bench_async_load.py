@@ -0,0 +1,132 @@
+"""Throughput of the same endpoint served sync (threadpool) and async (event loop).
+
+    python -m benchmarks.bench_async_load --concurrency 1 64 256 --requests 1000 --threads 8
+
+Mounts two copies of the contract-summary read on a throwaway app: one as a
+`def` handler on the sync engine, one as an `async def` handler on the async
+engine, and drives each with httpx at several concurrency levels. Sync handlers
+are capped by the threadpool (--threads mirrors a small worker pool); async
+handlers are capped by the database. --io-wait-ms adds a sleep next to the
+query to stand in for round trips to a remote Postgres. With a 50 ms wait the
+sync handlers level off at about threads / wait (~130 req/s here) while the
+async ones keep scaling until the process runs out of CPU (~300 req/s); with a
+local SQLite file and a few ms of wait both are CPU-bound and close.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+from benchmarks._db import create_schema, use_scratch_database
+
+
+def build_app(io_wait_ms: float):
+    import anyio
+    from fastapi import Depends, FastAPI
+    from sqlalchemy.ext.asyncio import AsyncSession
+    from sqlalchemy.orm import Session
+
+    from app.db.database import get_async_db, get_db
+    from app.Domains.turnarounds.cost_service import compute_summary, ensure_cost_row
+
+    app = FastAPI()
+    wait = io_wait_ms / 1000
+
+    @app.get("/sync/{wp_id}")
+    def sync_summary(wp_id: str, db: Session = Depends(get_db)):
+        if wait:
+            time.sleep(wait)
+        return compute_summary(db, ensure_cost_row(db, wp_id))
+
+    @app.get("/async/{wp_id}")
+    async def async_summary(wp_id: str, db: AsyncSession = Depends(get_async_db)):
+        if wait:
+            await anyio.sleep(wait)
+        cost = await db.run_sync(ensure_cost_row, wp_id)
+        return await db.run_sync(compute_summary, cost)
+
+    return app
+
+
+async def drive(client, path: str, total: int, concurrency: int) -> dict[str, float]:
+    latencies: list[float] = []
+    remaining = iter(range(total))
+
+    async def worker() -> None:
+        for _ in remaining:
+            started = time.perf_counter()
+            response = await client.get(path)
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "requests_per_second": round(total / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99) - 1] * 1000, 2),
+    }
+
+
+async def run(args) -> dict:
+    import httpx
+    from anyio.to_thread import current_default_thread_limiter
+
+    import app.models  # noqa: F401  (registers every model before the domain modules import them)
+    from app.db.database import SessionLocal, async_engine
+    from app.Domains.turnarounds.cost_service import ensure_cost_row
+    from app.Domains.turnarounds.models import Discipline, WorkPackage
+
+    with SessionLocal() as db:
+        wp = WorkPackage(title="Load test", discipline=Discipline.MECHANICAL)
+        db.add(wp)
+        db.commit()
+        wp_id = wp.id
+        ensure_cost_row(db, wp_id)  # created up front so concurrent first reads don't race to insert it
+
+    current_default_thread_limiter().total_tokens = args.threads
+    app = build_app(args.io_wait_ms)
+    results: dict[str, dict] = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for kind in ("sync", "async"):
+            await drive(client, f"/{kind}/{wp_id}", 50, 4)  # warm pools and caches
+            results[kind] = {
+                str(c): await drive(client, f"/{kind}/{wp_id}", args.requests, c) for c in args.concurrency
+            }
+    await async_engine.dispose()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 64, 256])
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--threads", type=int, default=8, help="threadpool size for the sync handlers")
+    parser.add_argument("--io-wait-ms", type=float, default=50.0)
+    args = parser.parse_args()
+
+    use_scratch_database()
+    create_schema()
+    results = asyncio.run(run(args))
+    print(
+        json.dumps(
+            {
+                "benchmark": "async_load",
+                "threads": args.threads,
+                "io_wait_ms": args.io_wait_ms,
+                "requests": args.requests,
+                **results,
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""CPU time and allocations of serving one long chat transcript, old path vs serialize-once.
+
+    python -m benchmarks.bench_chat_serialization --messages 5000 --repeat 20
+
+Seeds one session of --messages messages, alternating user text and assistant
+content_json payloads, and serves it through three handlers on a throwaway app:
+
+    models_stdlib   ORM objects -> ChatMessageOut -> response_model validation -> stdlib JSONResponse (before)
+    models_orjson   the same, with ORJSONResponse as the response class (the new app default alone)
+    fragments       id/role/text plus content_json as stored JSON text in an orjson Fragment (current route)
+
+Each is timed end to end in-process through httpx: wall and CPU ms per request
+(medians), then peak traced allocation for one request under tracemalloc. All
+three bodies are checked to decode to the same JSON. On 5000 messages (~3.5 MB
+of JSON) the old path spends ~360 ms CPU and peaks at ~28 MB; orjson alone
+saves ~15%; fragments take ~30 ms and ~9 MB.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+import tracemalloc
+
+from benchmarks._db import create_schema, use_scratch_database
+
+
+def seed(messages: int, seed_value: int) -> int:
+    import app.models  # noqa: F401  (registers every model before the domain modules import them)
+    from sqlalchemy import insert
+
+    from app.db.database import SessionLocal
+    from app.models.chat_message import ChatMessage
+    from app.models.chat_session import ChatSession
+
+    rnd = random.Random(seed_value)
+    words = "pump seal valve flange leak gasket inspect replace torque bolt heat exchanger vessel nozzle weld".split()
+
+    def sentence(n: int) -> str:
+        return " ".join(rnd.choices(words, k=n)).capitalize() + "."
+
+    def payload() -> dict:
+        return {
+            "version": "v1",
+            "summary": sentence(12),
+            "sections": [
+                {"key": f"s{i}", "title": sentence(3), "items": [{"kind": "list", "content": [sentence(10) for _ in range(4)]}]}
+                for i in range(3)
+            ],
+        }
+
+    with SessionLocal() as db:
+        session = ChatSession(domain_id="turnaround", title="Bench transcript")
+        db.add(session)
+        db.flush()
+        db.execute(
+            insert(ChatMessage),
+            [
+                dict(session_id=session.id, role="user", content_text=sentence(20))
+                if i % 2 == 0
+                else dict(session_id=session.id, role="assistant", content_json=payload())
+                for i in range(messages)
+            ],
+        )
+        db.commit()
+        return session.id
+
+
+def build_app():
+    from fastapi import Depends, FastAPI
+    from fastapi.responses import JSONResponse, ORJSONResponse
+    from sqlalchemy import select
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from app.db.database import get_async_db
+    from app.models.chat_message import ChatMessage
+    from app.schemas.chat import ChatMessageOut
+    from app.services.chat.service import ChatService
+
+    app = FastAPI()
+    service = ChatService()
+
+    async def as_models(db: AsyncSession, session_id: int) -> list[ChatMessageOut]:
+        # The handler as it was: ORM objects copied into response models by hand
+        rows = (
+            await db.scalars(select(ChatMessage).where(ChatMessage.session_id == session_id).order_by(ChatMessage.created_at.asc()))
+        ).all()
+        return [ChatMessageOut(id=r.id, role=r.role, content_json=r.content_json, content_text=r.content_text) for r in rows]
+
+    @app.get("/models_stdlib/{session_id}", response_model=list[ChatMessageOut], response_class=JSONResponse)
+    async def models_stdlib(session_id: int, db: AsyncSession = Depends(get_async_db)):
+        return await as_models(db, session_id)
+
+    @app.get("/models_orjson/{session_id}", response_model=list[ChatMessageOut], response_class=ORJSONResponse)
+    async def models_orjson(session_id: int, db: AsyncSession = Depends(get_async_db)):
+        return await as_models(db, session_id)
+
+    @app.get("/fragments/{session_id}", response_model=list[ChatMessageOut])
+    async def fragments(session_id: int, db: AsyncSession = Depends(get_async_db)):
+        return ORJSONResponse(await service.list_messages(db, session_id))
+
+    return app
+
+
+async def run(session_id: int, repeat: int) -> dict:
+    import httpx
+
+    from app.db.database import async_engine, async_read_engine
+
+    app = build_app()
+    results: dict[str, dict] = {}
+    bodies = {}
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+            for name in ("models_stdlib", "models_orjson", "fragments"):
+                path = f"/{name}/{session_id}"
+                bodies[name] = (await client.get(path)).content  # warm-up
+                wall, cpu = [], []
+                for _ in range(repeat):
+                    w, c = time.perf_counter(), time.process_time()
+                    response = await client.get(path)
+                    response.raise_for_status()
+                    wall.append(time.perf_counter() - w)
+                    cpu.append(time.process_time() - c)
+                tracemalloc.start()
+                await client.get(path)
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                results[name] = {
+                    "wall_ms": round(statistics.median(wall) * 1000, 2),
+                    "cpu_ms": round(statistics.median(cpu) * 1000, 2),
+                    "peak_alloc_mb": round(peak / 2**20, 2),
+                    "body_kb": round(len(bodies[name]) / 1024, 1),
+                }
+    finally:
+        await async_engine.dispose()
+        await async_read_engine.dispose()
+
+    decoded = {name: json.loads(body) for name, body in bodies.items()}
+    if not decoded["models_stdlib"] == decoded["models_orjson"] == decoded["fragments"]:
+        raise AssertionError("handlers returned different JSON")
+    base = results["models_stdlib"]
+    for stats in results.values():
+        stats["cpu_vs_before"] = round(stats["cpu_ms"] / base["cpu_ms"], 2)
+        stats["alloc_vs_before"] = round(stats["peak_alloc_mb"] / base["peak_alloc_mb"], 2)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args()
+
+    use_scratch_database("bench-chat-json-")
+    create_schema()
+    session_id = seed(args.messages, args.seed)
+    results = asyncio.run(run(session_id, args.repeat))
+    print(json.dumps({"benchmark": "chat_serialization", "messages": args.messages, "repeat": args.repeat, **results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Throughput and memory of the streaming cost import.
+
+    python -m benchmarks.bench_cost_import --rows 100000 --format csv
+
+Generates a breakdown-item spreadsheet on disk, imports it through the same code
+path as the upload endpoint and reports rows/second. With --trace-memory the
+peak Python allocation is reported too; it should stay flat as --rows grows.
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import random
+import time
+import tracemalloc
+from pathlib import Path
+
+from benchmarks._db import create_schema, use_scratch_database
+
+
+def write_csv(path: Path, rows: int, bad_every: int) -> None:
+    rnd = random.Random(42)
+    with path.open("w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(["Item", "Description", "Value Amount"])
+        for i in range(rows):
+            value = f"{rnd.uniform(10, 250000):.2f}" if not bad_every or i % bad_every else "-1"
+            w.writerow([f"Line {i}", f"Tender line {i} scope text", value])
+
+
+def write_xlsx(path: Path, rows: int, bad_every: int) -> None:
+    from openpyxl import Workbook
+
+    rnd = random.Random(42)
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+    ws.append(["Item", "Description", "Value Amount"])
+    for i in range(rows):
+        value = round(rnd.uniform(10, 250000), 2) if not bad_every or i % bad_every else -1
+        ws.append([f"Line {i}", f"Tender line {i} scope text", value])
+    wb.save(path)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--format", choices=["csv", "xlsx"], default="csv")
+    parser.add_argument("--bad-every", type=int, default=100, help="Make every Nth row invalid (0 = none).")
+    parser.add_argument("--trace-memory", action="store_true")
+    args = parser.parse_args()
+
+    db_path = use_scratch_database()
+    create_schema()
+
+    from app.db.database import SessionLocal
+    from app.Domains.turnarounds.cost_import import import_breakdown_items, iter_upload_rows
+    from app.Domains.turnarounds.cost_service import ensure_cost_row
+    from app.Domains.turnarounds.models import Discipline, WorkPackage
+
+    src = db_path.parent / f"import.{args.format}"
+    (write_csv if args.format == "csv" else write_xlsx)(src, args.rows, args.bad_every)
+
+    db = SessionLocal()
+    try:
+        wp = WorkPackage(title="Import benchmark", discipline=Discipline.MECHANICAL)
+        db.add(wp)
+        db.commit()
+        cost = ensure_cost_row(db, wp.id)
+        if args.trace_memory:
+            tracemalloc.start()
+        started = time.perf_counter()
+        with src.open("rb") as f:
+            result = import_breakdown_items(db, cost, iter_upload_rows(f, src.name))
+        elapsed = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1] if args.trace_memory else None
+    finally:
+        db.close()
+
+    print(
+        json.dumps(
+            {
+                "benchmark": "cost_import",
+                "format": args.format,
+                "file_bytes": src.stat().st_size,
+                "rows_read": result.rows_read,
+                "rows_imported": result.rows_imported,
+                "rows_failed": result.rows_failed,
+                "seconds": round(elapsed, 3),
+                "rows_per_second": round(result.rows_read / elapsed, 1),
+                "peak_traced_bytes": peak,
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
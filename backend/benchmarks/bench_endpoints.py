@@ -0,0 +1,308 @@
+"""Latency percentiles and throughput of the hot chat, auth and cost endpoints.
+
+    python -m benchmarks.bench_endpoints --mode both --concurrency 1 16 64 --out results.json
+    python -m benchmarks.compare baseline.json results.json
+
+Seeds a scratch database (a user with --sessions chat sessions of --messages
+messages each, and a work package with a cost row, breakdown items and
+variation orders) from a fixed --seed, then drives each endpoint at every
+--concurrency level. `inprocess` calls the ASGI app through httpx without a
+socket, which isolates the app's own cost; `uvicorn` starts the app in a
+uvicorn subprocess on a local port and drives it over HTTP, which adds the
+server, the socket and JSON over the wire. Every endpoint gets a short warm-up
+first so pools and caches are filled before timing starts.
+
+Login hashes with bcrypt on purpose, so its throughput is bounded by the
+threadpool and CPU, not the database. Non-2xx responses are counted as errors
+rather than aborting the run.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Any, Optional
+
+from benchmarks._db import create_schema, use_scratch_database
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+EMAIL = "bench@example.com"
+PASSWORD = "bench-password"
+
+
+@dataclass(frozen=True)
+class Endpoint:
+    method: str
+    path: str
+    body: Optional[dict] = None
+    auth: bool = True
+
+
+def seed(sessions: int, messages: int, items: int, seed_value: int) -> dict[str, Any]:
+    import app.models  # noqa: F401  (registers every model before the domain modules import them)
+    from sqlalchemy import insert
+
+    from app.core import security
+    from app.db.database import SessionLocal
+    from app.Domains.turnarounds.cost_models import CostBreakdownItem, VariationOrder, VariationOrderStatus
+    from app.Domains.turnarounds.cost_service import ensure_cost_row
+    from app.Domains.turnarounds.models import Discipline, WorkPackage
+    from app.Domains.users.models import User
+    from app.models.chat_message import ChatMessage
+    from app.models.chat_session import ChatSession
+
+    rnd = random.Random(seed_value)
+    try:
+        password_hash = security.hash_password(PASSWORD)
+    except Exception as exc:  # a broken bcrypt backend should not stop the other endpoints
+        print(f"warning: cannot hash the bench password ({exc}); /auth/login will only return errors", file=sys.stderr)
+        password_hash = None
+
+    with SessionLocal() as db:
+        user = User(email=EMAIL, password_hash=password_hash, is_active=True)
+        wp = WorkPackage(title="Bench", discipline=Discipline.MECHANICAL)
+        db.add_all([user, wp])
+        db.commit()
+        cost = ensure_cost_row(db, wp.id)
+
+        words = "pump seal valve flange leak gasket inspect replace torque bolt heat exchanger".split()
+        session_ids = []
+        for n in range(sessions):
+            session = ChatSession(domain_id="turnaround", user_id=user.id, title=None if n % 3 == 0 else f"Session {n}")
+            db.add(session)
+            db.flush()
+            session_ids.append(session.id)
+            db.execute(
+                insert(ChatMessage),
+                [
+                    dict(
+                        session_id=session.id,
+                        role="user" if m % 2 == 0 else "assistant",
+                        content_text=" ".join(rnd.choices(words, k=rnd.randint(5, 60))),
+                    )
+                    for m in range(messages)
+                ],
+            )
+        db.execute(
+            insert(CostBreakdownItem),
+            [
+                dict(work_package_cost_id=cost.id, item=f"Item {i}", description="Bench item", value_amount=round(rnd.uniform(10, 5e4), 2))
+                for i in range(items)
+            ],
+        )
+        db.execute(
+            insert(VariationOrder),
+            [
+                dict(
+                    work_package_cost_id=cost.id, vo_number=f"VO-{i}", value_amount=round(rnd.uniform(100, 5e4), 2),
+                    status=rnd.choice(list(VariationOrderStatus)), date_raised=date(2025, 10, 1),
+                )
+                for i in range(max(items // 10, 1))
+            ],
+        )
+        db.commit()
+        return {"email": EMAIL, "wp_id": wp.id, "session_id": session_ids[len(session_ids) // 2]}
+
+
+def endpoints(ids: dict[str, Any]) -> dict[str, Endpoint]:
+    cost = f"/api/v1/turnarounds/work-packages/{ids['wp_id']}/cost"
+    return {
+        "chat_sessions": Endpoint("GET", "/api/v1/chat/sessions"),
+        "chat_messages": Endpoint("GET", f"/api/v1/chat/sessions/{ids['session_id']}/messages"),
+        "auth_login": Endpoint("POST", "/api/v1/auth/login", body={"email": EMAIL, "password": PASSWORD}, auth=False),
+        "auth_me": Endpoint("GET", "/api/v1/auth/me"),
+        "cost_summary": Endpoint("GET", f"{cost}/summary"),
+        "cost_breakdown_items": Endpoint("GET", f"{cost}/breakdown-items"),
+    }
+
+
+def summarize(latencies: list[float], errors: int, elapsed: float) -> dict[str, float]:
+    latencies.sort()
+    total = len(latencies)
+
+    def pct(p: float) -> float:
+        return round(latencies[min(int(total * p), total - 1)] * 1000, 3) if total else 0.0
+
+    return {
+        "requests": total,
+        "errors": errors,
+        "requests_per_second": round(total / elapsed, 1) if elapsed else 0.0,
+        "mean_ms": round(sum(latencies) / total * 1000, 3) if total else 0.0,
+        "p50_ms": pct(0.50),
+        "p90_ms": pct(0.90),
+        "p99_ms": pct(0.99),
+        "max_ms": round(latencies[-1] * 1000, 3) if total else 0.0,
+    }
+
+
+async def drive(client, endpoint: Endpoint, headers: dict[str, str], total: int, concurrency: int) -> dict[str, float]:
+    latencies: list[float] = []
+    errors = 0
+    remaining = iter(range(total))
+
+    async def worker() -> None:
+        nonlocal errors
+        for _ in remaining:
+            started = time.perf_counter()
+            response = await client.request(endpoint.method, endpoint.path, json=endpoint.body, headers=headers)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, errors, time.perf_counter() - started)
+
+
+async def run_suite(client, targets: dict[str, Endpoint], token: str, args) -> dict[str, dict]:
+    results: dict[str, dict] = {}
+    for name, endpoint in targets.items():
+        headers = {"Authorization": f"Bearer {token}"} if endpoint.auth else {}
+        await drive(client, endpoint, headers, args.warmup, min(4, args.warmup or 1))
+        results[name] = {}
+        for concurrency in args.concurrency:
+            # bcrypt makes login ~100x slower than the reads; keep its runs short
+            total = max(args.requests // 20, concurrency) if name == "auth_login" else args.requests
+            results[name][str(concurrency)] = await drive(client, endpoint, headers, total, concurrency)
+    return results
+
+
+async def run_inprocess(targets: dict[str, Endpoint], token: str, args) -> dict[str, dict]:
+    import httpx
+
+    from app.db.database import async_engine, async_read_engine
+    from app.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            return await run_suite(client, targets, token, args)
+    finally:
+        await async_engine.dispose()
+        await async_read_engine.dispose()
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def run_uvicorn(targets: dict[str, Endpoint], token: str, args) -> dict[str, dict]:
+    import httpx
+
+    port = _free_port()
+    command = [
+        sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+        "--workers", str(args.workers), "--log-level", "warning", "--no-access-log",
+    ]
+    server = subprocess.Popen(command, cwd=BACKEND_DIR, env=os.environ.copy())
+    base_url = f"http://127.0.0.1:{port}"
+    limits = httpx.Limits(max_connections=max(args.concurrency), max_keepalive_connections=max(args.concurrency))
+    try:
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+            deadline = time.monotonic() + 30
+            while True:
+                if server.poll() is not None:
+                    raise RuntimeError(f"uvicorn exited with code {server.returncode}")
+                try:
+                    if (await client.get("/healthz")).status_code == 200:
+                        break
+                except httpx.TransportError:
+                    pass
+                if time.monotonic() > deadline:
+                    raise RuntimeError("uvicorn did not become healthy within 30 s")
+                await asyncio.sleep(0.1)
+            return await run_suite(client, targets, token, args)
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mode", choices=["inprocess", "uvicorn", "both"], default="inprocess")
+    parser.add_argument("--endpoints", nargs="+", help="subset of endpoint names to run (default: all)")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 16, 64])
+    parser.add_argument("--requests", type=int, default=1000, help="timed requests per endpoint and concurrency level")
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--messages", type=int, default=40)
+    parser.add_argument("--items", type=int, default=500, help="cost breakdown items")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--out", type=Path, help="also write the JSON results to this file")
+    args = parser.parse_args()
+
+    use_scratch_database("bench-endpoints-")
+    create_schema()
+    ids = seed(args.sessions, args.messages, args.items, args.seed)
+
+    from app.core import security
+    from app.db.database import engine, read_engine
+
+    token = security.create_access_token(ids["email"])
+    targets = endpoints(ids)
+    if args.endpoints:
+        unknown = set(args.endpoints) - set(targets)
+        if unknown:
+            parser.error(f"unknown endpoints: {', '.join(sorted(unknown))}; choose from {', '.join(targets)}")
+        targets = {name: targets[name] for name in args.endpoints}
+    # The seeding connections would otherwise hold the SQLite writer while a uvicorn process runs
+    engine.dispose()
+    read_engine.dispose()
+
+    modes = ["inprocess", "uvicorn"] if args.mode == "both" else [args.mode]
+    results = {}
+    for mode in modes:
+        runner = run_inprocess if mode == "inprocess" else run_uvicorn
+        results[mode] = asyncio.run(runner(targets, token, args))
+
+    report = {
+        "benchmark": "endpoints",
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "config": {
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "warmup": args.warmup,
+            "workers": args.workers,
+            "sessions": args.sessions,
+            "messages": args.messages,
+            "items": args.items,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.out:
+        args.out.write_text(text + "\n")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Per-request and per-statement cost of metrics collection.
+
+    python -m benchmarks.bench_metrics_overhead --requests 200000
+
+Drives a bare ASGI app directly (no server, no framework) with and without
+MetricsMiddleware and reports the difference per request, which is the whole
+cost the middleware adds: in-flight gauge, status capture, counter and
+histogram updates. Also times the SQL hooks' work per statement (operation
+parsing plus counter and histogram updates) and a scrape of a populated registry.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+
+from app.core.metrics import DB_LATENCY, DB_STATEMENTS, REGISTRY, MetricsMiddleware, statement_operation
+
+
+class _Route:
+    path = "/api/v1/turnarounds/work-packages/{wp_id}"
+
+
+async def bare_app(scope, receive, send) -> None:
+    scope["route"] = _Route
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def _drive(app, n: int) -> float:
+    scope = {"type": "http", "method": "GET", "path": "/x"}
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message) -> None:
+        pass
+
+    started = time.perf_counter()
+    for _ in range(n):
+        await app(dict(scope), receive, send)
+    return time.perf_counter() - started
+
+
+def _best(fn, repeat: int) -> float:
+    return min(fn() for _ in range(repeat))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200_000)
+    parser.add_argument("--statements", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    n = args.requests
+    bare = _best(lambda: asyncio.run(_drive(bare_app, n)), args.repeat)
+    wrapped = _best(lambda: asyncio.run(_drive(MetricsMiddleware(bare_app), n)), args.repeat)
+
+    statement = "SELECT work_packages.id, work_packages.title FROM work_packages WHERE work_packages.id = ?"
+
+    def sql_hooks() -> float:
+        started = time.perf_counter()
+        for _ in range(args.statements):
+            t0 = time.perf_counter()
+            labels = ("sync", statement_operation(statement))
+            DB_STATEMENTS.inc(labels)
+            DB_LATENCY.observe(time.perf_counter() - t0, labels)
+        return time.perf_counter() - started
+
+    sql = _best(sql_hooks, args.repeat)
+    scrape = _best(lambda: (lambda s: (REGISTRY.render(), time.perf_counter() - s)[1])(time.perf_counter()), args.repeat)
+
+    print(
+        json.dumps(
+            {
+                "benchmark": "metrics_overhead",
+                "requests": n,
+                "bare_us_per_request": round(bare / n * 1e6, 3),
+                "with_metrics_us_per_request": round(wrapped / n * 1e6, 3),
+                "middleware_overhead_us": round((wrapped - bare) / n * 1e6, 3),
+                "sql_hook_us_per_statement": round(sql / args.statements * 1e6, 3),
+                "scrape_ms": round(scrape * 1000, 3),
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
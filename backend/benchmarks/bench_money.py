@@ -0,0 +1,129 @@
+"""Decimal vs integer-cents money aggregation.
+
+    python -m benchmarks.bench_money --amounts 1000000 --packages 100000
+
+Times the paths the cost code used to take with Decimal against the Money /
+int64 equivalents: summing a column of amounts, building contract summaries
+for a portfolio of packages (one object at a time and as int64 arrays), and a
+grouped total over int64 cent arrays. Every pair is checked to produce the same
+totals. Scalar Money arithmetic is pure Python and slower than C Decimal; the
+win is in keeping bulk aggregation on integer arrays.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+from decimal import Decimal
+
+import numpy as np
+
+from app.core.money import Money
+
+
+def _best(fn, repeat: int) -> tuple[float, object]:
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--amounts", type=int, default=1_000_000)
+    parser.add_argument("--packages", type=int, default=100_000)
+    parser.add_argument("--groups", type=int, default=16)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rnd = random.Random(1)
+    raw = [f"{rnd.randint(0, 50_000_000) / 100:.2f}" for _ in range(args.amounts)]
+    decimals = [Decimal(v) for v in raw]
+    money = [Money.of(v) for v in decimals]
+    cents = np.fromiter((m.cents for m in money), dtype=np.int64, count=len(money))
+    groups = np.fromiter((rnd.randrange(args.groups) for _ in range(args.amounts)), dtype=np.int64, count=args.amounts)
+
+    results: dict[str, dict[str, float]] = {}
+
+    def record(name: str, decimal_fn, money_fn, same) -> None:
+        decimal_s, expected = _best(decimal_fn, args.repeat)
+        money_s, actual = _best(money_fn, args.repeat)
+        assert same(expected, actual), name
+        results[name] = {
+            "decimal_ms": round(decimal_s * 1000, 2),
+            "int_cents_ms": round(money_s * 1000, 2),
+            "speedup": round(decimal_s / money_s, 1),
+        }
+
+    record(
+        "sum_column",
+        lambda: sum(decimals, Decimal(0)),
+        lambda: Money(int(cents.sum())),
+        lambda d, m: Money.of(d) == m,
+    )
+
+    quads = [tuple(decimals[(i * 4 + k) % len(decimals)] for k in range(4)) for i in range(args.packages)]
+    money_quads = [tuple(Money.of(v) for v in q) for q in quads]
+
+    def decimal_summaries():
+        out = []
+        for original, allowances, approved, pending in quads:
+            original, approved, pending = Decimal(original or 0), Decimal(approved or 0), Decimal(pending or 0)
+            revised = original + approved
+            out.append((original, Decimal(allowances or 0), revised, revised + pending))
+        return out
+
+    def money_summaries():
+        out = []
+        for original, allowances, approved, pending in money_quads:
+            revised = original + approved
+            out.append((original, allowances, revised, revised + pending))
+        return out
+
+    record(
+        "contract_summaries_scalar",
+        decimal_summaries,
+        money_summaries,
+        lambda d, m: all(Money.of(a) == b for a, b in zip(d[-1], m[-1])) and len(d) == len(m),
+    )
+
+    quad_cents = np.array([[m.cents for m in q] for q in money_quads], dtype=np.int64)
+
+    def int_summaries():
+        original, allowances, approved, pending = quad_cents.T
+        revised = original + approved
+        return np.stack([original, allowances, revised, revised + pending], axis=1)
+
+    record(
+        "contract_summaries_vectorised",
+        decimal_summaries,
+        int_summaries,
+        lambda d, m: [Money.of(v).cents for v in d[-1]] == m[-1].tolist(),
+    )
+
+    def decimal_grouped():
+        totals = [Decimal(0)] * args.groups
+        for g, v in zip(groups.tolist(), decimals):
+            totals[g] += v
+        return totals
+
+    def int_grouped():
+        order = np.argsort(groups, kind="stable")
+        starts = np.searchsorted(groups[order], np.arange(args.groups))
+        return np.add.reduceat(cents[order], starts)
+
+    record(
+        "grouped_totals",
+        decimal_grouped,
+        int_grouped,
+        lambda d, m: [Money.of(v).cents for v in d] == m.tolist(),
+    )
+
+    print(json.dumps({"benchmark": "money", "amounts": args.amounts, "packages": args.packages, **results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Full vs incremental critical-path scheduling on a synthetic work-package graph.
+
+    python -m benchmarks.bench_schedule --nodes 50000 --updates 200
+
+Builds a layered DAG (each package depends on 1-3 packages from earlier layers),
+times the full O(V+E) pass, then applies random date changes and new links
+through the incremental API. With --verify every incremental result is checked
+against a fresh full recompute at the end.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import time
+from datetime import date, timedelta
+
+from app.Domains.turnarounds.schedule import CycleError, ScheduleEngine
+
+
+def synthetic_graph(nodes: int, layers: int, seed: int):
+    rnd = random.Random(seed)
+    base = date(2025, 10, 1)
+    per_layer = max(1, nodes // layers)
+    ids = [f"wp-{i:06d}" for i in range(nodes)]
+    node_rows, edges = [], []
+    for i, wp_id in enumerate(ids):
+        layer = i // per_layer
+        start = base + timedelta(days=rnd.randint(0, 5)) if layer == 0 or rnd.random() < 0.05 else None
+        end = start + timedelta(days=rnd.randint(0, 10)) if start else None
+        node_rows.append((wp_id, start, end))
+        if layer:
+            lo = max(0, (layer - 3) * per_layer)
+            for _ in range(rnd.randint(1, 3)):
+                edges.append((ids[rnd.randint(lo, layer * per_layer - 1)], wp_id, rnd.choice((0, 0, 0, 1, 2))))
+    return node_rows, edges
+
+
+def _timed(fn) -> float:
+    started = time.perf_counter()
+    fn()
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=50_000)
+    parser.add_argument("--layers", type=int, default=200)
+    parser.add_argument("--updates", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--verify", action="store_true")
+    args = parser.parse_args()
+
+    node_rows, edges = synthetic_graph(args.nodes, args.layers, args.seed)
+    started = time.perf_counter()
+    engine = ScheduleEngine.build(node_rows, edges)
+    build_seconds = time.perf_counter() - started
+    recompute_seconds = _timed(engine.recompute)
+
+    rnd = random.Random(args.seed + 1)
+    ids = [row[0] for row in node_rows]
+    date_times, edge_times, visited, cycles = [], [], [], 0
+    for _ in range(args.updates):
+        wp_id = rnd.choice(ids)
+        start = date(2025, 10, 1) + timedelta(days=rnd.randint(0, 60))
+        end = start + timedelta(days=rnd.randint(0, 15))
+        t0 = time.perf_counter()
+        stats = engine.update_node(wp_id, start, end)
+        date_times.append(time.perf_counter() - t0)
+        visited.append(stats["forward_visited"] + stats["backward_visited"])
+
+        pred, succ = rnd.sample(ids, 2)
+        t0 = time.perf_counter()
+        try:
+            engine.add_edge(pred, succ, 0)
+        except CycleError:
+            cycles += 1
+        edge_times.append(time.perf_counter() - t0)
+
+    mismatches = None
+    if args.verify:
+        fresh = ScheduleEngine.build(
+            [(wp_id, *_dates(engine, wp_id)) for wp_id in ids],
+            [(ids[u], ids[v], lag) for u in range(len(ids)) for v, lag in engine.succ[u].items()],
+        )
+        mismatches = sum(1 for wp_id in ids if fresh.node(wp_id) != engine.node(wp_id))
+
+    def ms(values: list[float]) -> dict[str, float]:
+        values = sorted(values)
+        return {
+            "median_ms": round(statistics.median(values) * 1000, 3),
+            "p95_ms": round(values[int(len(values) * 0.95) - 1] * 1000, 3),
+        }
+
+    print(
+        json.dumps(
+            {
+                "benchmark": "schedule",
+                "nodes": args.nodes,
+                "edges": len(edges),
+                "build_seconds": round(build_seconds, 3),
+                "full_recompute_seconds": round(recompute_seconds, 3),
+                "update_dates": ms(date_times),
+                "add_edge": ms(edge_times),
+                "median_nodes_visited": statistics.median(visited),
+                "rejected_cycles": cycles,
+                "verify_mismatches": mismatches,
+            },
+            indent=2,
+        )
+    )
+
+
+def _dates(engine: ScheduleEngine, wp_id: str):
+    """Reconstruct (start, end) from the engine's stored constraint and duration."""
+    v = engine.index[wp_id]
+    if engine.constraint[v] is None:
+        return None, None
+    start = date.fromordinal(engine.constraint[v])
+    return start, start + timedelta(days=engine.duration[v] - 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""Build, query and incremental-refresh timings of the dashboards analytics snapshot.
+
+    python -m benchmarks.bench_snapshot --packages 50000 --touch 200
+
+Seeds work packages with cost rows, RTO suppliers and variation orders, builds
+the columnar snapshot, times a few group-by queries against it and against the
+equivalent SQL aggregate, then updates --touch packages and times the
+incremental refresh.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import time
+import uuid
+from datetime import date, datetime, timedelta
+
+from benchmarks._db import create_schema, use_scratch_database
+
+
+def seed(db, packages: int, seed_value: int) -> list[str]:
+    from sqlalchemy import insert
+
+    from app.Domains.turnarounds.cost_models import (
+        RequisitionToOrder,
+        VariationOrder,
+        VariationOrderStatus,
+        WorkPackageCost,
+        WorkPackageCostStatus,
+    )
+    from app.Domains.turnarounds.models import Discipline, WorkPackage, WorkPackageStatus
+
+    rnd = random.Random(seed_value)
+    now = datetime.utcnow()
+    suppliers = [f"Supplier {i}" for i in range(40)]
+    wps, costs, rtos, vos = [], [], [], []
+    for _ in range(packages):
+        wp_id, cost_id = str(uuid.uuid4()), str(uuid.uuid4())
+        start = date(2025, 10, 1) + timedelta(days=rnd.randint(0, 60))
+        wps.append(
+            dict(
+                id=wp_id, title="Bench", discipline=rnd.choice(list(Discipline)), status=rnd.choice(list(WorkPackageStatus)),
+                start_date=start, end_date=start + timedelta(days=rnd.randint(0, 20)), created_at=now, updated_at=now,
+            )
+        )
+        costs.append(
+            dict(
+                id=cost_id, work_package_id=wp_id, status=rnd.choice(list(WorkPackageCostStatus)),
+                original_contract_price=round(rnd.uniform(1e3, 5e5), 2), allowances=0, locked=False,
+                created_at=now, updated_at=now,
+            )
+        )
+        rtos.append(dict(id=str(uuid.uuid4()), work_package_cost_id=cost_id, supplier=rnd.choice(suppliers), subtotal_amount=0, created_at=now, updated_at=now))
+        for n in range(rnd.randint(0, 3)):
+            vos.append(
+                dict(
+                    id=str(uuid.uuid4()), work_package_cost_id=cost_id, vo_number=f"VO-{n}", value_amount=round(rnd.uniform(100, 5e4), 2),
+                    status=rnd.choice(list(VariationOrderStatus)), date_raised=start, created_at=now, updated_at=now,
+                )
+            )
+    for model, rows in ((WorkPackage, wps), (WorkPackageCost, costs), (RequisitionToOrder, rtos), (VariationOrder, vos)):
+        for i in range(0, len(rows), 5000):
+            db.execute(insert(model), rows[i : i + 5000])
+    db.commit()
+    return [row["id"] for row in wps]
+
+
+def _ms(fn, repeat: int = 5) -> float:
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - started)
+    return round(statistics.median(times) * 1000, 3)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--packages", type=int, default=50_000)
+    parser.add_argument("--touch", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args()
+
+    use_scratch_database()
+    create_schema()
+
+    import app.models  # noqa: F401  (registers every model before the domain modules import them)
+    from sqlalchemy import func, select, update
+
+    from app.db.database import SessionLocal
+    from app.Domains.turnarounds.cost_models import WorkPackageCost
+    from app.Domains.turnarounds.models import WorkPackage
+    from app.Domains.turnarounds.snapshot import build_snapshot, refresh_snapshot
+
+    db = SessionLocal()
+    try:
+        ids = seed(db, args.packages, args.seed)
+        started = time.perf_counter()
+        snapshot = build_snapshot(db)
+        build_seconds = time.perf_counter() - started
+
+        queries = {
+            "by_discipline_status": lambda: snapshot.query(["discipline", "status"]),
+            "by_supplier_filtered": lambda: snapshot.query(
+                ["supplier"], {"discipline": ["Mechanical", "Civil"]}, date(2025, 10, 15), date(2025, 11, 15)
+            ),
+        }
+        query_ms = {name: _ms(fn) for name, fn in queries.items()}
+        sql_ms = _ms(
+            lambda: db.execute(
+                select(WorkPackage.discipline, WorkPackage.status, func.count(), func.sum(WorkPackageCost.original_contract_price))
+                .join(WorkPackageCost, WorkPackageCost.work_package_id == WorkPackage.id)
+                .group_by(WorkPackage.discipline, WorkPackage.status)
+            ).all()
+        )
+
+        touched = random.Random(args.seed + 1).sample(ids, min(args.touch, len(ids)))
+        time.sleep(0.01)  # make sure the new updated_at values sort after the watermark
+        db.execute(
+            update(WorkPackageCost)
+            .where(WorkPackageCost.work_package_id.in_(touched))
+            .values(original_contract_price=WorkPackageCost.original_contract_price + 1)
+        )
+        db.commit()
+        started = time.perf_counter()
+        refreshed = refresh_snapshot(db, snapshot)
+        refresh_seconds = time.perf_counter() - started
+    finally:
+        db.close()
+
+    print(
+        json.dumps(
+            {
+                "benchmark": "analytics_snapshot",
+                "packages": len(refreshed),
+                "build_seconds": round(build_seconds, 3),
+                "query_ms": query_ms,
+                "sql_group_by_ms": sql_ms,
+                "touched": len(touched),
+                "incremental_refresh_seconds": round(refresh_seconds, 3),
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
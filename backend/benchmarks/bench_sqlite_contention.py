@@ -0,0 +1,115 @@
+"""Write throughput and read latency on SQLite under contention, default vs tuned profile.
+
+    python -m benchmarks.bench_sqlite_contention --writers 8 --readers 8 --seconds 5
+
+Runs the same workload twice against a fresh database file: --writers threads
+committing one small insert per transaction and --readers threads running an
+indexed range query. "default" is what database.py used to build (rollback
+journal, pysqlite's 5 s busy timeout, a shared 5+10 connection pool); "tuned"
+is the production profile (WAL and the pragmas in sqlite_pragmas, writers
+queuing on the file's write gate, and a separate query_only read pool).
+Reports commits per second, "database is locked" errors and read latencies.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+SCHEMA = [
+    "CREATE TABLE bench_rows (id INTEGER PRIMARY KEY, writer INTEGER NOT NULL, payload TEXT NOT NULL)",
+    "CREATE INDEX ix_bench_rows_writer ON bench_rows (writer, id)",
+]
+
+
+def run(write_engine, read_engine, writers: int, readers: int, seconds: float) -> dict:
+    stop = threading.Event()
+    commits, locked, latencies = [0] * writers, [0] * (writers + readers), []
+    lock = threading.Lock()
+
+    def writer(n: int) -> None:
+        payload = "x" * 200
+        while not stop.is_set():
+            try:
+                with write_engine.begin() as conn:
+                    conn.execute(text("INSERT INTO bench_rows (writer, payload) VALUES (:w, :p)"), {"w": n, "p": payload})
+                commits[n] += 1
+            except OperationalError:
+                locked[n] += 1
+
+    def reader(n: int) -> None:
+        mine = []
+        while not stop.is_set():
+            started = time.perf_counter()
+            try:
+                with read_engine.connect() as conn:
+                    conn.execute(
+                        text("SELECT count(*), max(id) FROM bench_rows WHERE writer = :w AND id > (SELECT max(id) - 500 FROM bench_rows)"),
+                        {"w": n % max(writers, 1)},
+                    ).one()
+            except OperationalError:
+                locked[writers + n] += 1
+                continue
+            mine.append(time.perf_counter() - started)
+        with lock:
+            latencies.extend(mine)
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(writers)]
+    threads += [threading.Thread(target=reader, args=(n,)) for n in range(readers)]
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+
+    latencies.sort()
+    return {
+        "commits_per_second": round(sum(commits) / seconds, 1),
+        "locked_errors": sum(locked),
+        "reads_per_second": round(len(latencies) / seconds, 1),
+        "read_p50_ms": round(statistics.median(latencies) * 1000, 3) if latencies else None,
+        "read_p99_ms": round(latencies[max(int(len(latencies) * 0.99) - 1, 0)] * 1000, 3) if latencies else None,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    from app.db.database import build_engine
+
+    results = {}
+    for profile in ("default", "tuned"):
+        url = f"sqlite:///{(Path(tempfile.mkdtemp(prefix='bench-sqlite-')) / 'bench.sqlite').as_posix()}"
+        if profile == "default":
+            write_engine = read_engine = create_engine(url, connect_args={"check_same_thread": False}, pool_pre_ping=True)
+        else:
+            write_engine, read_engine = build_engine(url), build_engine(url, read_only=True)
+        with write_engine.begin() as conn:
+            for statement in SCHEMA:
+                conn.execute(text(statement))
+        results[profile] = run(write_engine, read_engine, args.writers, args.readers, args.seconds)
+        write_engine.dispose()
+        read_engine.dispose()
+
+    print(
+        json.dumps(
+            {"benchmark": "sqlite_contention", "writers": args.writers, "readers": args.readers, "seconds": args.seconds, **results},
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""Cold-start cost of a worker: importing the app, running its lifespan startup, and serving the first request.
+
+    python -m benchmarks.bench_startup --runs 5 --top 15
+    python -m benchmarks.bench_startup --runs 5 --uvicorn --admin
+
+Every measurement runs in a fresh interpreter, so nothing is already imported
+or cached. `import_ms` is the wall time of `import app.main`; `packages`
+breaks the `-X importtime` self times down by top-level package and `modules`
+lists the slowest individual modules, which is where to look for imports worth
+deferring. `startup_ms` times the lifespan startup (pool warm-up, bootstrap
+checks) and `shutdown_ms` its shutdown. With --uvicorn, `first_response_ms`
+is the time from spawning a uvicorn process to its first 200 from /healthz.
+--admin sets ADMIN_EMAIL/ADMIN_PASSWORD so the first-admin bootstrap (a bcrypt
+hash) runs during the first startup. Medians across --runs are reported.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from collections import defaultdict
+from pathlib import Path
+
+from benchmarks._db import create_schema, use_scratch_database
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+# Prints import and lifespan timings as JSON from a fresh interpreter
+_PROBE = """
+import asyncio, json, time
+started = time.perf_counter()
+import app.main
+imported = time.perf_counter()
+
+async def cycle():
+    context = app.main.app.router.lifespan_context(app.main.app)
+    t0 = time.perf_counter()
+    await context.__aenter__()
+    t1 = time.perf_counter()
+    await context.__aexit__(None, None, None)
+    return t1 - t0, time.perf_counter() - t1
+
+startup, shutdown = asyncio.run(cycle())
+print(json.dumps({"import_ms": (imported - started) * 1000, "startup_ms": startup * 1000, "shutdown_ms": shutdown * 1000}))
+"""
+
+
+def _python(*args: str) -> subprocess.CompletedProcess:
+    done = subprocess.run([sys.executable, *args], cwd=BACKEND_DIR, capture_output=True, text=True)
+    if done.returncode:
+        raise RuntimeError(f"probe failed:\n{done.stderr[-2000:]}")
+    return done
+
+
+def probe() -> dict[str, float]:
+    return json.loads(_python("-c", _PROBE).stdout.strip().splitlines()[-1])
+
+
+def import_profile() -> list[tuple[str, int, int]]:
+    """(module, self µs, cumulative µs) for every module `import app.main` loads."""
+    rows = []
+    for line in _python("-X", "importtime", "-c", "import app.main").stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|")
+        rows.append((module.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def first_response() -> float:
+    port = _free_port()
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+    )
+    try:
+        while time.perf_counter() - started < 60:
+            if server.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with code {server.returncode}")
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/healthz", timeout=1) as response:
+                    if response.status == 200:
+                        return (time.perf_counter() - started) * 1000
+            except OSError:
+                time.sleep(0.005)
+        raise RuntimeError("uvicorn did not answer /healthz within 60 s")
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="slowest modules and packages to list")
+    parser.add_argument("--uvicorn", action="store_true", help="also time a uvicorn process to its first response")
+    parser.add_argument("--admin", action="store_true", help="run the first-admin bootstrap on the first startup")
+    args = parser.parse_args()
+
+    use_scratch_database("bench-startup-")
+    create_schema()
+    if args.admin:
+        os.environ.update(ADMIN_EMAIL="admin@example.com", ADMIN_PASSWORD="bench-admin-password")
+
+    probes = [probe() for _ in range(args.runs)]
+    first = [first_response() for _ in range(args.runs)] if args.uvicorn else []
+
+    profiles = [import_profile() for _ in range(args.runs)]
+    by_module: dict[str, list[int]] = defaultdict(list)
+    by_package: dict[str, list[int]] = defaultdict(list)
+    for profile in profiles:
+        packages: dict[str, int] = defaultdict(int)
+        for module, self_us, _ in profile:
+            by_module[module].append(self_us)
+            packages[module.split(".")[0]] += self_us
+        for package, total in packages.items():
+            by_package[package].append(total)
+
+    def top(samples: dict[str, list[int]]) -> dict[str, float]:
+        medians = {name: statistics.median(values) / 1000 for name, values in samples.items()}
+        return {name: round(ms, 2) for name, ms in sorted(medians.items(), key=lambda kv: -kv[1])[: args.top]}
+
+    result = {
+        "benchmark": "startup",
+        "runs": args.runs,
+        "admin_bootstrap": args.admin,
+        **{key: round(statistics.median(p[key] for p in probes), 2) for key in ("import_ms", "startup_ms", "shutdown_ms")},
+    }
+    if first:
+        result["first_response_ms"] = round(statistics.median(first), 2)
+    result["packages"] = top(by_package)
+    result["modules"] = top(by_module)
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Compare two bench_endpoints result files and flag regressions.
+
+    python -m benchmarks.compare baseline.json results.json --threshold 0.10 --tail-threshold 0.25
+
+Matches runs by mode, endpoint and concurrency. A run regresses when its
+throughput drops, or its median latency rises, by more than --threshold, when
+its p99 rises by more than --tail-threshold (tails are noisier), or when it
+returns errors the baseline did not. Prints one line per run and exits with
+status 1 if anything regressed, so it can gate CI. Runs present in only one
+file are listed but never fail the comparison.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Iterator
+
+
+def runs(report: dict) -> Iterator[tuple[str, dict]]:
+    for mode, by_endpoint in report["results"].items():
+        for endpoint, by_concurrency in by_endpoint.items():
+            for concurrency, stats in by_concurrency.items():
+                yield f"{mode}/{endpoint}/c{concurrency}", stats
+
+
+def _change(before: float, after: float) -> float:
+    return (after - before) / before if before else 0.0
+
+
+def compare(baseline: dict, current: dict, threshold: float, tail_threshold: float) -> tuple[list[str], list[str]]:
+    """Return (report lines, regression descriptions)."""
+    before, after = dict(runs(baseline)), dict(runs(current))
+    lines, regressions = [], []
+    header = f"{'run':<44} {'req/s':>17} {'p50 ms':>17} {'p99 ms':>17}  errors"
+    lines.append(header)
+    for key in sorted(before.keys() | after.keys()):
+        if key not in before or key not in after:
+            lines.append(f"{key:<44} only in {'baseline' if key in before else 'current'}")
+            continue
+        old, new = before[key], after[key]
+        problems = []
+        rps = _change(old["requests_per_second"], new["requests_per_second"])
+        p50 = _change(old["p50_ms"], new["p50_ms"])
+        p99 = _change(old["p99_ms"], new["p99_ms"])
+        if rps < -threshold:
+            problems.append(f"throughput {rps:+.0%}")
+        if p50 > threshold:
+            problems.append(f"p50 {p50:+.0%}")
+        if p99 > tail_threshold:
+            problems.append(f"p99 {p99:+.0%}")
+        if new["errors"] > old["errors"]:
+            problems.append(f"errors {old['errors']} -> {new['errors']}")
+        lines.append(
+            f"{key:<44} {new['requests_per_second']:>9.1f} ({rps:+5.0%}) {new['p50_ms']:>9.2f} ({p50:+5.0%})"
+            f" {new['p99_ms']:>9.2f} ({p99:+5.0%})  {new['errors']}" + ("  REGRESSION" if problems else "")
+        )
+        regressions.extend(f"{key}: {p}" for p in problems)
+    return lines, regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("current", type=Path)
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed relative change in throughput and p50")
+    parser.add_argument("--tail-threshold", type=float, default=0.25, help="allowed relative increase in p99")
+    args = parser.parse_args()
+
+    baseline, current = json.loads(args.baseline.read_text()), json.loads(args.current.read_text())
+    lines, regressions = compare(baseline, current, args.threshold, args.tail_threshold)
+    print(f"baseline {baseline['meta'].get('commit')} vs current {current['meta'].get('commit')}")
+    print("\n".join(lines))
+    if regressions:
+        print(f"\n{len(regressions)} regression(s):\n  " + "\n  ".join(regressions))
+        sys.exit(1)
+    print("\nno regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+import argparse
+import sys
+from sqlalchemy.orm import Session
+
+from app.db.database import SessionLocal
+import app.models  # noqa: F401  (registers every model before the domain modules import them)
+from app.Domains.turnarounds.cost_export import EXPORT_BATCH_SIZE, EXPORT_FORMATS, ExportFormatError, stream_export
+
+
+def export(db: Session, fmt: str, output: str, batch_size: int) -> None:
+    out = sys.stdout.buffer if output == "-" else open(output, "wb")
+    written = 0
+    try:
+        for chunk in stream_export(db, fmt, batch_size):
+            out.write(chunk)
+            written += len(chunk)
+    finally:
+        if out is not sys.stdout.buffer:
+            out.close()
+    print(f"[export] Wrote {written} bytes of {fmt} to {output}", file=sys.stderr)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Export turnaround cost data with variation and breakdown totals.")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="csv")
+    parser.add_argument("--output", "-o", default="-", help="Output file path ('-' for stdout).")
+    parser.add_argument("--batch-size", type=int, default=EXPORT_BATCH_SIZE, help="Rows fetched per round trip.")
+    args = parser.parse_args()
+
+    db: Session = SessionLocal()
+    try:
+        export(db, args.format, args.output, args.batch_size)
+    except ExportFormatError as exc:
+        parser.error(str(exc))
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Write .br and .gz variants next to each compressible file of a frontend build.
+
+    python scripts/precompress_assets.py frontend/dist
+
+Run it after `npm run build`. With FRONTEND_DIST_DIR set, the API serves these
+variants in place of the originals, so the build is compressed once at maximum
+settings rather than on every request. A variant that isn't smaller than its
+original is not kept. Brotli variants need the 'brotli' package; without it only
+gzip is written.
+"""
+import argparse
+import gzip
+import os
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depends on deployment
+    brotli = None
+
+EXTENSIONS = {".html", ".js", ".mjs", ".css", ".json", ".map", ".svg", ".txt", ".xml", ".wasm", ".ico", ".webmanifest"}
+
+
+def _write_variant(source: Path, data: bytes, suffix: str, compressed: bytes) -> int:
+    target = source.with_name(source.name + suffix)
+    if len(compressed) >= len(data):
+        target.unlink(missing_ok=True)
+        return 0
+    target.write_bytes(compressed)
+    # Same mtime as the original, so the pair reads as one build
+    stat = source.stat()
+    os.utime(target, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    return len(compressed)
+
+
+def precompress(root: Path, minimum_size: int) -> tuple[int, int, int]:
+    files = original = written = 0
+    for path in sorted(root.rglob("*")):
+        if not path.is_file() or path.suffix.lower() not in EXTENSIONS:
+            continue
+        data = path.read_bytes()
+        if len(data) < minimum_size:
+            continue
+        files += 1
+        original += len(data)
+        # mtime=0 keeps the output byte-identical across builds
+        written += _write_variant(path, data, ".gz", gzip.compress(data, compresslevel=9, mtime=0))
+        if brotli is not None:
+            written += _write_variant(path, data, ".br", brotli.compress(data, quality=11))
+    return files, original, written
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("dist", type=Path, help="build output directory, e.g. frontend/dist")
+    parser.add_argument("--minimum-size", type=int, default=1024, help="skip files smaller than this many bytes")
+    args = parser.parse_args()
+
+    if not args.dist.is_dir():
+        parser.error(f"{args.dist} is not a directory")
+    files, original, written = precompress(args.dist, args.minimum_size)
+    print(f"[precompress] {files} files, {original / 1024:.1f} KiB -> {written / 1024:.1f} KiB of variants"
+          f" ({'br + gzip' if brotli is not None else 'gzip only'})")
+
+
+if __name__ == "__main__":
+    main()
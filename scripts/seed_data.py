@@ -0,0 +1,287 @@
+import argparse
+import math
+import random
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Iterator
+
+from sqlalchemy import JSON, bindparam, func, insert, select
+from sqlalchemy.engine import Connection
+
+from app.db.database import engine
+import app.models  # noqa: F401  (registers every model before the domain modules import them)
+from app.core import security
+from app.models import Base
+from app.models.chat_message import ChatMessage
+from app.models.chat_session import ChatSession
+from app.Domains.turnarounds.cost_models import (
+    CostBreakdownItem,
+    RequisitionToOrder,
+    VariationOrder,
+    VariationOrderStatus,
+    WorkPackageCost,
+    WorkPackageCostStatus,
+)
+from app.Domains.turnarounds.models import Discipline, WorkPackage, WorkPackageStatus
+from app.Domains.users.models import User
+
+# Relaxed for the load only: a crash mid-seed loses the seed, which is re-runnable, not real data
+LOAD_PRAGMAS = {"synchronous": "OFF", "temp_store": "MEMORY", "cache_size": "-262144"}
+
+WORDS = (
+    "pump seal valve flange leak gasket inspect replace torque bolt heat exchanger vessel nozzle weld "
+    "scaffold permit isolation blind spool tray column reboiler condenser tube bundle hydrotest ndt "
+    "schedule delay cost variation supplier quote crane lift shutdown startup critical path contractor"
+).split()
+DOMAINS = ("turnaround", "maintenance", "procurement", "safety")
+DOMAIN_WEIGHTS = (70, 15, 10, 5)
+SUPPLIERS = [f"Supplier {i:03d}" for i in range(200)]
+# Skew: most packages have not started or are in progress, mechanical dominates, most VOs are still open
+STATUS_WEIGHTS = {
+    WorkPackageStatus.NOT_STARTED: 45, WorkPackageStatus.IN_PROGRESS: 35,
+    WorkPackageStatus.COMPLETED: 15, WorkPackageStatus.ON_HOLD: 5,
+}
+DISCIPLINE_WEIGHTS = {
+    Discipline.MECHANICAL: 55, Discipline.ELECTRICAL: 20, Discipline.INSTRUMENTATION: 15, Discipline.CIVIL: 10,
+}
+VO_STATUS_WEIGHTS = {
+    VariationOrderStatus.PROPOSED: 30, VariationOrderStatus.PENDING: 25, VariationOrderStatus.IN_PROGRESS: 15,
+    VariationOrderStatus.APPROVED: 25, VariationOrderStatus.REJECTED: 5,
+}
+
+
+def _pick(rnd: random.Random, weights: dict) -> Any:
+    return rnd.choices(list(weights), weights=list(weights.values()))[0]
+
+
+def _uuid(rnd: random.Random) -> str:
+    return str(uuid.UUID(int=rnd.getrandbits(128), version=4))
+
+
+def _sentence(rnd: random.Random, low: int, high: int) -> str:
+    # Log-normal length: mostly short, a long tail of long messages
+    n = min(max(int(rnd.lognormvariate(math.log((low + high) / 4), 0.8)), low), high)
+    return " ".join(rnd.choices(WORDS, k=n)).capitalize() + "."
+
+
+def _assistant_payload(rnd: random.Random) -> dict:
+    sections = []
+    for s in range(rnd.choices((1, 2, 3, 4, 6), weights=(30, 35, 20, 10, 5))[0]):
+        kind = rnd.choices(("text", "list", "code"), weights=(60, 35, 5))[0]
+        if kind == "list":
+            item = {"kind": "list", "content": [_sentence(rnd, 3, 12) for _ in range(rnd.randint(2, 8))]}
+        elif kind == "code":
+            item = {"kind": "code", "language": "sql", "content": "select * from work_packages where status = 'Pending';"}
+        else:
+            item = {"kind": "text", "content": _sentence(rnd, 10, 120)}
+        sections.append({"key": f"s{s}", "title": _sentence(rnd, 2, 5).rstrip("."), "items": [item]})
+    return {"version": "v1", "summary": _sentence(rnd, 5, 25), "sections": sections}
+
+
+def _split(total: int, weights: list[float]) -> list[int]:
+    """Deterministically split `total` into integer counts proportional to `weights`."""
+    scale = total / sum(weights)
+    counts = [int(w * scale) for w in weights]
+    for i in sorted(range(len(weights)), key=lambda i: weights[i] * scale - counts[i], reverse=True)[: total - sum(counts)]:
+        counts[i] += 1
+    return counts
+
+
+def _next_id(conn: Connection, column) -> int:
+    return (conn.execute(select(func.max(column))).scalar() or 0) + 1
+
+
+@contextmanager
+def relaxed_pragmas(conn: Connection) -> Iterator[None]:
+    if conn.dialect.name != "sqlite":
+        yield
+        return
+    saved = {name: conn.exec_driver_sql(f"PRAGMA {name}").scalar() for name in LOAD_PRAGMAS}
+    for name, value in LOAD_PRAGMAS.items():
+        conn.exec_driver_sql(f"PRAGMA {name}={value}")
+    try:
+        yield
+    finally:
+        conn.rollback()  # the load commits as it goes; this only ends a failed batch's transaction
+        for name, value in saved.items():
+            conn.exec_driver_sql(f"PRAGMA {name}={value}")
+
+
+# JSON columns bind None as the JSON value null; the app leaves content_json SQL NULL on user messages
+INSERTS = {
+    ChatMessage: insert(ChatMessage).values(content_json=bindparam("content_json", type_=JSON(none_as_null=True))),
+}
+
+
+class Loader:
+    """Buffers rows per table and writes them with executemany, committing every `commit_rows` rows.
+
+    Core inserts skip the ORM's per-object bookkeeping; on Postgres SQLAlchemy
+    folds each batch into multi-row INSERT ... VALUES statements.
+    """
+
+    def __init__(self, conn: Connection, batch_size: int, commit_rows: int) -> None:
+        self.conn = conn
+        self.batch_size = batch_size
+        self.commit_rows = commit_rows
+        self.pending: dict[Any, list[dict]] = {}
+        self.written: dict[str, int] = {}
+        self.uncommitted = 0
+
+    def add(self, model, row: dict) -> None:
+        rows = self.pending.setdefault(model, [])
+        rows.append(row)
+        if len(rows) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        # Tables flush in the order they were first added, so parents land before their children
+        for m, rows in self.pending.items():
+            if not rows:
+                continue
+            self.conn.execute(INSERTS[m] if m in INSERTS else insert(m), rows)
+            self.written[m.__tablename__] = self.written.get(m.__tablename__, 0) + len(rows)
+            self.uncommitted += len(rows)
+            self.pending[m] = []
+        if self.uncommitted >= self.commit_rows:
+            self.commit()
+
+    def commit(self) -> None:
+        self.conn.commit()
+        self.uncommitted = 0
+
+
+def seed_users(loader: Loader, rnd: random.Random, count: int, prefix: str, password: str | None, now: datetime) -> list[int]:
+    password_hash = None
+    if password:
+        try:
+            password_hash = security.hash_password(password)  # one hash shared by every seeded user
+        except Exception as exc:
+            print(f"[seed] Cannot hash the password ({exc}); users are created without one.")
+    first = _next_id(loader.conn, User.id)
+    ids = list(range(first, first + count))
+    for n, user_id in enumerate(ids):
+        loader.add(User, dict(
+            id=user_id, email=f"{prefix}.user{n}@example.com", password_hash=password_hash,
+            is_active=rnd.random() > 0.03, is_admin=n == 0, created_at=now - timedelta(days=rnd.randint(0, 720)),
+        ))
+    loader.flush()
+    return ids
+
+
+def seed_chat(loader: Loader, rnd: random.Random, user_ids: list[int], sessions: int, messages: int, now: datetime) -> None:
+    # Zipf-like activity: a few heavy users own most sessions; session length is log-normal
+    user_weights = [1 / (rank + 1) ** 1.1 for rank in range(len(user_ids))]
+    owners = rnd.choices(user_ids, weights=user_weights, k=sessions)
+    lengths = _split(messages, [rnd.lognormvariate(0, 1.0) for _ in range(sessions)])
+    texts = [_sentence(rnd, 4, 80) for _ in range(5000)]
+    payloads = [_assistant_payload(rnd) for _ in range(2000)]
+
+    session_id = _next_id(loader.conn, ChatSession.id)
+    for owner, length in zip(owners, lengths):
+        started = now - timedelta(days=rnd.expovariate(1 / 60), seconds=rnd.randint(0, 86_400))
+        loader.add(ChatSession, dict(
+            id=session_id, domain_id=rnd.choices(DOMAINS, weights=DOMAIN_WEIGHTS)[0], user_id=owner,
+            title=None if rnd.random() < 0.3 else _sentence(rnd, 2, 6).rstrip("."),
+            meta_json={}, tags=rnd.sample(WORDS, k=rnd.randint(0, 3)), created_at=started, updated_at=started,
+        ))
+        at = started
+        for m in range(length):
+            at += timedelta(seconds=rnd.randint(2, 600))
+            if m % 2 == 0:
+                row = dict(session_id=session_id, role="user", content_text=rnd.choice(texts), content_json=None)
+            else:
+                payload = rnd.choice(payloads)
+                row = dict(session_id=session_id, role="assistant", content_text=payload["summary"], content_json=payload)
+            loader.add(ChatMessage, dict(row, created_at=at))
+        session_id += 1
+    loader.flush()
+
+
+def seed_turnarounds(loader: Loader, rnd: random.Random, packages: int, items_per_package: float, now: datetime) -> None:
+    for n in range(packages):
+        wp_id, cost_id = _uuid(rnd), _uuid(rnd)
+        start = date(2025, 1, 1) + timedelta(days=rnd.randint(0, 540))
+        status = _pick(rnd, STATUS_WEIGHTS)
+        loader.add(WorkPackage, dict(
+            id=wp_id, title=f"WP-{n:06d} " + _sentence(rnd, 2, 6).rstrip("."), description=_sentence(rnd, 5, 40),
+            status=status, discipline=_pick(rnd, DISCIPLINE_WEIGHTS),
+            start_date=start, end_date=start + timedelta(days=int(rnd.expovariate(1 / 8))), created_at=now, updated_at=now,
+        ))
+        loader.add(WorkPackageCost, dict(
+            id=cost_id, work_package_id=wp_id, status=rnd.choice(list(WorkPackageCostStatus)),
+            original_contract_price=round(rnd.lognormvariate(11, 1.2), 2), allowances=round(rnd.lognormvariate(8, 1), 2),
+            locked=status == WorkPackageStatus.COMPLETED and rnd.random() < 0.5, created_at=now, updated_at=now,
+        ))
+        if rnd.random() < 0.6:
+            loader.add(RequisitionToOrder, dict(
+                id=_uuid(rnd), work_package_cost_id=cost_id, rto_number=f"RTO-{n:06d}", supplier=rnd.choice(SUPPLIERS),
+                subtotal_amount=0, created_at=now, updated_at=now,
+            ))
+        for i in range(int(rnd.lognormvariate(math.log(max(items_per_package, 1)), 0.9))):
+            loader.add(CostBreakdownItem, dict(
+                id=_uuid(rnd), work_package_cost_id=cost_id, item=f"Item {i}", description=_sentence(rnd, 3, 15),
+                value_amount=round(rnd.lognormvariate(7, 1.5), 2), created_at=now, updated_at=now,
+            ))
+        # Geometric: most packages have no variations, a few have many
+        vo_count = 0
+        while rnd.random() < 0.45 and vo_count < 30:
+            vo_count += 1
+        for i in range(vo_count):
+            vo_status = _pick(rnd, VO_STATUS_WEIGHTS)
+            raised = start + timedelta(days=rnd.randint(0, 30))
+            loader.add(VariationOrder, dict(
+                id=_uuid(rnd), work_package_cost_id=cost_id, vo_number=f"VO-{i + 1:03d}", description=_sentence(rnd, 3, 20),
+                value_amount=round(rnd.lognormvariate(9, 1.3), 2), status=vo_status, date_raised=raised,
+                date_approved=raised + timedelta(days=rnd.randint(1, 20)) if vo_status == VariationOrderStatus.APPROVED else None,
+                created_at=now, updated_at=now,
+            ))
+    loader.flush()
+
+
+def _timed(label: str, loader: Loader, step: Callable[[], Any]) -> None:
+    before = sum(loader.written.values())
+    started = time.perf_counter()
+    step()
+    loader.commit()
+    elapsed = time.perf_counter() - started
+    rows = sum(loader.written.values()) - before
+    print(f"[seed] {label}: {rows} rows in {elapsed:.1f}s ({rows / elapsed if elapsed else 0:,.0f} rows/s)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate deterministic, skewed synthetic users, chat history and turnaround costs.")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed; the same seed on an empty database gives the same data.")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--sessions", type=int, default=20_000, help="Chat sessions, spread over users with a Zipf-like skew.")
+    parser.add_argument("--messages", type=int, default=500_000, help="Chat messages, spread over sessions with a log-normal skew.")
+    parser.add_argument("--work-packages", type=int, default=10_000)
+    parser.add_argument("--items-per-package", type=float, default=8, help="Median cost breakdown items per package.")
+    parser.add_argument("--password", default=None, help="Password for every seeded user (hashed once). Omit to leave users without one.")
+    parser.add_argument("--batch-size", type=int, default=10_000, help="Rows per executemany call.")
+    parser.add_argument("--commit-rows", type=int, default=500_000, help="Rows per transaction.")
+    parser.add_argument("--create-schema", action="store_true", help="Create missing tables first (scratch databases; use migrations otherwise).")
+    args = parser.parse_args()
+
+    if args.create_schema:
+        Base.metadata.create_all(engine)
+
+    rnd = random.Random(args.seed)
+    now = datetime(2026, 1, 1)
+    with engine.connect() as conn, relaxed_pragmas(conn):
+        loader = Loader(conn, args.batch_size, args.commit_rows)
+        user_ids: list[int] = []
+        _timed("users", loader, lambda: user_ids.extend(seed_users(loader, rnd, args.users, f"seed{args.seed}", args.password, now)))
+        _timed("chat", loader, lambda: seed_chat(loader, rnd, user_ids, args.sessions, args.messages, now))
+        _timed("turnarounds", loader, lambda: seed_turnarounds(loader, rnd, args.work_packages, args.items_per_package, now))
+        if conn.dialect.name == "sqlite":
+            conn.exec_driver_sql("ANALYZE")
+            conn.commit()
+    for table, rows in loader.written.items():
+        print(f"[seed] {table}: {rows}")
+
+
+if __name__ == "__main__":
+    main()
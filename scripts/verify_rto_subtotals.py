@@ -0,0 +1,30 @@
+import argparse
+from sqlalchemy.orm import Session
+
+from app.db.database import SessionLocal
+import app.models  # noqa: F401  (registers every model before the domain modules import them)
+from app.Domains.turnarounds.cost_service import verify_rto_subtotals
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Recompute RTO subtotals from selected breakdown items and report drift.")
+    parser.add_argument("--apply", action="store_true", help="Overwrite drifted subtotals with the recomputed value.")
+    args = parser.parse_args()
+
+    db: Session = SessionLocal()
+    try:
+        drift = verify_rto_subtotals(db, fix=args.apply)
+    finally:
+        db.close()
+
+    for d in drift:
+        print(f"[rto] {d.rto_id}: stored={d.stored} computed={d.computed}")
+    print(f"[rto] RTOs with drift: {len(drift)}")
+    if drift and not args.apply:
+        print("[rto] Dry run complete. Re-run with --apply to fix.")
+    elif drift:
+        print("[rto] Applied changes.")
+
+
+if __name__ == "__main__":
+    main()